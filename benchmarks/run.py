@@ -0,0 +1,308 @@
+"""
+Benchmarks every public method of `Account`, `User` and `Post` against a local mock of
+Instagram (see `benchmarks/server.py`), measuring the wall-clock latency of each call and
+the WebDriver commands it sends. Results are written as JSON, and can be compared to the
+results of a previous run to catch regressions.
+
+Usage:
+```bash
+python -m benchmarks.run --iterations 5 --output before.json
+python -m benchmarks.run --iterations 5 --output after.json --baseline before.json
+```
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable
+import argparse, json, os, platform, re, statistics, sys, tempfile, time
+
+from .server import MockInstagram
+
+FORMAT_VERSION = 1
+
+# Smallest valid PNG, uploaded by `Account.post`
+_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082"
+)
+
+
+@dataclass
+class Scenario:
+    """
+    A method call to benchmark.
+
+    Args:
+        name (str): Name of the method, e.g. "User.follow".
+        target (Callable): Creates the object to call the method on from the account and the iteration, so every iteration loads a page of its own.
+        call (Callable): Calls the method on the target.
+        page (str): Where the browser is before each call: "blank" or "home".
+    """
+
+    name: str
+    target: Callable[[Any, int], Any]
+    call: Callable[[Any], Any]
+    page: str = "blank"
+
+
+def get_scenarios(media_path: str) -> list[Scenario]:
+    account = lambda account, i: account
+    user = lambda prefix: lambda account, i: account.get_user(f"{prefix}_{i}")
+    post = lambda prefix: lambda account, i: account.get_post(f"{prefix}{i:04d}")
+
+    return [
+        Scenario("Account.login", account, lambda a: a.login("benchmark", "benchmark"), "home"),
+        Scenario("Account.verify_session", account, lambda a: a.verify_session(), "home"),
+        Scenario("Account.get_cookies", account, lambda a: a.get_cookies(), "home"),
+        Scenario("Account.post", account, lambda a: a.post(media_path, "Benchmark"), "home"),
+        Scenario("User.get_profile", user("bench"), lambda u: u.get_profile()),
+        Scenario("User.get_total_posts", user("bench"), lambda u: u.get_total_posts()),
+        Scenario("User.get_followers", user("bench"), lambda u: u.get_followers()),
+        Scenario("User.get_following", user("bench"), lambda u: u.get_following()),
+        Scenario("User.get_posts", user("bench"), lambda u: u.get_posts(limit=12)),
+        Scenario("User.is_private", user("bench"), lambda u: u.is_private()),
+        Scenario("User.is_following", user("bench"), lambda u: u.is_following()),
+        Scenario("User.is_close_friend", user("close"), lambda u: u.is_close_friend()),
+        Scenario("User.follow", user("bench"), lambda u: u.follow()),
+        Scenario("User.unfollow", user("followed"), lambda u: u.unfollow()),
+        Scenario("User.add_close_friend", user("followed"), lambda u: u.add_close_friend()),
+        Scenario("User.remove_close_friend", user("close"), lambda u: u.remove_close_friend()),
+        Scenario("User.mute", user("followed"), lambda u: u.mute("posts", "stories")),
+        Scenario("User.send_dm", user("followed"), lambda u: u.send_dm("Benchmark")),
+        Scenario("Post.is_liked", post("bench"), lambda p: p.is_liked()),
+        Scenario("Post.like", post("bench"), lambda p: p.like()),
+        Scenario("Post.unlike", post("liked"), lambda p: p.unlike()),
+        Scenario("Post.get_total_likes", post("bench"), lambda p: p.get_total_likes()),
+        Scenario("Post.get_liked_by", post("bench"), lambda p: p.get_liked_by(limit=10)),
+        Scenario("Post.get_media", post("bench"), lambda p: p.get_media()),
+        Scenario("Post.get_images", post("bench"), lambda p: p.get_images()),
+        Scenario("Post.can_comment", post("bench"), lambda p: p.can_comment()),
+        Scenario("Post.comment", post("bench"), lambda p: p.comment("Benchmark")),
+        Scenario("Post.get_author", post("bench"), lambda p: p.get_author()),
+        Scenario("Post.get_date_posted", post("bench"), lambda p: p.get_date_posted()),
+    ]
+
+
+def summarize(latencies: list[float], calls: list[dict], errors: Counter) -> dict:
+    ordered = sorted(latencies)
+    summary = {
+        "runs": len(latencies),
+        "errors": dict(errors),
+        "latency": {
+            "min": ordered[0],
+            "median": statistics.median(ordered),
+            "mean": statistics.fmean(ordered),
+            "p95": ordered[round(0.95 * (len(ordered) - 1))],
+            "max": ordered[-1],
+        },
+        # Without metrics of the calls, only the latency is known
+        "commands": None,
+        "implicit_wait": None,
+        "navigations": None,
+    }
+    if not calls:
+        return summary
+
+    commands = [Counter(call["commands_by_type"]) for call in calls]
+    totals = [sum(counts.values()) for counts in commands]
+    names = sorted(set().union(*commands))
+
+    return {
+        **summary,
+        "commands": {
+            "mean": statistics.fmean(totals),
+            "min": min(totals),
+            "max": max(totals),
+            "by_type": {
+                name: statistics.fmean(counts[name] for counts in commands) for name in names
+            },
+        },
+        "implicit_wait": statistics.fmean(call["implicit_wait"] for call in calls),
+        "navigations": statistics.fmean(call["navigations"] for call in calls),
+    }
+
+
+def run(args: argparse.Namespace, server: MockInstagram) -> dict:
+    # The URL is read on import, so the package is imported once it points at the server
+    os.environ["PYGRAMCORE_INSTAGRAM_URL"] = server.url
+
+    import selenium
+    from pygramcore import Account
+    from pygramcore.driver import DriverConfig
+    from pygramcore.metrics import Metrics, set_metrics
+    from pygramcore.utils import BulkInsert, PerCharacter, set_typing_strategy
+
+    set_typing_strategy(PerCharacter() if args.typing == "per-character" else BulkInsert())
+
+    config = DriverConfig(
+        headless=not args.headful,
+        page_load_strategy=args.page_load_strategy,
+        capture_network=args.capture_network,
+    )
+    account = Account("benchmark", config)
+    metrics = Metrics()
+
+    media_path = os.path.join(tempfile.mkdtemp(prefix="pygramcore-benchmark-"), "post.png")
+    with open(media_path, "wb") as file:
+        file.write(_PNG)
+
+    scenarios = [
+        scenario
+        for scenario in get_scenarios(media_path)
+        if re.search(args.only or "", scenario.name)
+    ]
+
+    try:
+        driver = account.get_instance()
+        account.login("benchmark", "benchmark")
+
+        # Every call is recorded on its own, under the name of the method
+        set_metrics(metrics)
+
+        results = {}
+        for scenario in scenarios:
+            latencies, calls, errors = [], [], Counter()
+            for iteration in range(args.iterations):
+                driver.get(server.url if scenario.page == "home" else "about:blank")
+                target = scenario.target(account, iteration)
+
+                metrics.reset()
+                started = time.perf_counter()
+                try:
+                    scenario.call(target)
+                except Exception as error:
+                    errors[type(error).__name__] += 1
+                latencies.append(time.perf_counter() - started)
+
+                # A method the metrics don't record only gets its latency measured
+                stats = metrics.get_stats().get(scenario.name)
+                if stats is not None:
+                    calls.append(stats)
+
+            result = summarize(latencies, calls, errors)
+            results[scenario.name] = result
+            commands = result["commands"]
+            print(
+                f"{scenario.name:<28} {result['latency']['median'] * 1000:>9.1f} ms"
+                + (f" {commands['mean']:>7.1f} commands" if commands else "      unmeasured")
+                + (f"  errors: {dict(errors)}" if errors else ""),
+                file=sys.stderr,
+            )
+
+        return {
+            "version": FORMAT_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "environment": {
+                "python": platform.python_version(),
+                "selenium": selenium.__version__,
+                "browser": driver.capabilities.get("browserVersion"),
+                "platform": platform.platform(),
+            },
+            "config": {
+                "iterations": args.iterations,
+                "page_load_strategy": args.page_load_strategy,
+                "capture_network": args.capture_network,
+                "typing": args.typing,
+            },
+            "results": results,
+        }
+    finally:
+        set_metrics(None)
+        account.close()
+        os.remove(media_path)
+        os.rmdir(os.path.dirname(media_path))
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """
+    Compares two runs, method by method.
+
+    Returns:
+        list[str]: Methods that regressed: they send more commands, or their median latency grew by more than `tolerance` (a fraction).
+    """
+    regressions = []
+    print(f"\n{'method':<28} {'median ms':>21} {'commands':>19}", file=sys.stderr)
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+
+        old_latency, new_latency = before["latency"]["median"], result["latency"]["median"]
+        change = (new_latency - old_latency) / old_latency if old_latency else 0.0
+
+        # Commands can only be compared when both runs recorded them
+        measured = before["commands"] is not None and result["commands"] is not None
+        old_commands = before["commands"]["mean"] if measured else 0.0
+        new_commands = result["commands"]["mean"] if measured else 0.0
+
+        regressed = new_commands > old_commands or change > tolerance
+        if regressed:
+            regressions.append(name)
+
+        commands = (
+            f"{old_commands:>7.1f} -> {new_commands:>7.1f}" if measured else f"{'unmeasured':>18}"
+        )
+        print(
+            f"{name:<28} {old_latency * 1000:>8.1f} -> {new_latency * 1000:>8.1f}"
+            f" {commands} {change:>+8.0%}{'  REGRESSED' if regressed else ''}",
+            file=sys.stderr,
+        )
+
+    return regressions
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmarks pygramcore against a local mock of Instagram.",
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=5, help="calls per method")
+    parser.add_argument("-o", "--output", help="file to write the results to, stdout by default")
+    parser.add_argument("--baseline", help="results of a previous run to compare to")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="median latency growth allowed before a method counts as regressed (default: 0.25)",
+    )
+    parser.add_argument("--only", help="only run the methods matching this regular expression")
+    parser.add_argument(
+        "--page-load-strategy", choices=["normal", "eager", "none"], default="normal"
+    )
+    parser.add_argument(
+        "--capture-network",
+        action="store_true",
+        help="read profiles and posts from the JSON the pages fetch",
+    )
+    parser.add_argument(
+        "--typing",
+        choices=["bulk", "per-character"],
+        default="bulk",
+        help="typing strategy, bulk keeps random pauses out of the latencies (default: bulk)",
+    )
+    parser.add_argument("--headful", action="store_true", help="show the browser")
+    args = parser.parse_args(argv)
+
+    with MockInstagram() as server:
+        results = run(args, server)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+
+        if compare(baseline, results, args.tolerance):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
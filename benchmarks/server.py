@@ -0,0 +1,366 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, timezone
+from string import Template
+from urllib.parse import parse_qs, urlparse
+import html, json, os, re, threading
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Dialogs are built from the selectors the library finds them with. Every dialog is an
+# overlay `div.x1n2onr6.xzkaem6` placed right under <body>.
+DIALOG = "div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj[role='dialog']"
+
+# Items of the menu of a followed user (close friends at 1, mute at 6, unfollow at 8)
+USER_MENU = f"{DIALOG} > div > div > div > div > div.x7r02ix.xf1ldfh.x131esax.xdajt7p.xxfnqb6.xb88tzc.xw2csxc.x1odjw0f.x5fp0pe > div > div > div"
+MUTE_SAVE = "div.x9f619.xjbqb8w.x78zum5.x168nmei.x13lgxp2.x5pf9jr.xo71vjh.x1uhb9sk.x1plvlek.xryxfnj.x1c4vz4f.x2lah0s.xdt5ytf.xqjyukv.x1qjc9v5.x1oa3qoh.x1nhvcw1 > div.x9f619.xjbqb8w.x78zum5.x168nmei.x13lgxp2.x5pf9jr.xo71vjh.x1y1aw1k.x1sxyh0.xwib8y2.xurb0ha.x1uhb9sk.x1plvlek.xryxfnj.x1c4vz4f.x2lah0s.xdt5ytf.xqjyukv.x1qjc9v5.x1oa3qoh.x1nhvcw1 > div#save-mute"
+
+# List of the users who liked a post
+LIKED_BY = f"{DIALOG} > div > div > div > div > div > div.x9f619.xjbqb8w.x78zum5.x168nmei.x13lgxp2.x5pf9jr.xo71vjh.x1uhb9sk.x6ikm8r.x10wlt62.x1iyjqo2.x2lwn1j.xeuugli.xdt5ytf.xqjyukv.x1qjc9v5.x1oa3qoh.x1nhvcw1 > div > div"
+USERNAME = "span._ap3a._aaco._aacw._aacx._aad7._aade"
+
+# Steps of the "create" dialog, the same button moves to the next step and shares
+CREATE_DIALOG = f"{DIALOG} > div > div > div > div > div > div > div > div._ap97 > div > div > div > div._ac7b._ac7d"
+
+PRIVATE_NOTICE = '<div class="x9f619 xjbqb8w x78zum5 x168nmei x13lgxp2 x5pf9jr xo71vjh x1uhb9sk x1plvlek xryxfnj x1c4vz4f x2lah0s x1q0g3np xqjyukv x6s0dn4 x1oa3qoh x1nhvcw1"><h2>This account is private</h2></div>'
+
+OVERLAY_STYLE = "position: fixed; inset: 0; background: rgba(0, 0, 0, 0.6); overflow: auto"
+
+_TOKEN = re.compile(r"^(?P<tag>[a-z][\w-]*)?(?P<rest>.*)$")
+
+
+def nest(selector: str, inner: str = "") -> str:
+    """
+    Builds markup matched by a CSS selector made of compound selectors (tag, classes, ID,
+    attributes and `:nth-child`) joined by child or descendant combinators, with `inner`
+    inside the last element.
+    """
+    markup = inner
+    for token in reversed(re.split(r"\s*>\s*|\s+", selector.strip())):
+        match = _TOKEN.match(token)
+        tag = match["tag"] or "div"
+        rest = match["rest"]
+
+        attributes = dict(re.findall(r"\[([\w-]+)=['\"]([^'\"]*)['\"]\]", rest))
+        rest = re.sub(r"\[[^\]]*\]", "", rest)
+
+        classes = re.findall(r"\.([\w-]+)", rest)
+        if classes:
+            attributes["class"] = " ".join(classes)
+
+        element_id = re.search(r"#([\w-]+)", rest)
+        if element_id:
+            attributes["id"] = element_id[1]
+
+        position = re.search(r":nth-child\((\d+)\)", rest)
+        siblings = "<div></div>" * (int(position[1]) - 1) if position else ""
+
+        attributes = "".join(
+            f' {name}="{html.escape(value)}"' for name, value in attributes.items()
+        )
+        markup = f"{siblings}<{tag}{attributes}>{markup}</{tag}>"
+
+    return markup
+
+
+def overlay(selector: str, inner: str = "") -> str:
+    return (
+        f'<div class="x1n2onr6 xzkaem6" style="{OVERLAY_STYLE}">'
+        '<svg aria-label="Close" width="24" height="24"></svg>'
+        f"{nest(selector, inner)}</div>"
+    )
+
+
+def render(name: str, **values) -> str:
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as file:
+        return Template(file.read()).substitute(values)
+
+
+def user_data(username: str) -> dict | None:
+    """
+    Profile of a user. The username tells the state: "missing_*" doesn't exist, "private_*" is
+    private, "followed_*" is followed and "close_*" is followed and a close friend.
+    """
+    if username.startswith("missing_"):
+        return None
+
+    following = username.startswith(("followed_", "close_"))
+    return {
+        "username": username,
+        "full_name": username.replace("_", " ").title(),
+        "bio": f"Bio of {username}",
+        "total_posts": 12,
+        "followers": 1520334,
+        "following": 512,
+        "is_private": username.startswith("private_"),
+        "is_following": following,
+        "is_close_friend": username.startswith("close_"),
+        "posts": [f"{username[:4]}{index:07d}" for index in range(12)],
+    }
+
+
+def post_data(shortcode: str) -> dict | None:
+    """
+    Metadata of a post. The shortcode tells the state: "missing*" doesn't exist, "liked*" is
+    liked and "closed*" can't be commented on.
+    """
+    if shortcode.startswith("missing"):
+        return None
+
+    return {
+        "id": shortcode,
+        "author": "example",
+        "likes": 48213,
+        "taken_at": 1711843200,  # 2024-03-31
+        "is_liked": shortcode.startswith("liked"),
+        "can_comment": not shortcode.startswith("closed"),
+        "liked_by": [f"liker_{index}" for index in range(30)],
+        "media": [
+            {"url": f"/media/{shortcode}_{index}.jpg", "width": 1080, "height": 1350}
+            for index in range(3)
+        ],
+    }
+
+
+def user_page(user: dict) -> str:
+    menu_items = [
+        '<div><svg aria-label="Close friend" width="24" height="24"></svg>Add to close friends list</div>',
+        "<div>Add to favorites</div>",
+        "<div>Restrict</div>",
+        "<div>Block</div>",
+        "<div>Report</div>",
+        '<div id="mute">Mute</div>',
+        "<div>About this account</div>",
+        '<div id="unfollow">Unfollow</div>',
+    ]
+    mute_options = "".join(
+        f'<label>{mode} <input type="checkbox" dir="ltr" aria-checked="false" /></label>'
+        for mode in ("Posts", "Stories")
+    )
+    grid = (
+        "".join(
+            f'<a href="/p/{shortcode}/"><img alt="" width="300" height="300" /></a>'
+            for shortcode in user["posts"]
+        )
+        or "<span>No posts yet</span>"
+    )
+
+    return render(
+        "profile.html",
+        username=user["username"],
+        full_name=html.escape(user["full_name"]),
+        bio=html.escape(user["bio"]),
+        total_posts=f"{user['total_posts']:,}",
+        followers=f"{user['followers'] / 1e6:.1f}M",
+        followers_exact=f"{user['followers']:,}",
+        following=f"{user['following']:,}",
+        follow_class=" _acan _acap _acat _aj1- _ap30"
+        if user["is_following"]
+        else " _acan _acap _acas _aj1- _ap30",
+        follow_text="Following" if user["is_following"] else "Follow",
+        is_following=json.dumps(user["is_following"]),
+        is_close_friend=json.dumps(user["is_close_friend"]),
+        private_notice=PRIVATE_NOTICE if user["is_private"] else "",
+        grid="" if user["is_private"] else grid,
+        user_menu=overlay(USER_MENU, "".join(menu_items)),
+        mute_menu=mute_options + nest(MUTE_SAVE, "Save"),
+    )
+
+
+def post_page(post: dict) -> str:
+    liked_by = "".join(
+        f'<div><span class="{" ".join(USERNAME.split(".")[1:])}">{username}</span></div>'
+        for username in post["liked_by"]
+    )
+    media = {
+        "items": [
+            {
+                "code": post["id"],
+                "carousel_media": [
+                    {"image_versions2": {"candidates": [item]}} for item in post["media"]
+                ],
+            }
+        ]
+    }
+
+    return render(
+        "post.html",
+        id=post["id"],
+        author=post["author"],
+        likes=f"{post['likes']:,}",
+        like_label="Unlike" if post["is_liked"] else "Like",
+        date_posted=datetime.fromtimestamp(post["taken_at"], timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%S.000Z"
+        ),
+        comment_form='<form method="post"><textarea aria-label="Add a comment…"></textarea></form>'
+        if post["can_comment"]
+        else "<div>Comments on this post have been limited.</div>",
+        liked_by=overlay(LIKED_BY, liked_by),
+        media=json.dumps(media).replace("</", "<\\/"),
+    )
+
+
+def home_page() -> str:
+    steps = (
+        '<h1>Create new post</h1><div id="next" role="button">Next</div>'
+        '<input type="file" accept="image/*,video/*" />'
+        '<div aria-label="Write a caption..." contenteditable="true" role="textbox"></div>'
+    )
+    return render("home.html", create_dialog=overlay(CREATE_DIALOG, steps))
+
+
+def web_profile_info(user: dict) -> dict:
+    return {
+        "data": {
+            "user": {
+                "username": user["username"],
+                "full_name": user["full_name"],
+                "biography": user["bio"],
+                "is_private": user["is_private"],
+                "followed_by_viewer": user["is_following"],
+                "edge_owner_to_timeline_media": {"count": user["total_posts"]},
+                "edge_followed_by": {"count": user["followers"]},
+                "edge_follow": {"count": user["following"]},
+            }
+        },
+        "status": "ok",
+    }
+
+
+def media_info(post: dict) -> dict:
+    return {
+        "items": [
+            {
+                "code": post["id"],
+                "like_count": post["likes"],
+                "taken_at": post["taken_at"],
+                "has_liked": post["is_liked"],
+                "user": {"username": post["author"]},
+            }
+        ],
+        "status": "ok",
+    }
+
+
+class MockInstagramHandler(BaseHTTPRequestHandler):
+    """
+    Serves the fixture pages at the paths Instagram serves them at:
+
+    - `/`: the login form, or the home feed once the session cookie is set.
+    - `/<username>/`: profiles, see `user_data`.
+    - `/p/<shortcode>/`: posts, see `post_data`.
+    - `/api/v1/...`: the JSON the pages fetch, and the session check.
+    """
+
+    server_version = "MockInstagram/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: str | bytes, content_type: str, headers=()) -> None:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _html(self, body: str, status: int = 200) -> None:
+        self._send(status, body, "text/html; charset=utf-8")
+
+    def _json(self, payload, status: int = 200) -> None:
+        self._send(status, json.dumps(payload), "application/json; charset=utf-8")
+
+    def _logged_in(self) -> bool:
+        return "sessionid=" in self.headers.get("Cookie", "")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+
+        if not parts:
+            return self._html(home_page() if self._logged_in() else render("login.html"))
+
+        if parts[:3] == ["api", "v1", "users"]:
+            username = parse_qs(url.query).get("username", [""])[0]
+            user = user_data(username)
+            if user is None:
+                return self._json({"status": "fail"}, 404)
+            return self._json(web_profile_info(user))
+
+        if parts[:3] == ["api", "v1", "media"] and len(parts) > 3:
+            post = post_data(parts[3])
+            if post is None:
+                return self._json({"status": "fail"}, 404)
+            return self._json(media_info(post))
+
+        if parts[:3] == ["api", "v1", "accounts"]:
+            status = 200 if self._logged_in() else 302
+            return self._json({"status": "ok" if status == 200 else "fail"}, status)
+
+        if parts[0] == "media":
+            return self._send(200, b"", "image/jpeg")
+
+        if parts[0] in ("p", "reel") and len(parts) > 1:
+            post = post_data(parts[1])
+            if post is not None:
+                return self._html(post_page(post))
+
+        elif len(parts) == 1:
+            user = user_data(parts[0])
+            if user is not None:
+                return self._html(user_page(user))
+
+        self._html(render("not_found.html"), 404)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if self.path.startswith("/accounts/login"):
+            return self._send(
+                302,
+                b"",
+                "text/html",
+                [("Location", "/"), ("Set-Cookie", "sessionid=benchmark; Path=/")],
+            )
+
+        self._json({"status": "ok"})
+
+
+class MockInstagram:
+    """
+    Local HTTP server serving Instagram-like fixture pages, on a free port.
+
+    Usage:
+    ```python
+    with MockInstagram() as server:
+        os.environ["PYGRAMCORE_INSTAGRAM_URL"] = server.url
+    ```
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = ThreadingHTTPServer((host, port), MockInstagramHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "MockInstagram":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockInstagram":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,235 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from functools import partial
+from typing import Any, AsyncIterator, Callable
+import asyncio
+
+from .pygram import Account
+from .elements import User, Post
+
+# Marks the end of an iterator run on a worker, since StopIteration can't cross a future
+_EXHAUSTED = object()
+
+
+class _Worker:
+    """
+    A thread with a driver of the account pinned to it, so everything it runs is serialized on
+    that driver.
+    """
+
+    def __init__(self, account: Account, name: str):
+        self.account = account
+        self.pending = 0  # tasks submitted and not finished yet
+        self.iterating = 0  # iterators running on the worker, which expect the page to stay put
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix=name)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self) -> None:
+        # Give the driver back to the pool from the thread it is pinned to
+        self._executor.submit(self.account.release_instance)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class AsyncAccount:
+    """
+    Awaitable version of an `Account`. Work runs on one thread per browser of the account's
+    pool, so the event loop is never blocked and each browser does one thing at a time.
+
+    Args:
+        account (Account, optional): Account to run as. Defaults to the default account.
+        workers (int, optional): Browsers to run work on at once. Defaults to the size of the account's pool.
+        max_pending (int): Tasks that can be queued or running at once. Further calls wait for a slot. Defaults to 100.
+
+    Usage:
+    ```python
+    async with AsyncAccount(Account("alice")) as account:
+        await account.load_session(store)
+
+        users = [account.get_user(name) for name in names]
+        profiles = await asyncio.gather(*(user.get_profile() for user in users))
+
+        async for post in users[0].iter_posts():
+            print(post.id)
+    ```
+    """
+
+    def __init__(
+        self, account: Account = None, workers: int = None, max_pending: int = 100
+    ):
+        self.account = account or Account.default()
+        workers = workers or self.account.get_pool().size
+
+        self._workers = [
+            _Worker(self.account, f"pygramcore-{self.account.name or 'default'}-{i}")
+            for i in range(workers)
+        ]
+        self._slots = asyncio.Semaphore(max_pending)
+        self._closed = False
+
+    async def run(self, fn: Callable, *args, _worker: _Worker = None, **kwargs) -> Any:
+        """
+        Runs a blocking function on one of the account's browsers.
+
+        Cancelling the call before it starts removes it from the queue. Once started, Selenium
+        can't be interrupted, so the browser finishes the call and its slot is freed then.
+
+        Args:
+            fn (Callable): Function to run. It can use the account's driver (e.g. through `User` methods).
+
+        Returns:
+            Any: What the function returns.
+        """
+        if self._closed:
+            raise RuntimeError("The async account has been closed.")
+
+        loop = asyncio.get_running_loop()
+        await self._slots.acquire()
+
+        worker = _worker or self._pick()
+        worker.pending += 1
+
+        def done(_):
+            worker.pending -= 1
+            self._slots.release()
+
+        try:
+            future = worker.submit(fn, *args, **kwargs)
+        except:
+            done(None)
+            raise
+
+        future.add_done_callback(lambda future: _call_soon(loop, done, future))
+        return await asyncio.wrap_future(future)
+
+    async def iterate(self, iterator_fn: Callable, *args, **kwargs) -> AsyncIterator:
+        """
+        Runs a blocking iterator (e.g. `User.iter_posts`) on a single browser, fetching one
+        item per call.
+
+        Args:
+            iterator_fn (Callable): Function returning the iterator.
+        """
+        worker = self._pick()
+        worker.iterating += 1
+        iterator = None
+        try:
+            iterator = await self.run(iterator_fn, *args, _worker=worker, **kwargs)
+            while True:
+                item = await self.run(next, iterator, _EXHAUSTED, _worker=worker)
+                if item is _EXHAUSTED:
+                    return
+
+                yield self.wrap(item)
+        finally:
+            worker.iterating -= 1
+            close = getattr(iterator, "close", None)
+            if close is not None and not self._closed:
+                await asyncio.shield(self.run(close, _worker=worker))
+
+    def _pick(self) -> _Worker:
+        # Other work is kept off browsers that are iterating, unless they all are
+        return min(self._workers, key=lambda worker: (worker.iterating, worker.pending))
+
+    def wrap(self, value: Any) -> Any:
+        """
+        Returns the async version of users and posts (also inside lists), leaving other values as they are.
+        """
+        if isinstance(value, User):
+            return AsyncUser(self, value)
+        if isinstance(value, Post):
+            return AsyncPost(self, value)
+        if isinstance(value, list):
+            return [self.wrap(item) for item in value]
+
+        return value
+
+    def get_user(self, name: str) -> "AsyncUser":
+        """
+        Returns an awaitable user browsed with this account.
+        """
+        return AsyncUser(self, self.account.get_user(name))
+
+    def get_post(self, id: str) -> "AsyncPost":
+        """
+        Returns an awaitable post browsed with this account.
+        """
+        return AsyncPost(self, self.account.get_post(id))
+
+    async def close(self) -> None:
+        """
+        Waits for the running work to finish, drops the queued work and returns the browsers to the pool.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        await asyncio.gather(
+            *(asyncio.to_thread(worker.shutdown) for worker in self._workers)
+        )
+
+    async def __aenter__(self) -> "AsyncAccount":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return _async_attribute(self, self.account, name)
+
+
+class _AsyncElement:
+    def __init__(self, account: AsyncAccount, element: User | Post):
+        self._account = account
+        self._element = element
+
+    @property
+    def sync(self) -> User | Post:
+        """
+        The blocking object this one wraps.
+        """
+        return self._element
+
+    def __getattr__(self, name: str) -> Any:
+        return _async_attribute(self._account, self._element, name)
+
+    def __repr__(self) -> str:
+        return f"Async{self._element!r}"
+
+
+class AsyncUser(_AsyncElement):
+    """
+    Awaitable version of a `User`. Methods are awaited (`await user.follow()`) and `iter_*`
+    methods are iterated with `async for`. Attributes like `name` are read as usual.
+    """
+
+
+class AsyncPost(_AsyncElement):
+    """
+    Awaitable version of a `Post`. Methods are awaited (`await post.like()`) and `iter_*`
+    methods are iterated with `async for`. Attributes like `id` are read as usual.
+    """
+
+
+def _async_attribute(account: AsyncAccount, target: Any, name: str) -> Any:
+    value = getattr(target, name)
+    if name.startswith("_") or not callable(value):
+        return value
+
+    if name.startswith("iter_"):
+        return partial(account.iterate, value)
+
+    async def method(*args, **kwargs):
+        return account.wrap(await account.run(value, *args, **kwargs))
+
+    method.__name__ = name
+    method.__doc__ = value.__doc__
+    return method
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable, *args) -> None:
+    # Work can finish after the loop has been closed, when there's no one left to notify
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        pass
@@ -0,0 +1,174 @@
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+import threading, time
+
+from .pygram import get_account, remember_predicates
+from .elements import User, Post
+from .exceptions.navigation import PageNotFound
+
+
+@dataclass
+class Action:
+    """
+    A method call on a user or post, waiting to run in a batch.
+
+    Args:
+        target (User | Post): Object to call the method on.
+        method (str): Name of the method (e.g. "follow").
+        args (tuple): Positional arguments of the call.
+        kwargs (dict): Keyword arguments of the call.
+    """
+
+    target: User | Post
+    method: str
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+
+
+@dataclass
+class ActionResult:
+    """
+    Outcome of an action.
+
+    Args:
+        action (Action): Action that ran.
+        value (Any): What the method returned.
+        error (Exception | None): What the method raised, None if it succeeded.
+        elapsed (float): Seconds the action took.
+    """
+
+    action: Action
+    value: Any = None
+    error: Exception | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Batch:
+    """
+    Runs many actions on users and posts, grouped by the page they happen on: each page is
+    loaded once, and its checks (e.g. whether the user is followed) are done once until an
+    action changes them. Actions on the same page keep the order they were added in.
+
+    Usage:
+    ```python
+    batch = Batch()
+    for name in names:
+        user = User(name)
+        batch.add(user, "follow")
+        batch.add(user, "mute", "posts")
+    for id in post_ids:
+        batch.add(Post(id), "like")
+
+    for result in batch.run():
+        if not result.ok:
+            print(result.action.method, result.action.target, result.error)
+    ```
+    """
+
+    def __init__(self):
+        self._actions: list[Action] = []
+
+    def add(self, target: User | Post, method: str, *args, **kwargs) -> Action:
+        """
+        Adds an action to the batch.
+
+        Args:
+            target (User | Post): Object to call the method on.
+            method (str): Name of the method (e.g. "follow").
+
+        Returns:
+            Action: The action added.
+        """
+        if method.startswith("_") or not callable(getattr(target, method, None)):
+            raise ValueError(f'{type(target).__name__} has no "{method}" action.')
+
+        action = Action(target, method, args, kwargs)
+        self._actions.append(action)
+        return action
+
+    def plan(self) -> list[list[Action]]:
+        """
+        Returns:
+            list[list[Action]]: Actions grouped by account and page, in the order they will run.
+        """
+        groups: dict[tuple, list[Action]] = {}
+        for action in self._actions:
+            key = (get_account(action.target), action.target.url.rstrip("/"))
+            groups.setdefault(key, []).append(action)
+
+        return list(groups.values())
+
+    def run(
+        self,
+        workers: int = 1,
+        on_result: Callable[[ActionResult], None] = None,
+    ) -> list[ActionResult]:
+        """
+        Runs every action. An action failing doesn't stop the others, except that the rest of
+        the actions on a page that wasn't found are skipped.
+
+        Args:
+            workers (int): Pages worked on at once, each on its own thread and browser. With more workers than browsers in the account's pool, pages wait for a browser to be free. Defaults to 1.
+            on_result (Callable, optional): Called with every result as soon as it is known.
+
+        Returns:
+            list[ActionResult]: Result of every action, in the order they were added.
+        """
+        results: dict[int, ActionResult] = {}
+        lock = threading.Lock()
+
+        def report(result: ActionResult):
+            with lock:
+                results[id(result.action)] = result
+                if on_result is not None:
+                    on_result(result)
+
+        groups = self.plan()
+        if workers <= 1:
+            for group in groups:
+                _run_group(group, report)
+        else:
+            with ThreadPoolExecutor(workers) as executor:
+                futures = [
+                    executor.submit(_run_group, group, report, release=True) for group in groups
+                ]
+                for future in futures:
+                    future.result()
+
+        return [results[id(action)] for action in self._actions]
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+
+def _run_group(
+    actions: list[Action], report: Callable[[ActionResult], None], release: bool = False
+) -> None:
+    try:
+        with remember_predicates():
+            for i, action in enumerate(actions):
+                started = time.perf_counter()
+                try:
+                    value = getattr(action.target, action.method)(*action.args, **action.kwargs)
+                except PageNotFound as error:
+                    elapsed = time.perf_counter() - started
+                    report(ActionResult(action, error=error, elapsed=elapsed))
+
+                    # Every other action on the page would fail the same way
+                    for skipped in actions[i + 1 :]:
+                        report(ActionResult(skipped, error=error))
+                    return
+                except Exception as error:
+                    elapsed = time.perf_counter() - started
+                    report(ActionResult(action, error=error, elapsed=elapsed))
+                else:
+                    report(ActionResult(action, value, elapsed=time.perf_counter() - started))
+    finally:
+        # Worker threads outlive the group, and would otherwise keep the browser to themselves
+        if release:
+            get_account(actions[0].target).release_instance()
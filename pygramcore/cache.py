@@ -0,0 +1,235 @@
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable
+import json, threading, time
+
+from .constants import *
+
+_MISSING = object()
+
+
+class _FieldStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stored = 0  # misses served from the persistent store
+
+
+class Cache:
+    """
+    Bounded cache of values read from Instagram, where each field expires after its own TTL.
+    Once full, the least recently used value is evicted.
+
+    Keys are (account, url, field, arguments) tuples.
+
+    Args:
+        max_size (int): Maximum amount of values. Defaults to `CACHE_SIZE`.
+        ttls (dict, optional): Seconds each field (e.g. "is_private") is kept, None to keep it until evicted. Defaults to `CACHE_TTLS`.
+        default_ttl (float): Seconds fields without a TTL are kept. Defaults to 60.
+        store (MetadataStore, optional): Persistent store values are also saved to, and misses are looked up in.
+    """
+
+    def __init__(
+        self,
+        max_size: int = CACHE_SIZE,
+        ttls: dict[str, float | None] = None,
+        default_ttl: float = 60,
+        store=None,
+    ):
+        self.max_size = max_size
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.store = store
+
+        self.evictions = 0
+        self._values: OrderedDict[tuple, tuple[Any, float | None]] = OrderedDict()
+        self._fields: dict[tuple, set[tuple]] = {}  # keys by (account, url, field)
+        self._stats: dict[str, _FieldStats] = {}
+        self._lock = threading.Lock()
+
+    def get_ttl(self, field: str) -> float | None:
+        return self.ttls.get(field, self.default_ttl)
+
+    def get(self, key: tuple, default: Any = None) -> Any:
+        """
+        Returns:
+            Any: The value, or the default if it isn't cached or has expired.
+        """
+        field = key[2]
+        with self._lock:
+            stats = self._stats.setdefault(field, _FieldStats())
+            value, expires = self._values.get(key, (_MISSING, None))
+
+            if value is not _MISSING and expires is not None and expires <= time.monotonic():
+                self._remove(key)
+                stats.expired += 1
+                value = _MISSING
+
+            if value is not _MISSING:
+                stats.hits += 1
+                self._values.move_to_end(key)
+                return value
+
+            stats.misses += 1
+
+        if self.store is None:
+            return default
+
+        # Fall back to values saved by previous runs or other processes
+        found = self.store.get(key, self.get_ttl(field))
+        if found is None:
+            return default
+
+        value, age = found
+
+        with self._lock:
+            stats.stored += 1
+        self._put(key, value, age)
+        return value
+
+    def set(self, key: tuple, value: Any) -> None:
+        self._put(key, value)
+        if self.store is not None:
+            self.store.set(key, value)
+
+    def _put(self, key: tuple, value: Any, age: float = 0) -> None:
+        ttl = self.get_ttl(key[2])
+        expires = None if ttl is None else time.monotonic() + ttl - age
+
+        with self._lock:
+            self._values[key] = (value, expires)
+            self._values.move_to_end(key)
+            self._fields.setdefault(key[:3], set()).add(key)
+
+            while len(self._values) > self.max_size:
+                self._remove(next(iter(self._values)))
+                self.evictions += 1
+
+    def _remove(self, key: tuple) -> None:
+        del self._values[key]
+        keys = self._fields[key[:3]]
+        keys.discard(key)
+        if not keys:
+            del self._fields[key[:3]]
+
+    def invalidate(self, account, url: str, field: str) -> None:
+        """
+        Removes a field of a page, whatever the arguments it was read with.
+        """
+        with self._lock:
+            for key in list(self._fields.get((account, url, field), ())):
+                self._remove(key)
+
+        if self.store is not None:
+            self.store.delete(account, url, field)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self._fields.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            dict: Size, evictions, and hits, misses (and how many of them the store served), expired values and hit rate by field.
+        """
+        with self._lock:
+            fields = {
+                field: {
+                    "hits": stats.hits,
+                    "misses": stats.misses,
+                    "stored": stats.stored,
+                    "expired": stats.expired,
+                    "hit_rate": stats.hits / (stats.hits + stats.misses)
+                    if stats.hits + stats.misses
+                    else None,
+                }
+                for field, stats in self._stats.items()
+            }
+            return {
+                "size": len(self._values),
+                "max_size": self.max_size,
+                "evictions": self.evictions,
+                "fields": fields,
+            }
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+_cache: Cache | None = None
+
+
+def set_cache(cache: Cache | None) -> None:
+    """
+    Sets the cache getters are served from. Caching is off until a cache is set.
+
+    Usage:
+    ```python
+    set_cache(Cache(max_size=10_000, ttls={**CACHE_TTLS, "is_following": 60}))
+
+    User("username").get_followers()  # scraped
+    User("username").get_followers()  # cached
+    ```
+    """
+    global _cache
+    _cache = cache
+
+
+def get_cache() -> Cache | None:
+    """
+    Returns the cache set with `set_cache`, None if caching is off.
+    """
+    return _cache
+
+
+def _page(obj) -> tuple:
+    from .pygram import get_account
+
+    return (get_account(obj), obj.url.rstrip("/"))
+
+
+def cached(func: Callable, field: str = None) -> Callable:
+    """
+    Decorator that serves a getter from the cache when it is on. Calls with different
+    arguments are cached separately. On `User` and `Post`, the cache is checked before
+    navigating.
+    """
+    field = field or func.__name__
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        cache = _cache
+        if cache is None:
+            return func(self, *args, **kwargs)
+
+        # Arguments are part of the key, so they must be plain values
+        try:
+            arguments = json.dumps([args, kwargs], sort_keys=True) if args or kwargs else ""
+        except TypeError:
+            return func(self, *args, **kwargs)
+
+        key = (*_page(self), field, arguments)
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = func(self, *args, **kwargs)
+            cache.set(key, value)
+
+        return value
+
+    wrapper.cache_field = field
+    wrapper.uncached = func
+    return wrapper
+
+
+def invalidate(obj, *fields: str) -> None:
+    """
+    Removes fields of a user or post from the cache, when it is on.
+    """
+    cache = _cache
+    if cache is None:
+        return
+
+    for field in fields:
+        cache.invalidate(*_page(obj), field)
@@ -1,3 +1,5 @@
+import os
+
 MEDIA_FORMATS = {
     "jpeg",
     "png",
@@ -9,6 +11,44 @@ MEDIA_FORMATS = {
 
 # Driver values
 IMPLICIT_WAIT = 10  # in sec.
+POOL_SIZE = 1  # drivers per account
+POOL_TIMEOUT = None  # in sec. (None waits forever for a free driver)
+SESSION_TTL = 300  # in sec. (how long a verified session is trusted)
+FOLLOW_LIST_PAGE_SIZE = 50  # users per request when paging through followers
+NETWORK_WAIT = 2  # in sec. (how long after a page load captured responses are waited on)
+PRESPAWN = int(os.environ.get("PYGRAMCORE_PRESPAWN", 0))  # drivers started on import
+
+# URLs (PYGRAMCORE_INSTAGRAM_URL points the package at another server, e.g. for benchmarks)
+INSTAGRAM_URL = os.environ.get("PYGRAMCORE_INSTAGRAM_URL", "https://www.instagram.com/")
 
-# URLs
-INSTAGRAM_URL = "https://www.instagram.com/"
+# Scheduler values: budget of each action per account, as (actions, per sec., burst)
+RATE_LIMITS = {
+    "follow": (20, 3600, 2),
+    "unfollow": (20, 3600, 2),
+    "like": (60, 3600, 3),
+    "unlike": (60, 3600, 3),
+    "comment": (15, 3600, 1),
+    "send_dm": (30, 3600, 2),
+    "post": (5, 3600, 1),
+}
+BLOCK_COOLDOWN = 900  # in sec. (pause of an action after Instagram blocks it)
+
+# Cache values: seconds each field is kept (None keeps it until evicted)
+CACHE_SIZE = 4096
+CACHE_TTLS = {
+    "get_author": None,
+    "get_date_posted": None,
+    "get_media": 3600,
+    "get_images": 3600,
+    "can_comment": 3600,
+    "get_total_likes": 60,
+    "get_liked_by": 3600,
+    "is_liked": 300,
+    "is_private": 3600,
+    "is_following": 300,
+    "is_close_friend": 300,
+    "get_profile": 300,
+    "get_total_posts": 300,
+    "get_followers": 300,
+    "get_following": 300,
+}
@@ -0,0 +1,473 @@
+from dataclasses import dataclass, field
+from selenium import webdriver
+from selenium_stealth import stealth
+from typing import Callable, Literal
+import os, socket, threading, time, weakref
+
+from .constants import *
+from .exceptions.driver import *
+from .metrics import instrument_driver
+from .network import attach_capture
+
+# URL patterns blocked for each type of resource
+RESOURCE_PATTERNS = {
+    "images": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.heic*", "*.avif*"],
+    "media": ["*.mp4*", "*.webm*", "*.m4a*", "*.m4v*"],
+    "fonts": ["*.woff*", "*.ttf*", "*.otf*"],
+    "stylesheets": ["*.css*"],
+    "trackers": [
+        "*/logging_client_events*",
+        "*/ajax/bz*",
+        "*facebook.com/tr*",
+        "*google-analytics.com*",
+        "*doubleclick.net*",
+    ],
+}
+
+
+@dataclass
+class DriverConfig:
+    """
+    How browsers are started. The defaults match a regular Chrome window.
+
+    Args:
+        headless (bool): Run without a window. Defaults to False.
+        block (set[str]): Types of resources not to download: "images", "media", "fonts", "stylesheets" and/or "trackers". Defaults to none.
+        page_load_strategy ("normal", "eager" or "none"): When navigating returns: after the full `load` event, once the DOM is ready, or right away. Pages are then waited on for the content each element needs. Defaults to "normal".
+        window_size (tuple[int, int]): Size of the window, Instagram shows a different layout on small windows. Defaults to (1920, 1080).
+        user_data_dir (str, optional): Directory where browsers keep their profiles (cache, service workers, cookies) between runs. Each browser gets its own sub-directory. Use a different directory per Instagram account. Defaults to a temporary profile.
+        capture_network (bool): Read profiles and posts from the JSON responses the pages fetch, instead of the page's elements, when possible. Defaults to False.
+
+    Usage:
+    ```python
+    # Only metadata is needed, skip downloading images and videos
+    config = DriverConfig(headless=True, block={"images", "media"}, page_load_strategy="eager")
+    Account.configure_pool(size=4, config=config)
+    ```
+    """
+
+    headless: bool = False
+    block: set[str] = field(default_factory=set)
+    page_load_strategy: Literal["normal", "eager", "none"] = "normal"
+    window_size: tuple[int, int] = (1920, 1080)
+    user_data_dir: str = None
+    capture_network: bool = False
+
+    def __post_init__(self):
+        unknown = set(self.block) - set(RESOURCE_PATTERNS)
+        if unknown:
+            raise ValueError(f"Unknown resource types: {', '.join(sorted(unknown))}.")
+
+
+def init_driver(config: DriverConfig = None) -> webdriver.Chrome:
+    if config is None:
+        config = DriverConfig()
+
+    options = webdriver.ChromeOptions()
+    options.page_load_strategy = config.page_load_strategy
+    options.add_argument("--window-size=%d,%d" % config.window_size)
+
+    if config.headless:
+        options.add_argument("--headless=new")
+
+    profile_dir = None
+    if config.user_data_dir:
+        profile_dir = _claim_profile_dir(config.user_data_dir)
+        options.add_argument(f"--user-data-dir={profile_dir}")
+
+    if config.capture_network:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    # Images are also turned off in the renderer, so they aren't even requested
+    if "images" in config.block:
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+
+    try:
+        driver = webdriver.Chrome(options=options)
+    except:
+        _release_profile_dir(profile_dir)
+        raise
+
+    if profile_dir:
+        weakref.finalize(driver, _release_profile_dir, profile_dir)
+
+    # Commands are attributed to the method calls that send them (see `metrics`)
+    instrument_driver(driver)
+
+    # Headless browsers give themselves away in the user agent
+    user_agent = None
+    if config.headless:
+        user_agent = driver.execute_cdp_cmd("Browser.getVersion", {})["userAgent"]
+        user_agent = user_agent.replace("HeadlessChrome", "Chrome")
+
+    stealth(
+        driver,
+        user_agent=user_agent,
+        languages=["en-US", "en"],
+        vendor="Google Inc.",
+        platform="Win32",
+        webgl_vendor="Intel Inc.",
+        renderer="Intel Iris OpenGL Engine",
+        fix_hairline=True,
+    )
+
+    if config.block:
+        patterns = [
+            pattern
+            for resource in sorted(config.block)
+            for pattern in RESOURCE_PATTERNS[resource]
+        ]
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+    if config.capture_network:
+        attach_capture(driver)
+
+    driver.implicitly_wait(IMPLICIT_WAIT)
+
+    return driver
+
+
+_claimed_profile_dirs: set[str] = set()
+_profile_dirs_lock = threading.Lock()
+
+
+def _profile_in_use(profile_dir: str) -> bool:
+    """
+    Whether a running browser holds the profile. Chrome leaves a "SingletonLock" symlink to
+    "hostname-pid" in the profiles it uses, which stays behind when it crashes or is killed.
+    """
+    lock = os.path.join(profile_dir, "SingletonLock")
+    if not os.path.lexists(lock):
+        return False
+
+    try:
+        hostname, pid = os.readlink(lock).rsplit("-", 1)
+        pid = int(pid)
+    except (OSError, ValueError):
+        return True  # not a lock this can read, leave the profile alone
+
+    # A browser on another machine sharing the directory can't be checked
+    if hostname != socket.gethostname():
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False  # Chrome takes over the profile of a browser that's gone
+    except OSError:
+        pass  # the process exists but belongs to another user
+
+    return True
+
+
+def _claim_profile_dir(user_data_dir: str) -> str:
+    """
+    Returns the first profile sub-directory no other browser is using. Chrome can't share a
+    profile between two running browsers.
+    """
+    with _profile_dirs_lock:
+        slot = 0
+        while True:
+            profile_dir = os.path.abspath(os.path.join(user_data_dir, f"driver-{slot}"))
+
+            if profile_dir not in _claimed_profile_dirs and not _profile_in_use(profile_dir):
+                os.makedirs(profile_dir, exist_ok=True)
+                _claimed_profile_dirs.add(profile_dir)
+                return profile_dir
+
+            slot += 1
+
+
+def _release_profile_dir(profile_dir: str) -> None:
+    with _profile_dirs_lock:
+        _claimed_profile_dirs.discard(profile_dir)
+
+
+class _Lease:
+    """
+    Holds the driver a thread has checked out. When the thread dies its thread-local
+    storage is cleared, the lease is garbage collected and the driver goes back to the pool.
+    """
+
+    def __init__(self, pool: "DriverPool", driver: webdriver.Chrome):
+        self.driver = driver
+        self.finalizer = weakref.finalize(self, pool.checkin, driver)
+
+
+class DriverPool:
+    """
+    Thread-safe pool of webdrivers. Drivers are created lazily up to `size`, and a driver
+    is only ever used by the thread that checked it out, so per-driver state (such as the
+    implicit wait) can't leak between concurrent operations.
+
+    Args:
+        size (int): Maximum amount of drivers. Defaults to `POOL_SIZE`.
+        factory (Callable): Function that creates a new driver. Defaults to `init_driver`.
+        timeout (float): Seconds to wait for a free driver. Defaults to `POOL_TIMEOUT` (waits forever when None).
+        prespawn (int): Drivers to start in the background right away, so they are warm when first needed. When one fails to start, the next checkout raises its error. Defaults to 0.
+        on_startup (Callable, optional): Called with each new driver and the seconds it took to start.
+
+    Usage:
+    ```python
+    pool = DriverPool(size=4)
+
+    # Pin a driver to the current thread until the block ends
+    with pool.session() as driver:
+        driver.get("https://www.instagram.com/")
+    ```
+    """
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        factory: Callable[[], webdriver.Chrome] = init_driver,
+        timeout: float = POOL_TIMEOUT,
+        prespawn: int = 0,
+        on_startup: Callable[[webdriver.Chrome, float], None] = None,
+    ):
+        if size < 1:
+            raise ValueError("The pool size must be at least 1.")
+
+        self.size = size
+        self.factory = factory
+        self.timeout = timeout
+        self.startup_times: list[float] = []  # seconds each driver took to start
+
+        self._drivers: list[webdriver.Chrome] = []
+        self._idle: list[webdriver.Chrome] = []
+        self._pending = 0  # drivers being created outside of the lock
+        self._prespawning = 0  # of which are being started in the background
+        self._prespawn_errors: list[Exception] = []  # raised by the next checkouts
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._startup_hooks: list[Callable[[webdriver.Chrome, float], None]] = []
+
+        if on_startup is not None:
+            self.add_startup_hook(on_startup)
+        if prespawn:
+            self.prespawn(prespawn)
+
+    def add_startup_hook(self, hook: Callable[[webdriver.Chrome, float], None]) -> None:
+        """
+        Registers a function called with each new driver and the seconds it took to start.
+
+        Args:
+            hook (Callable): Function to call.
+
+        Usage:
+        ```python
+        pool.add_startup_hook(lambda driver, seconds: print(f"Chrome started in {seconds:.1f}s"))
+        ```
+        """
+        self._startup_hooks.append(hook)
+
+    def prespawn(self, count: int = None, wait: bool = False) -> None:
+        """
+        Starts drivers in the background so they are ready when checked out.
+
+        Args:
+            count (int, optional): Drivers to start, as long as the pool has room. Defaults to filling the pool.
+            wait (bool): Whether to block until they have started. Defaults to False.
+
+        Errors starting a driver are raised by the next `.checkout()`.
+        """
+        with self._condition:
+            room = self.size - len(self._drivers) - self._pending
+            count = room if count is None else min(count, room)
+            count = max(count, 0)
+            self._pending += count
+            self._prespawning += count
+
+        threads = []
+        for _ in range(count):
+            thread = threading.Thread(target=self._prespawn_one, daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _prespawn_one(self) -> None:
+        try:
+            driver = self._create()
+        except Exception as error:
+            with self._condition:
+                self._pending -= 1
+                self._prespawning -= 1
+                self._prespawn_errors.append(error)
+                self._condition.notify()
+            return
+
+        with self._condition:
+            self._pending -= 1
+            self._prespawning -= 1
+            self._drivers.append(driver)
+            self._idle.append(driver)
+            self._condition.notify()
+
+    def _create(self) -> webdriver.Chrome:
+        started = time.perf_counter()
+        driver = self.factory()
+        startup_time = time.perf_counter() - started
+
+        self.startup_times.append(startup_time)
+        for hook in self._startup_hooks:
+            hook(driver, startup_time)
+
+        return driver
+
+    def checkout(self, timeout: float = None) -> webdriver.Chrome:
+        """
+        Takes a driver out of the pool, creating one if the pool isn't full yet.
+
+        Args:
+            timeout (float): Seconds to wait for a free driver. Defaults to the pool's timeout.
+
+        Returns:
+            webdriver.Chrome: A driver only the caller may use until it is checked in.
+
+        Raises:
+            PoolExhausted: Raises when no driver became available in time.
+            Exception: Raises the error a driver started in the background failed with, once.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            # Drivers starting in the background will be ready sooner than a new one
+            while not self._idle and (
+                self._prespawning or len(self._drivers) + self._pending >= self.size
+            ):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolExhausted(self.size, timeout)
+
+                self._condition.wait(remaining)
+
+            if self._prespawn_errors:
+                raise self._prespawn_errors.pop(0)
+
+            if self._idle:
+                return self._idle.pop()
+
+            self._pending += 1
+
+        # Starting a browser takes seconds, so it shouldn't block other threads
+        try:
+            driver = self._create()
+        except:
+            with self._condition:
+                self._pending -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._pending -= 1
+            self._drivers.append(driver)
+
+        return driver
+
+    def checkin(self, driver: webdriver.Chrome) -> None:
+        """
+        Returns a driver to the pool, resetting the state borrowers are allowed to change.
+
+        Args:
+            driver (webdriver.Chrome): Driver from `.checkout()`.
+        """
+        try:
+            driver.implicitly_wait(IMPLICIT_WAIT)
+        except Exception:
+            # The browser has crashed or was closed, it can't be reused
+            self.discard(driver)
+            return
+
+        with self._condition:
+            if driver in self._drivers and driver not in self._idle:
+                self._idle.append(driver)
+                self._condition.notify()
+
+    def discard(self, driver: webdriver.Chrome) -> None:
+        """
+        Removes a broken driver from the pool so a new one can take its place.
+
+        Args:
+            driver (webdriver.Chrome): Driver from `.checkout()`.
+        """
+        with self._condition:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            if driver in self._idle:
+                self._idle.remove(driver)
+            self._condition.notify()
+
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def get(self) -> webdriver.Chrome:
+        """
+        Returns the driver pinned to the current thread, checking one out if there is none.
+
+        Returns:
+            webdriver.Chrome: The current thread's driver.
+        """
+        lease = getattr(self._local, "lease", None)
+        if lease is None:
+            lease = _Lease(self, self.checkout())
+            self._local.lease = lease
+
+        return lease.driver
+
+    def release(self) -> None:
+        """
+        Unpins the current thread's driver and returns it to the pool.
+        """
+        lease = getattr(self._local, "lease", None)
+        if lease is not None:
+            del self._local.lease
+            lease.finalizer()
+
+    def session(self) -> "_Session":
+        """
+        Context manager that pins a driver to the current thread for the duration of the block.
+        Nested sessions reuse the outer session's driver.
+        """
+        return _Session(self)
+
+    def quit(self) -> None:
+        """
+        Closes every driver in the pool.
+        """
+        with self._condition:
+            drivers = list(self._drivers)
+            self._drivers.clear()
+            self._idle.clear()
+
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __len__(self) -> int:
+        return len(self._drivers)
+
+
+class _Session:
+    def __init__(self, pool: DriverPool):
+        self.pool = pool
+        self.owner = False
+
+    def __enter__(self) -> webdriver.Chrome:
+        self.owner = getattr(self.pool._local, "lease", None) is None
+        return self.pool.get()
+
+    def __exit__(self, *exc):
+        if self.owner:
+            self.pool.release()
@@ -1,2 +1,2 @@
-from .post import Post
-from .user import User
+from .post import Post, Media
+from .user import User, ProfileSnapshot
@@ -1,20 +1,130 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    WebDriverException,
+)
 from datetime import datetime
+from itertools import islice
+from typing import Iterator, Literal
 from urllib.parse import urljoin
 
-from ..pygram import Navigator, check_authorization
+from ..pygram import Account, Navigator, changes, check_authorization, predicate
+from ..cache import cached
+from ..exceptions.navigation import ElementNotFound
 from ..exceptions.post import *
 from ..utils import *
 from ..constants import *
+from ..network import find_post, get_capture
+from ..locators import locate, locate_all, register
+
+
+# Usernames in the list of the "liked by" dialog
+LIKED_BY_USERNAMES = "div.x1n2onr6.xzkaem6 > div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj > div > div > div > div > div > div.x9f619.xjbqb8w.x78zum5.x168nmei.x13lgxp2.x5pf9jr.xo71vjh.x1uhb9sk.x6ikm8r.x10wlt62.x1iyjqo2.x2lwn1j.xeuugli.xdt5ytf.xqjyukv.x1qjc9v5.x1oa3qoh.x1nhvcw1 > div > div span._ap3a._aaco._aacw._aacx._aad7._aade"
+
+# Images in the media container of the post
+POST_IMAGES = 'div[class="x6s0dn4 x1dqoszc xu3j5b3 xm81vs4 x78zum5 x1iyjqo2 x1tjbqro"] img'
+
+# Both are scrolled or read through by selector, so they can't have fallbacks, but waiting
+# for them through the registry still gives up early when they stop matching
+register("post.liked_by", (By.CSS_SELECTOR, LIKED_BY_USERNAMES))
+register("post.images", (By.CSS_SELECTOR, POST_IMAGES))
+
+# Shown instead of the comment form when comments are turned off or limited
+_COMMENTS_CLOSED_XPATH = (
+    "//*[contains(text(), 'Commenting has been turned off')"
+    " or contains(text(), 'have been limited')]"
+)
+
+# Finds the post in the JSON embedded in the page and returns every slide's best version.
+# Instagram embeds the media as `{"code": <id>, "carousel_media": [...]}` for carousels, and
+# with the image/video versions on the item itself for single media posts.
+_MEDIA_SCRIPT = """
+const shortcode = arguments[0];
+
+function findPost(root) {
+    const stack = [root];
+    while (stack.length) {
+        const node = stack.pop();
+        if (!node || typeof node !== "object") {
+            continue;
+        }
+        if (node.code === shortcode && (node.carousel_media || node.image_versions2)) {
+            return node;
+        }
+        for (const value of Object.values(node)) {
+            stack.push(value);
+        }
+    }
+    return null;
+}
+
+function best(versions) {
+    return versions.reduce((a, b) => (b.width * b.height > a.width * a.height ? b : a));
+}
+
+for (const script of document.querySelectorAll("script[type='application/json']")) {
+    if (!script.textContent.includes(shortcode)) {
+        continue;
+    }
+
+    let post;
+    try {
+        post = findPost(JSON.parse(script.textContent));
+    } catch (error) {
+        continue;
+    }
+    if (!post) {
+        continue;
+    }
+
+    const items = post.carousel_media || [post];
+    return items.map((item) => {
+        const isVideo = Boolean(item.video_versions && item.video_versions.length);
+        const versions = isVideo ? item.video_versions : (item.image_versions2 || {}).candidates;
+        if (!versions || !versions.length) {
+            return null;
+        }
+
+        const version = best(versions);
+        return {
+            url: version.url,
+            type: isVideo ? "video" : "image",
+            width: version.width || null,
+            height: version.height || null,
+        };
+    }).filter(Boolean);
+}
+return null;
+"""
+
+
+@dataclass(frozen=True)
+class Media:
+    """
+    An image or video of a post.
+
+    Args:
+        url (str): URL of the media.
+        type ("image" or "video"): Type of media.
+        width (int | None): Width in pixels, if known.
+        height (int | None): Height in pixels, if known.
+    """
+
+    url: str
+    type: Literal["image", "video"]
+    width: int | None = None
+    height: int | None = None
 
 
 @dataclass
 class Post(metaclass=Navigator):
     id: str
+    account: Account = field(default=None, repr=False, compare=False)
+
+    _ready_selector = "main article, main time"
 
     def __post_init__(self):
         self._driver: webdriver.Chrome
@@ -25,6 +135,7 @@ class Post(metaclass=Navigator):
         return url
 
     @check_authorization
+    @changes("is_liked", "get_total_likes", "get_liked_by")
     def like(self) -> None:
         """
         Likes the post.
@@ -36,13 +147,12 @@ class Post(metaclass=Navigator):
         if self.is_liked():
             raise PostLiked()
 
-        likeButton = self._driver.find_element(
-            By.CSS_SELECTOR, "div.x78zum5 > span.xp7jhwk > div"
-        )
+        likeButton = locate(self._driver, "post.like")
         likeButton.click()
         likeButton.click()
 
     @check_authorization
+    @changes("is_liked", "get_total_likes", "get_liked_by")
     def unlike(self) -> None:
         """
         Unlikes the post.
@@ -54,12 +164,12 @@ class Post(metaclass=Navigator):
         if not self.is_liked():
             raise PostNotLiked()
 
-        likeButton = self._driver.find_element(
-            By.CSS_SELECTOR, "div.x78zum5 > span.xp7jhwk > div"
-        )
+        likeButton = locate(self._driver, "post.like")
         likeButton.click()
 
+    @cached
     @check_authorization
+    @predicate
     def is_liked(self) -> bool:
         """
         Checks whether the post is liked.
@@ -68,22 +178,31 @@ class Post(metaclass=Navigator):
             bool: whether the post is liked.
 
         Raises:
+            ElementNotFound: Raises when neither the "Like" nor the "Unlike" button is shown.
             NotAuthenticated: Raises when the current account is not logged in.
         """
+        post = self._from_network()
+        if post is not None and post["is_liked"] is not None:
+            return post["is_liked"]
+
+        # Either the "Like" or the "Unlike" icon shows, whichever does tells the state
+        icons = [
+            "svg[aria-label='Like'][width='24']",
+            "svg[aria-label='Unlike'][width='24']",
+        ]
+        result = wait_for_any(
+            self._driver,
+            *(present(By.CSS_SELECTOR, icon) for icon in icons),
+            timeout=1,
+            probe="post.is_liked",
+            learn=False,
+        )
+        if not result:
+            raise ElementNotFound("post.is_liked", icons)
 
-        self._driver.implicitly_wait(1)
-
-        if self._driver.find_elements(
-            By.CSS_SELECTOR, "svg[aria-label='Like'][width='24']"
-        ):
-            self._driver.implicitly_wait(10)
-            return False
-        elif self._driver.find_elements(
-            By.CSS_SELECTOR, "svg[aria-label='Unlike'][width='24']"
-        ):
-            self._driver.implicitly_wait(10)
-            return True
+        return result.index == 1
 
+    @cached
     @check_authorization
     def get_total_likes(self) -> int:
         """
@@ -95,90 +214,132 @@ class Post(metaclass=Navigator):
         Raises:
             NotAuthenticated: Raises when the current account is not logged in.
         """
-        likes_element = self._driver.find_element(
-            By.XPATH,
-            '//section[@class="x12nagc"]//span[@class="html-span xdj266r x11i5rnm xat24cr x1mh8g0r xexx8yu x4uap5 x18d9i69 xkhd6sd x1hl2dhg x16tdsg8 x1vvkbs"]',
-        )
-        total_likes = int(likes_element.text.replace(",", ""))
+        post = self._from_network()
+        if post is not None:
+            return post["likes"]
+
+        likes_element = locate(self._driver, "post.likes")
+        total_likes = parse_count(likes_element.text)
         return total_likes
 
+    @cached
     @check_authorization
     def get_liked_by(self, limit=25) -> list:
         """
         Gets the list of users the post was liked by.
 
         Args:
-            limit (int): Maximum number of users. Defaults to 25 and can't be above 100.
+            limit (int): Maximum number of users. Defaults to 25.
 
         Returns:
             list[User]: List of Users.
 
         Raises:
-            TooManyUsers: Raises when the limit is above 100.
+            NotAuthenticated: Raises when the current account is not logged in.
         """
-        from .user import User
+        users = list(islice(self.iter_liked_by(), limit))
+        return users
 
-        if limit > 100:
-            raise TooManyUsers()
-
-        # Open likes dialog
-        likes_element = self._driver.find_element(
-            By.XPATH,
-            '//section[@class="x12nagc"]//span[@class="html-span xdj266r x11i5rnm xat24cr x1mh8g0r xexx8yu x4uap5 x18d9i69 xkhd6sd x1hl2dhg x16tdsg8 x1vvkbs"]',
-        )
-        likes_element.click()
+    @check_authorization
+    def iter_liked_by(
+        self, progress: ScrollProgress = None, timeout: float = IMPLICIT_WAIT
+    ) -> Iterator:
+        """
+        Yields the users the post was liked by, scrolling the "liked by" dialog as they load.
+        Each user is only yielded once. The post is loaded and the dialog opened when this is
+        called, not when iteration starts, and the dialog is closed once iteration ends.
 
-        # Initialize list to store unique users
-        users = []
+        Resuming from a progress opens the dialog again and scrolls it from the top: the users
+        seen before are skipped, but still have to load, so resuming near the end of a long
+        list takes about as long as the iteration before it. The same happens when the driver
+        is used for something else between two users (e.g. to follow them).
 
-        while True:
-            try:
-                # Find the user list container
-                user_list = self._driver.find_element(
-                    By.CSS_SELECTOR,
-                    "div.x1n2onr6.xzkaem6 > div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj > div > div > div > div > div > div.x9f619.xjbqb8w.x78zum5.x168nmei.x13lgxp2.x5pf9jr.xo71vjh.x1uhb9sk.x6ikm8r.x10wlt62.x1iyjqo2.x2lwn1j.xeuugli.xdt5ytf.xqjyukv.x1qjc9v5.x1oa3qoh.x1nhvcw1 > div > div",
-                )
-
-                # Find all the username elements
-                username_elements = user_list.find_elements(
-                    By.CSS_SELECTOR, "span._ap3a._aaco._aacw._aacx._aad7._aade"
-                )
-            except StaleElementReferenceException:
-                # Wait for the list of users to load
-                time.sleep(1)
+        Args:
+            progress (ScrollProgress, optional): Progress of a previous iteration to resume from. Users it has seen are skipped.
+            timeout (float, optional): Seconds to wait for more users to load before considering the end of the list reached. Defaults to `IMPLICIT_WAIT`.
+
+        Yields:
+            User: User who liked the post.
+
+        Usage:
+        ```python
+        progress = ScrollProgress()
+        try:
+            for user in post.iter_liked_by(progress):
+                pipeline.send(user.name)
+        except WebDriverException:
+            # Carry on where it stopped, skipping the users already sent
+            for user in post.iter_liked_by(progress):
+                pipeline.send(user.name)
+        ```
 
-                # Retry if stale element exception occurs
-                continue
+        Raises:
+            NotAuthenticated: Raises when the current account is not logged in.
+        """
+        self._open_liked_by()
+        return self._iter_liked_by(progress, timeout)
 
-            # Extract usernames and create User objects
-            new_users = [User(element.text) for element in username_elements]
+    def _open_liked_by(self):
+        # Open likes dialog
+        likes_element = locate(self._driver, "post.likes")
+        likes_element.click()
 
-            # Add unique users to the list
-            for user in new_users:
-                if user.name not in [u.name for u in users]:
-                    users.append(user)
+        # Wait for the list of users to load
+        locate(self._driver, "post.liked_by")
 
-            # Scroll to the last user element to load more users
-            if new_users:
-                last_user = username_elements[-1]
-                self._driver.execute_script(
-                    "arguments[0].scrollIntoView(true);", last_user
-                )
+    def _iter_liked_by(self, progress: ScrollProgress, timeout: float) -> Iterator:
+        from .user import User
 
-            # Check if the limit is reached or no new users are loaded
-            if len(users) >= limit or not new_users:
-                break
+        try:
+            # Using the driver elsewhere between users closes the dialog, it's opened again
+            # (loading the post first, if needed) and the users already seen are skipped
+            for username in iter_scroll_values(
+                self._driver,
+                LIKED_BY_USERNAMES,
+                progress=progress,
+                timeout=timeout,
+                reopen=self._open_liked_by,
+            ):
+                yield User(username, self.account)
+        finally:
+            # Close the dialog, also when the iteration is stopped early
+            try:
+                for close_btn in locate_all(self._driver, "dialog.close", timeout=0)[:1]:
+                    close_btn.click()
+            except WebDriverException:
+                pass
 
-        # Close the dialog by refreshing the page
-        self._driver.refresh()
+    @cached
+    @check_authorization
+    def get_media(self) -> list[Media]:
+        """
+        Gets every image and video of the post, including all slides of a carousel. The media is
+        read from the data embedded in the page in a single round trip, without clicking through
+        the carousel. If the data can't be found, it falls back to clicking through the images.
 
-        # Return the necessary number of users within the limit
-        return users[:limit]
+        Returns:
+            list[Media]: Media of the post, in order.
 
+        Raises:
+            NotAuthenticated: Raises when the current account is not logged in.
+        """
+        items = self._driver.execute_script(_MEDIA_SCRIPT, self.id)
+        if not items:
+            image_urls = self._get_images_by_clicking()
+            return [Media(url, "image") for url in image_urls]
+
+        media = [
+            Media(item["url"], item["type"], item["width"], item["height"])
+            for item in items
+        ]
+        return media
+
+    @cached
     @check_authorization
     def get_images(self) -> list[str]:
         """
-        Gets list of images from the post.
+        Gets list of images from the post, one URL per slide. Slides that are videos give the
+        video's URL, use `.get_media()` to tell them apart.
 
         Returns:
             list[str]: List of image URLs
@@ -186,19 +347,27 @@ class Post(metaclass=Navigator):
         Raises:
             NotAuthenticated: Raises when the current account is not logged in.
         """
+        image_urls = [media.url for media in self.get_media()]
+        return image_urls
+
+    def _get_images_by_clicking(self) -> list[str]:
+        # Wait for the images to load
+        locate(self._driver, "post.images")
+
         image_urls = []
+        seen = set()
         while True:
-            image_list_elements = self._driver.find_element(
-                By.XPATH,
-                '//div[@class="x6s0dn4 x1dqoszc xu3j5b3 xm81vs4 x78zum5 x1iyjqo2 x1tjbqro"]',
+            images = extract_all(
+                self._driver,
+                POST_IMAGES,
+                "src",
             )
 
-            images = image_list_elements.find_elements(By.TAG_NAME, "img")
-
             new_image_urls = []
             for image in images:
-                url = image.get_attribute("src")
-                if url not in image_urls:
+                url = image["src"]
+                if url not in seen:
+                    seen.add(url)
                     new_image_urls.append(url)
 
             image_urls.extend(new_image_urls)
@@ -210,9 +379,7 @@ class Post(metaclass=Navigator):
 
             # An image loads on each side of the current index of a post, so to get the
             # next two posts, it shall double click the next button
-            next_btn = self._driver.find_element(
-                By.XPATH, '//button[@aria-label="Next"][@class=" _afxw _al46 _al47"]'
-            )
+            next_btn = locate(self._driver, "post.next_image")
             next_btn.click()
 
             # On the last image the next button will dissapear, so if it tries to click it
@@ -225,12 +392,13 @@ class Post(metaclass=Navigator):
         return image_urls
 
     @check_authorization
-    def comment(self, text: str):
+    def comment(self, text: str, typing: TypingStrategy = None):
         """
         Comments on the post.
 
         Args:
             text (str): The comment.
+            typing (TypingStrategy, optional): How to type the comment. Defaults to the strategy set with `set_typing_strategy`.
 
         Raises:
             CannotComment: Whether you can comment.
@@ -239,22 +407,21 @@ class Post(metaclass=Navigator):
         if not self.can_comment():
             raise CannotComment()
 
-        # Find form and write the comment text
-        form_element = self._driver.find_element(By.TAG_NAME, "form")
-
         # The textarea changes when selecting it, triggering a "StaleElementReferenceException"
         # which can be fixed, by selecting it (clicking) and find it again
-        textarea = form_element.find_element(By.TAG_NAME, "textarea")
+        textarea = locate(self._driver, "post.comment_input")
         textarea.click()
 
         # Find textarea again
-        textarea = form_element.find_element(By.TAG_NAME, "textarea")
-        write(textarea, text)  # Write comment
+        textarea = locate(self._driver, "post.comment_input")
+        write(textarea, text, strategy=typing)  # Write comment
 
         # Submit the form
         textarea.send_keys(Keys.RETURN)
 
+    @cached
     @check_authorization
+    @predicate
     def can_comment(self) -> bool:
         """
         Checks if you can comment on the post.
@@ -265,14 +432,19 @@ class Post(metaclass=Navigator):
         Raises:
             NotAuthenticated: Raises when the current account is not logged in.
         """
-        self._driver.implicitly_wait(2)
-
-        # Check for form elements
-        found_elements = self._driver.find_elements(By.TAG_NAME, "form")
-
-        self._driver.implicitly_wait(IMPLICIT_WAIT)
-        return bool(found_elements)
+        # Wait for the comment form, or for the notice shown instead of it, whichever renders
+        # first tells whether comments are open
+        result = wait_for_any(
+            self._driver,
+            present(By.TAG_NAME, "form"),
+            present(By.XPATH, _COMMENTS_CLOSED_XPATH),
+            timeout=2,
+            probe="post.can_comment",
+            learn=False,
+        )
+        return result.index == 0
 
+    @cached
     @check_authorization
     def get_author(self):
         """
@@ -287,14 +459,16 @@ class Post(metaclass=Navigator):
         # To prevent from circular import
         from .user import User
 
-        username = self._driver.find_element(
-            By.XPATH,
-            '//div[@class="xyinxu5 x1pi30zi x1g2khh7 x1swvt13"]//span[@class="_ap3a _aaco _aacw _aacx _aad7 _aade"]',
-        ).text
+        post = self._from_network()
+        if post is not None and post["author"]:
+            return User(post["author"], self.account)
+
+        username = locate(self._driver, "post.author").text
 
-        user = User(username)
+        user = User(username, self.account)
         return user
 
+    @cached
     @check_authorization
     def get_date_posted(self) -> datetime:
         """
@@ -303,8 +477,20 @@ class Post(metaclass=Navigator):
         Returns:
             datetime: Publish date.
         """
-        time_element = self._driver.find_element(By.CSS_SELECTOR, "time.x1p4m5qa")
+        post = self._from_network()
+        if post is not None:
+            return post["date_posted"]
+
+        time_element = locate(self._driver, "post.date_posted")
         time_str = time_element.get_attribute("datetime")
         publish_date = parse_instagram_date(time_str)
 
         return publish_date
+
+    def _from_network(self) -> dict | None:
+        # The post's metadata as fetched by the page, if the driver captures responses
+        capture = get_capture(self._driver)
+        if capture is None:
+            return None
+
+        return capture.find(lambda payload: find_post(payload, self.id))
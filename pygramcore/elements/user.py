@@ -1,18 +1,147 @@
-from dataclasses import dataclass
-from typing import Literal
+from dataclasses import dataclass, field
+from typing import Literal, Iterator
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import ElementClickInterceptedException
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    NoSuchElementException,
+    TimeoutException,
+    WebDriverException,
+)
 from urllib.parse import urlparse, urljoin
-import time
+from functools import wraps
+from itertools import islice
 
 from ..pygram import *
+from ..cache import cached
 from ..exceptions.user import *
 from ..utils import *
 from ..constants import *
+from ..network import find_user, get_capture
+from ..locators import locate, locate_all, register
+
+
+# Waits for the profile header to render and reads every fact from it at once
+_PROFILE_SCRIPT = """
+const [privateXPath, timeout, done] = arguments;
+const started = Date.now();
+
+function read() {
+    const counts = document.querySelectorAll("span._ac2a");
+    if (counts.length < 3) {
+        return null;
+    }
+
+    const text = (element) => (element ? element.textContent.trim() : null);
+    const followButton = document.querySelector("button._acan._acap._aj1-._ap30");
+    const title = document.querySelector("meta[property='og:title']");
+    const privateDiv = document.evaluate(
+        privateXPath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+
+    return {
+        posts: text(counts[0].querySelector("span")),
+        followers: counts[1].getAttribute("title") || text(counts[1]),
+        following: text(counts[2].querySelector("span")),
+        is_private: Boolean(privateDiv),
+        is_following: followButton ? followButton.classList.contains("_acat") : null,
+        title: title ? title.getAttribute("content") : null,
+        bio: text(document.querySelector("header section h1")),
+    };
+}
+
+(function poll() {
+    const profile = read();
+    if (profile || Date.now() - started > timeout) {
+        done(profile);
+    } else {
+        setTimeout(poll, 50);
+    }
+})();
+"""
+
+# What only public profiles show: their posts, or the notice that there are none yet
+_PUBLIC_SELECTOR = "main a[href^='/p/'], main a[href^='/reel/']"
+_NO_POSTS_XPATH = "//main//span[normalize-space()='No posts yet']"
+
+_PRIVATE_XPATH = '//div[@class="x9f619 xjbqb8w x78zum5 x168nmei x13lgxp2 x5pf9jr xo71vjh x1uhb9sk x1plvlek xryxfnj x1c4vz4f x2lah0s x1q0g3np xqjyukv x6s0dn4 x1oa3qoh x1nhvcw1"]'
+
+# Fetches a page of a user's followers or following from the API the dialogs use, from one of
+# Instagram's pages. The user's ID is looked up first when it isn't known yet. Answers with the
+# status of the failed request, if any.
+_FOLLOW_PAGE_SCRIPT = """
+const [username, userId, kind, cursor, count, timeout, done] = arguments;
+const controller = new AbortController();
+setTimeout(() => controller.abort(), timeout);
+
+function get(url) {
+    return fetch(url, {
+        credentials: "include",
+        headers: { "X-IG-App-ID": "936619743392459" },
+        signal: controller.signal,
+    }).then((response) => {
+        if (!response.ok) {
+            throw response.status;
+        }
+        return response.json();
+    });
+}
+
+const id = userId
+    ? Promise.resolve(userId)
+    : get(`/api/v1/users/web_profile_info/?username=${encodeURIComponent(username)}`).then(
+          (profile) => profile.data.user.id
+      );
+
+id.then((id) => {
+    let url = `/api/v1/friendships/${id}/${kind}/?count=${count}`;
+    if (cursor) {
+        url += `&max_id=${encodeURIComponent(cursor)}`;
+    }
+    return get(url).then((page) => {
+        done({
+            status: 200,
+            user_id: id,
+            users: page.users.map((user) => user.username),
+            next: page.next_max_id || null,
+        });
+    });
+}).catch((status) => done({ status: typeof status === "number" ? status : null }));
+"""
+
+# Usernames in the list of the "followers" and "following" dialogs
+FOLLOW_LIST_USERNAMES = "div[role='dialog'] span._ap3a._aaco._aacw._aacx._aad7._aade"
+
+# The list is scrolled through by selector, so it can't have fallbacks
+register("user.follow_list", (By.CSS_SELECTOR, FOLLOW_LIST_USERNAMES))
+
+
+@dataclass(frozen=True)
+class ProfileSnapshot:
+    """
+    Facts from a user's profile header, read at a single point in time.
+
+    Args:
+        name (str): Username of the user.
+        total_posts (int): Total amount of posts.
+        followers (int): Total amount of followers.
+        following (int): Amount of people the user follows.
+        is_private (bool): Whether the account is private.
+        is_following (bool | None): Whether the account logged in follows the user. None when there is no follow button (e.g. your own profile).
+        full_name (str | None): Display name of the user.
+        bio (str | None): Biography of the user.
+    """
+
+    name: str
+    total_posts: int
+    followers: int
+    following: int
+    is_private: bool
+    is_following: bool | None
+    full_name: str | None
+    bio: str | None
 
 
 def user_dialog_action(func):
@@ -20,6 +149,7 @@ def user_dialog_action(func):
     Decorator function that opens and closes the user dialog. The user dialog is where you can take actions on a user, such as: unfollowing, adding or removing from close friends, etc...
     """
 
+    @wraps(func)
     def wrapper(user: "User", *args, **kwargs):
         if not user.is_following():
             raise UserNotFollowed(user.name)
@@ -36,12 +166,9 @@ def user_dialog_action(func):
         # Attempt to close the user dialog, some actions
         # close the dialog automatically (e.g. unfollowing)
         try:
-            user._driver.implicitly_wait(0)
             user._close_user_dialog()
         except:
             pass
-        finally:
-            user._driver.implicitly_wait(IMPLICIT_WAIT)
 
         return value
 
@@ -91,9 +218,13 @@ class User(metaclass=Navigator):
 
     Args:
         name (str): Username of the user.
+        account (Account, optional): Account to browse as. Defaults to the default account.
     """
 
     name: str
+    account: Account = field(default=None, repr=False, compare=False)
+
+    _ready_selector = "header section"
 
     def __post_init__(self):
         self._driver: webdriver.Chrome
@@ -103,7 +234,9 @@ class User(metaclass=Navigator):
         url = urljoin(INSTAGRAM_URL, self.name)
         return url
 
+    @cached
     @check_authorization
+    @predicate
     def is_private(self) -> bool:
         """
         Checks if the user has a private account.
@@ -114,19 +247,25 @@ class User(metaclass=Navigator):
         Raises:
             NotAuthenticated: Raises when the current account is not logged in.
         """
-        self._driver.implicitly_wait(2)
-
-        # Attempt to find the div that contains "This account is private"
-        elements_found = self._driver.find_elements(
-            By.XPATH,
-            '//div[@class="x9f619 xjbqb8w x78zum5 x168nmei x13lgxp2 x5pf9jr xo71vjh x1uhb9sk x1plvlek xryxfnj x1c4vz4f x2lah0s x1q0g3np xqjyukv x6s0dn4 x1oa3qoh x1nhvcw1"]',
+        profile = self._from_network()
+        if profile is not None:
+            return profile["is_private"]
+
+        # Wait for the div that contains "This account is private", or for what only public
+        # profiles show, whichever renders first tells which it is
+        result = wait_for_any(
+            self._driver,
+            present(By.XPATH, _PRIVATE_XPATH),
+            present(By.CSS_SELECTOR, _PUBLIC_SELECTOR),
+            present(By.XPATH, _NO_POSTS_XPATH),
+            timeout=2,
+            probe="user.is_private",
+            learn=False,
         )
-
-        self._driver.implicitly_wait(IMPLICIT_WAIT)
-
-        return bool(elements_found)
+        return result.index == 0
 
     @check_authorization
+    @changes("is_following", "get_profile", "get_followers")
     def follow(self) -> None:
         """
         Follows the user with the current account logged in.
@@ -138,12 +277,17 @@ class User(metaclass=Navigator):
         if self.is_following():
             raise UserAlreadyFollowed(self.name)
 
-        follow_btn = self._driver.find_element(
-            By.XPATH, '//button[@class=" _acan _acap _acas _aj1- _ap30"]'
-        )
+        follow_btn = locate(self._driver, "user.follow")
         follow_btn.click()
 
     @check_authorization
+    @changes(
+        "is_following",
+        "is_close_friend",
+        "is_private",
+        "get_profile",
+        "get_followers",
+    )
     @check_private
     @check_following
     @user_dialog_action
@@ -156,13 +300,12 @@ class User(metaclass=Navigator):
             NotAuthenticated: Raises when the current account is not logged in.
             UserIsPrivate: Raises when the user is private.
         """
-        unfollow_btn = self._driver.find_element(
-            By.CSS_SELECTOR,
-            "body > div.x1n2onr6.xzkaem6 > div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj > div > div > div > div > div.x7r02ix.xf1ldfh.x131esax.xdajt7p.xxfnqb6.xb88tzc.xw2csxc.x1odjw0f.x5fp0pe > div > div > div > div:nth-child(8)",
-        )
+        unfollow_btn = locate(self._driver, "user.unfollow")
         unfollow_btn.click()
 
+    @cached
     @check_authorization
+    @predicate
     def is_following(self):
         """
         Check whether the account logged in follows the user.
@@ -173,9 +316,11 @@ class User(metaclass=Navigator):
         Raises:
             NotAuthenticated: Raises when the current account is not logged in.
         """
-        follow_btn = self._driver.find_element(
-            By.CSS_SELECTOR, "button._acan._acap._aj1-._ap30"
-        )
+        profile = self._from_network()
+        if profile is not None and profile["is_following"] is not None:
+            return profile["is_following"]
+
+        follow_btn = locate(self._driver, "user.follow_state")
         classes = follow_btn.get_attribute("class")
 
         # "_acat" when following
@@ -183,6 +328,7 @@ class User(metaclass=Navigator):
         return "_acat" in classes
 
     @check_authorization
+    @changes("is_close_friend")
     @check_private
     @check_following
     @user_dialog_action
@@ -199,12 +345,11 @@ class User(metaclass=Navigator):
             raise UserCloseFriend(self.name)
         self._open_user_dialog()
 
-        close_friend_btn = self._driver.find_element(
-            By.CSS_SELECTOR, 'svg[aria-label="Close friend"]'
-        )
+        close_friend_btn = locate(self._driver, "user.close_friend")
         close_friend_btn.click()
 
     @check_authorization
+    @changes("is_close_friend")
     @check_following
     @user_dialog_action
     def remove_close_friend(self):
@@ -220,12 +365,12 @@ class User(metaclass=Navigator):
             raise UserNotCloseFriend(self.name)
         self._open_user_dialog()
 
-        close_friend_btn = self._driver.find_element(
-            By.CSS_SELECTOR, "svg[aria-label='Close friend']"
-        )
+        close_friend_btn = locate(self._driver, "user.close_friend")
         close_friend_btn.click()
 
+    @cached
     @check_authorization
+    @predicate
     @user_dialog_action
     def is_close_friend(self) -> bool:
         """
@@ -242,10 +387,7 @@ class User(metaclass=Navigator):
             return False
 
         # Check if already close friend
-        close_friends_icon = self._driver.find_element(
-            By.CSS_SELECTOR,
-            'svg[aria-label="Close friend"]',
-        )
+        close_friends_icon = locate(self._driver, "user.close_friend")
 
         classes = close_friends_icon.get_attribute("class")
         return "x1g9anri" in classes
@@ -280,16 +422,10 @@ class User(metaclass=Navigator):
         if not all(mode in ["posts", "stories"] for mode in modes):
             raise ValueError("This mute mode does not exist!")
 
-        mute_menu = self._driver.find_element(
-            By.CSS_SELECTOR,
-            "body > div.x1n2onr6.xzkaem6 > div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj > div > div > div > div > div.x7r02ix.xf1ldfh.x131esax.xdajt7p.xxfnqb6.xb88tzc.xw2csxc.x1odjw0f.x5fp0pe > div > div > div > div:nth-child(6)",
-        )
+        mute_menu = locate(self._driver, "user.mute")
         mute_menu.click()
 
-        mute_btns = self._driver.find_elements(
-            By.XPATH,
-            '//input[@dir="ltr"]',
-        )
+        mute_btns = locate_all(self._driver, "user.mute_options")
 
         # Associate mute modes to indexes of the options on the menu
         mode_indexes = {"posts": 0, "stories": 1}
@@ -303,12 +439,58 @@ class User(metaclass=Navigator):
                 mute_btn.click()
 
         # Submit options
-        submit_btn = self._driver.find_element(
-            By.CSS_SELECTOR,
-            "body > div.x1n2onr6.xzkaem6 > div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj > div > div > div > div > div.x7r02ix.xf1ldfh.x131esax.xdajt7p.xxfnqb6.xb88tzc.xw2csxc.x1odjw0f.x5fp0pe > div > div > div > div.x9f619.xjbqb8w.x78zum5.x168nmei.x13lgxp2.x5pf9jr.xo71vjh.x1uhb9sk.x1plvlek.xryxfnj.x1c4vz4f.x2lah0s.xdt5ytf.xqjyukv.x1qjc9v5.x1oa3qoh.x1nhvcw1 > div.x9f619.xjbqb8w.x78zum5.x168nmei.x13lgxp2.x5pf9jr.xo71vjh.x1y1aw1k.x1sxyh0.xwib8y2.xurb0ha.x1uhb9sk.x1plvlek.xryxfnj.x1c4vz4f.x2lah0s.xdt5ytf.xqjyukv.x1qjc9v5.x1oa3qoh.x1nhvcw1 > div",
-        )
+        submit_btn = locate(self._driver, "user.mute_save")
         submit_btn.click()
 
+    @cached
+    def get_profile(self) -> ProfileSnapshot:
+        """
+        Reads every fact from the user's profile header in a single round trip.
+
+        Returns:
+            ProfileSnapshot: Counts, privacy, follow state, full name and bio of the user.
+
+        Usage:
+        ```python
+        profile = User("username").get_profile()
+        print(profile.followers, profile.bio)
+        ```
+        """
+        profile = self._from_network()
+        if profile is not None:
+            return ProfileSnapshot(name=self.name, **profile)
+
+        profile = execute_wait_script(
+            self._driver, _PROFILE_SCRIPT, IMPLICIT_WAIT, _PRIVATE_XPATH
+        )
+        if profile is None:
+            raise NoSuchElementException("The profile header couldn't be found.")
+
+        # The title looks like "Full Name (@username) • Instagram photos and videos"
+        full_name = None
+        if profile["title"] and f"(@{self.name})" in profile["title"]:
+            full_name = profile["title"].split(f"(@{self.name})")[0].strip() or None
+
+        return ProfileSnapshot(
+            name=self.name,
+            total_posts=parse_count(profile["posts"]),
+            followers=parse_count(profile["followers"]),
+            following=parse_count(profile["following"]),
+            is_private=profile["is_private"],
+            is_following=profile["is_following"],
+            full_name=full_name,
+            bio=profile["bio"] or None,
+        )
+
+    def _from_network(self) -> dict | None:
+        # The profile as fetched by the page, if the driver captures responses
+        capture = get_capture(self._driver)
+        if capture is None:
+            return None
+
+        return capture.find(lambda payload: find_user(payload, self.name))
+
+    @cached
     def get_total_posts(self) -> int:
         """
         Get the user's total amount of posts.
@@ -316,13 +498,9 @@ class User(metaclass=Navigator):
         Returns:
             int: total posts
         """
-        posts_span, _, _ = self._driver.find_elements(By.CSS_SELECTOR, "span._ac2a")
-        posts_str = posts_span.find_element(By.CSS_SELECTOR, "span").text
-
-        # Remove the commas and convert to integer
-        posts = int(posts_str.replace(",", ""))
-        return posts
+        return self.get_profile().total_posts
 
+    @cached
     def get_followers(self) -> int:
         """
         Get the user's total amount of followers
@@ -330,14 +508,9 @@ class User(metaclass=Navigator):
         Returns:
             int: total followers
         """
-        # Gets the string value (e.g. "156,204")
-        _, followers_span, _ = self._driver.find_elements(By.CSS_SELECTOR, "span._ac2a")
-        followers_str = followers_span.get_property("title")
-
-        # Remove the commas and convert to integer
-        followers = int(followers_str.replace(",", ""))
-        return followers
+        return self.get_profile().followers
 
+    @cached
     def get_following(self) -> int:
         """
         Get the amount of people the user follows.
@@ -345,51 +518,58 @@ class User(metaclass=Navigator):
         Returns:
             int: total following
         """
-        _, _, following_span = self._driver.find_elements(By.CSS_SELECTOR, "span._ac2a")
-        following_str = following_span.find_element(By.CSS_SELECTOR, "span").text
-
-        # Remove the commas and convert to integer
-        following = int(following_str.replace(",", ""))
-        return following
+        return self.get_profile().following
 
     @check_authorization
     @check_private
-    def send_dm(self, message: str) -> None:
+    def send_dm(
+        self, message: str, typing: TypingStrategy = None, timeout: float = 15
+    ) -> None:
         """
         Send a DM (direct message) to the user.
 
         Args:
             message (str): Message to send the user.
+            typing (TypingStrategy, optional): How to type the message. Defaults to the strategy set with `set_typing_strategy`.
+            timeout (float, optional): Seconds to wait for the message to be sent. Defaults to 15.
 
         Raises:
             NotAuthenticated: Raises when the current account is not logged in.
             UserIsPrivate: Raises when the user is private.
+            ActionTimeout: Raises when the message wasn't sent in time.
         """
         # Enter the DMs
-        message_btn = self._driver.find_element(By.XPATH, '//div[text()="Message"]')
+        message_btn = locate(self._driver, "user.message")
         message_btn.click()
 
         # Write the the message
-        message_input = self._driver.find_element(
-            By.XPATH,
-            '//div[@aria-describedby="Message"]',
-        )
-        write(message_input, message)
+        message_input = locate(self._driver, "user.message_input")
+        write(message_input, message, strategy=typing)
 
         # Send message
+        rows = count_present(self._driver, "div[role='row']")
         message_input = message_input.send_keys(Keys.ENTER)
 
-        # Wait for message to send, moving on immediately after doesn't send the message
-        time.sleep(0.5)
+        # Wait for message to send, moving on immediately after doesn't send the message.
+        # It has been sent once the input is cleared and a new message with its text shows in
+        # the conversation (the same text may have been sent before).
+        lines = message.strip().splitlines()
+        wait_for_completion(
+            self._driver,
+            absent(By.XPATH, '//div[@aria-describedby="Message"][normalize-space()]')
+            & count_above("div[role='row']", rows)
+            & text_present("div[role='row']", lines[-1] if lines else ""),
+            action="user.send_dm",
+            timeout=timeout,
+        )
 
-    @check_private
     def get_posts(self, reels=True, limit=25) -> list:
         """
         Get a list of posts from the user's account.
 
         Args:
             reels (bool, optional): Whether to include reels or not. Defaults to True.
-            limit (int, optional): Limits the amount of posts to retrieve. Defaults to 25 and can't be above 100.
+            limit (int, optional): Limits the amount of posts to retrieve. Defaults to 25.
 
         Returns:
             list[Post]: List of post objects
@@ -405,6 +585,31 @@ class User(metaclass=Navigator):
             post.like()
         ```
 
+        Raises:
+            UserIsPrivate: Raises when the user is private.
+        """
+        posts = list(islice(self.iter_posts(reels), limit))
+        return posts
+
+    @check_private
+    def iter_posts(self, reels=True, timeout: float = IMPLICIT_WAIT) -> Iterator:
+        """
+        Yields the user's posts one by one as they load, scrolling down the profile as needed.
+        Each post is only yielded once.
+
+        Args:
+            reels (bool, optional): Whether to include reels or not. Defaults to True.
+            timeout (float, optional): Seconds to wait for new posts to load before considering the end of the profile reached. Defaults to `IMPLICIT_WAIT`.
+
+        Yields:
+            Post: Post of the user.
+
+        Usage:
+        ```python
+        for post in User("username").iter_posts():
+            pipeline.send(post.id)
+        ```
+
         Raises:
             UserIsPrivate: Raises when the user is private.
         """
@@ -414,43 +619,209 @@ class User(metaclass=Navigator):
         if reels:
             css_selector += ",a[href^='/reel/']"
 
-        posts = []
+        # The profile's post count includes reels, so it tells when the end is reached
+        total_posts = self.get_profile().total_posts if reels else None
+
+        seen = set()
+        while total_posts is None or len(seen) < total_posts:
+            # Using the driver elsewhere in between yields moves it away from the profile,
+            # in that case the profile is loaded again and already seen posts are skipped.
+            navigate(self._driver, self.url)
+
+            # Read the links of the loaded posts and scroll to the last one to load more
+            post_links = extract_all(self._driver, css_selector, "href", scroll=True)
+            last_link = post_links[-1]["href"] if post_links else None
+
+            for post_link in post_links:
+                path = urlparse(post_link["href"]).path
+                shortcode = path.split("/")[2]
 
-        # Scroll down to load posts
-        while len(posts) < limit:
-            # Scroll down
-            self._driver.find_element(By.TAG_NAME, "body").send_keys(Keys.END)
+                if shortcode not in seen:
+                    seen.add(shortcode)
+                    yield Post(shortcode, self.account)
 
-            # Wait for new posts to load
-            WebDriverWait(self._driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, css_selector))
+            # Every post has been seen, no more rows will load
+            if total_posts is not None and len(seen) >= total_posts:
+                return
+
+            # Wait for new grid rows to load, if none do, the end has been reached
+            try:
+                WebDriverWait(self._driver, timeout, poll_frequency=0.2).until(
+                    lambda driver: extract_last(driver, css_selector, "href") != last_link
+                )
+            except TimeoutException:
+                return
+
+    @check_authorization
+    @check_private
+    def iter_followers(
+        self, checkpoint: ListCheckpoint | str = None, timeout: float = IMPLICIT_WAIT
+    ) -> Iterator:
+        """
+        Yields the user's followers, page by page, from the API the "followers" dialog reads
+        them from. Each user is only yielded once, and memory stays the same however many
+        followers there are. When the API can't be used, the dialog is scrolled instead.
+
+        Args:
+            checkpoint (ListCheckpoint | str, optional): Checkpoint to resume from and update, or the path of its file. Users yielded before are skipped.
+            timeout (float, optional): Seconds to wait for a page of users (or, when scrolling, for more users to load before considering the end of the list reached). Defaults to `IMPLICIT_WAIT`.
+
+        Yields:
+            User: Follower of the user.
+
+        Usage:
+        ```python
+        # Survives crashes and restarts: running it again carries on from the page it stopped at
+        for follower in User("username").iter_followers("followers.json"):
+            pipeline.send(follower.name)
+        ```
+
+        Raises:
+            NotAuthenticated: Raises when the current account is not logged in.
+            UserIsPrivate: Raises when the user is private.
+            ValueError: Raises when the checkpoint is of another list, or when a scrolled list can't be resumed (see `iter_scroll_checkpointed`).
+            ActionBlocked: Raises when Instagram rate limits the requests. The checkpoint is saved, so the iteration can be resumed later.
+            WebDriverException: Raises when a page of users couldn't be fetched.
+        """
+        return self._iter_follow_list("followers", checkpoint, timeout)
+
+    @check_authorization
+    @check_private
+    def iter_following(
+        self, checkpoint: ListCheckpoint | str = None, timeout: float = IMPLICIT_WAIT
+    ) -> Iterator:
+        """
+        Yields the users the user follows, page by page, from the API the "following" dialog
+        reads them from. See `iter_followers`.
+
+        Args:
+            checkpoint (ListCheckpoint | str, optional): Checkpoint to resume from and update, or the path of its file. Users yielded before are skipped.
+            timeout (float, optional): Seconds to wait for a page of users (or, when scrolling, for more users to load before considering the end of the list reached). Defaults to `IMPLICIT_WAIT`.
+
+        Yields:
+            User: User followed by the user.
+
+        Raises:
+            NotAuthenticated: Raises when the current account is not logged in.
+            UserIsPrivate: Raises when the user is private.
+            ValueError: Raises when the checkpoint is of another list.
+            ActionBlocked: Raises when Instagram rate limits the requests.
+            WebDriverException: Raises when a page of users couldn't be fetched.
+        """
+        return self._iter_follow_list("following", checkpoint, timeout)
+
+    def _iter_follow_list(
+        self, kind: str, checkpoint: ListCheckpoint | str, timeout: float
+    ) -> Iterator:
+        # The checkpoint is checked right away, not once iteration starts
+        key = f"{self.name}/{kind}"
+        if checkpoint is None:
+            checkpoint = ListCheckpoint(key=key)
+        elif isinstance(checkpoint, str):
+            checkpoint = ListCheckpoint.load(checkpoint, key=key)
+        elif checkpoint.key is None:
+            checkpoint.key = key
+        elif checkpoint.key != key:
+            raise ValueError(f'The checkpoint is of "{checkpoint.key}", not "{key}".')
+
+        # Checkpoints of a scrolled list have no cursor to resume the pages from
+        if checkpoint.count and checkpoint.cursor is None:
+            return self._scroll_follow_list(kind, checkpoint, timeout)
+
+        return self._page_follow_list(kind, checkpoint, timeout)
+
+    def _page_follow_list(
+        self, kind: str, checkpoint: ListCheckpoint, timeout: float
+    ) -> Iterator:
+        if checkpoint.done:
+            return
+
+        # Requests are made from the profile, like the dialog does
+        navigate(self._driver, self.url)
+
+        user_id = None
+
+        def fetch_page(cursor: str) -> tuple[list[str], str | None]:
+            nonlocal user_id
+            page = execute_wait_script(
+                self._driver,
+                _FOLLOW_PAGE_SCRIPT,
+                timeout,
+                self.name,
+                user_id,
+                kind,
+                cursor,
+                FOLLOW_LIST_PAGE_SIZE,
             )
+            if page["status"] == 429:
+                raise ActionBlocked(f"user.iter_{kind}")
+            if page["status"] != 200:
+                raise WebDriverException(
+                    f'The {kind} of "{self.name}" couldn\'t be fetched (status {page["status"]}).'
+                )
+
+            user_id = page["user_id"]
+            return page["users"], page["next"]
 
-            # Get all posts
-            post_elements = self._driver.find_elements(By.CSS_SELECTOR, css_selector)
+        usernames = iter_pages_checkpointed(fetch_page, checkpoint)
+        try:
+            first = next(usernames, None)
+        except WebDriverException:
+            if checkpoint.count:
+                raise
+
+            # The API isn't available to the session, so the dialog is scrolled instead
+            checkpoint.cursor = None
+            yield from self._scroll_follow_list(kind, checkpoint, timeout)
+            return
+
+        if first is None:
+            return
 
-            # Add new posts to the list
-            for post_element in post_elements:
-                href = post_element.get_attribute("href")
-                path = urlparse(href).path
-                id = path.split("/")[2]
+        yield User(first, self.account)
+        for username in usernames:
+            yield User(username, self.account)
 
-                post = Post(id)
-                posts.append(post)
+    def _scroll_follow_list(
+        self, kind: str, checkpoint: ListCheckpoint, timeout: float
+    ) -> Iterator:
+        if checkpoint.done:
+            return
 
-            # If no new posts loaded, break the loop
-            if len(post_elements) == 0:
-                break
+        # Using the driver elsewhere before iterating moves it away from the profile
+        navigate(self._driver, self.url)
+        self._open_follow_list(kind)
 
-        return posts[:limit]
+        try:
+            # Using the driver elsewhere between users closes the dialog, it's opened again
+            # (loading the profile first, if needed) and the users already seen are skipped
+            for username in iter_scroll_checkpointed(
+                self._driver,
+                FOLLOW_LIST_USERNAMES,
+                checkpoint=checkpoint,
+                timeout=timeout,
+                reopen=lambda: self._open_follow_list(kind),
+            ):
+                yield User(username, self.account)
+        finally:
+            # Close the dialog, also when the iteration is stopped early
+            try:
+                for close_btn in locate_all(self._driver, "dialog.close", timeout=0)[:1]:
+                    close_btn.click()
+            except WebDriverException:
+                pass
+
+    def _open_follow_list(self, kind: str):
+        # Open the dialog and wait for the list of users to load
+        locate(self._driver, f"user.{kind}").click()
+        locate(self._driver, "user.follow_list")
 
     def _open_user_dialog(self):
-        dialog_btn = self._driver.find_element(By.XPATH, '//div[text()="Following"]')
+        dialog_btn = locate(self._driver, "user.menu")
         dialog_btn.click()
 
     def _close_user_dialog(self):
-        close_btn = self._driver.find_element(
-            By.CSS_SELECTOR,
-            'svg[aria-label="Close"]',
-        )
-        close_btn.click()
+        # Some actions close the dialog by themselves, so the button isn't waited for
+        close_btns = locate_all(self._driver, "dialog.close", timeout=0)
+        for close_btn in close_btns[:1]:
+            close_btn.click()
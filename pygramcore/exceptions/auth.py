@@ -1,3 +1,8 @@
 class NotAuthenticated(Exception):
     def __init__(self):
         super().__init__("This is an authenticated action, please login beforehand.")
+
+
+class LoginFailed(Exception):
+    def __init__(self, reason: str):
+        super().__init__(f"Couldn't log in: {reason}")
@@ -0,0 +1,5 @@
+class PoolExhausted(Exception):
+    def __init__(self, size: int, timeout: float) -> None:
+        super().__init__(
+            f"All {size} drivers are in use and none was released within {timeout} seconds."
+        )
@@ -1,3 +1,27 @@
+from selenium.common.exceptions import NoSuchElementException
+
+
 class PageNotFound(Exception):
     def __init__(self, url: str):
         super().__init__(f'"{url}"" Not found')
+
+
+class ActionTimeout(Exception):
+    def __init__(self, action: str, timeout: float):
+        super().__init__(f'"{action}" did not complete within {timeout} seconds.')
+
+
+class ActionBlocked(Exception):
+    def __init__(self, action: str):
+        super().__init__(f'Instagram blocked "{action}", try again later.')
+
+
+class ListClosed(NoSuchElementException):
+    def __init__(self, selector: str):
+        super().__init__(f'The list of "{selector}" was closed before its end was reached.')
+
+
+class ElementNotFound(NoSuchElementException):
+    def __init__(self, name: str, selectors: list[str]):
+        tried = ", ".join(f'"{selector}"' for selector in selectors)
+        super().__init__(f'"{name}" not found, none of its selectors matched: {tried}.')
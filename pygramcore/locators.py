@@ -0,0 +1,469 @@
+from collections import deque
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+import statistics, threading, time
+
+from .constants import IMPLICIT_WAIT
+from .exceptions.navigation import ElementNotFound
+from .utils.waits import Condition, Probe, execute_wait_script, present
+
+# Polls every selector of a locator inside the browser, in the order given, and returns the
+# index of the first one that matches along with its elements, or [-1, []] on timeout.
+_LOCATE_SCRIPT = """
+const [selectors, timeout, done] = arguments;
+const started = Date.now();
+
+function find([kind, value]) {
+    if (kind === "xpath") {
+        const result = document.evaluate(
+            value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        );
+        return Array.from({ length: result.snapshotLength }, (_, i) => result.snapshotItem(i));
+    }
+    return Array.from(document.querySelectorAll(value));
+}
+
+(function poll() {
+    for (let index = 0; index < selectors.length; index++) {
+        const elements = find(selectors[index]);
+        if (elements.length > 0) {
+            done([index, elements]);
+            return;
+        }
+    }
+    if (Date.now() - started >= timeout) {
+        done([-1, []]);
+    } else {
+        setTimeout(poll, 25);
+    }
+})();
+"""
+
+
+class Selector:
+    """
+    One of the ways to find a locator's element, along with how it has fared.
+
+    Args:
+        by (str): Locator strategy, `By.CSS_SELECTOR`, `By.XPATH` or `By.TAG_NAME`.
+        value (str): The selector itself.
+        window (int): Amount of recent match times kept. Defaults to 100.
+    """
+
+    def __init__(self, by: str, value: str, window: int = 100):
+        self.by = by
+        self.value = value
+        self.condition = present(by, value)
+        self.hits = 0
+        self._latencies = deque(maxlen=window)
+
+    def get_median(self) -> float:
+        """
+        Returns the median seconds it took to match, infinity if it never has.
+        """
+        if not self._latencies:
+            return float("inf")
+
+        return statistics.median(self._latencies)
+
+
+class Locator:
+    """
+    Logical element of Instagram's UI (e.g. the "Unfollow" item of a user's menu) with the
+    selectors that can find it, in order of preference. Looking it up polls every selector at
+    once in the browser, trying first the one that has recently matched the most and fastest,
+    so a selector that stops matching after a change to Instagram's markup costs nothing as
+    long as a fallback still does.
+
+    With `learn`, how long a successful lookup takes is learned, so once the locator has matched
+    a few times, a lookup where none of its selectors match gives up after a fraction of
+    `IMPLICIT_WAIT`. It suits elements that are there once the page has rendered, not ones that
+    show up after Instagram has done some work (e.g. the "Share" button after an upload), as a
+    single slow response would fail the lookup.
+
+    Args:
+        name (str): Name of the locator, e.g. "user.unfollow".
+        selectors ((str, str)): (by, value) pairs, e.g. `(By.CSS_SELECTOR, "input[type='file']")`.
+        window (int): Amount of recent lookups the ordering is based on. Defaults to 50.
+        learn (bool): Whether lookups give up after the learned timeout. Defaults to False.
+    """
+
+    def __init__(
+        self, name: str, *selectors: tuple[str, str], window: int = 50, learn: bool = False
+    ):
+        if not selectors:
+            raise ValueError(f'Locator "{name}" needs at least one selector.')
+
+        self.name = name
+        self.learn = learn
+        self.selectors = [Selector(by, value) for by, value in selectors]
+        self.lookups = 0
+        self.failures = 0
+        self.probe = Probe(f"locator.{name}", margin=3, minimum=1, min_samples=10)
+
+        self._winners = deque(maxlen=window)  # index of the selector that matched, or -1
+        self._lock = threading.Lock()
+
+    def ordered(self) -> list[Selector]:
+        """
+        Returns the selectors in the order they are tried: by recent hit rate (in steps of
+        10%), then by median time to match, then in the order they were given.
+        """
+        with self._lock:
+            winners = list(self._winners)
+            medians = [selector.get_median() for selector in self.selectors]
+
+        def key(item: tuple[int, Selector]):
+            index, selector = item
+            rate = winners.count(index) / len(winners) if winners else 0.0
+            return (-round(rate, 1), medians[index], index)
+
+        return [selector for _, selector in sorted(enumerate(self.selectors), key=key)]
+
+    def present(self) -> Condition:
+        """
+        Returns a condition (see `wait_for_any`) that holds when any selector matches.
+        """
+        conditions = [selector.condition for selector in self.ordered()]
+        condition = conditions[0]
+        for other in conditions[1:]:
+            condition = condition | other
+
+        return condition
+
+    def find_all(
+        self, driver: webdriver.Chrome, timeout: float = IMPLICIT_WAIT, learn: bool = None
+    ) -> list[WebElement]:
+        """
+        Waits for any selector to match, in a single round trip and without touching the
+        driver's implicit wait.
+
+        Args:
+            driver (webdriver.Chrome): Driver showing the page.
+            timeout (float): Maximum seconds to wait. Defaults to `IMPLICIT_WAIT`.
+            learn (bool, optional): Whether the learned timeout replaces the timeout. Defaults to the locator's `learn`.
+
+        Returns:
+            list[WebElement]: Elements matching the selector that matched first, empty if none did in time.
+        """
+        if self.learn if learn is None else learn:
+            timeout = self.probe.get_timeout(timeout)
+
+        ordered = self.ordered()
+        started = time.perf_counter()
+        index, elements = execute_wait_script(
+            driver,
+            _LOCATE_SCRIPT,
+            timeout,
+            [selector.condition.serialize()[:2] for selector in ordered],
+        )
+        elapsed = time.perf_counter() - started
+
+        matched = index >= 0
+        with self._lock:
+            self.lookups += 1
+            if matched:
+                selector = ordered[index]
+                selector.hits += 1
+                selector._latencies.append(elapsed)
+                self._winners.append(self.selectors.index(selector))
+            else:
+                self.failures += 1
+                self._winners.append(-1)
+
+        self.probe.record(elapsed, matched)
+        return elements
+
+    def find(
+        self, driver: webdriver.Chrome, timeout: float = IMPLICIT_WAIT, learn: bool = None
+    ) -> WebElement:
+        """
+        Same as `find_all`, but returns the first element.
+
+        Raises:
+            ElementNotFound: Raises when none of the selectors matched in time.
+        """
+        elements = self.find_all(driver, timeout=timeout, learn=learn)
+        if not elements:
+            raise ElementNotFound(self.name, [selector.value for selector in self.selectors])
+
+        return elements[0]
+
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            dict: Lookups, failures, the current timeout and, for every selector in the order they are tried, its hits, hit rate and median and p95 time to match.
+        """
+        with self._lock:
+            lookups = self.lookups
+            stats = {
+                "lookups": lookups,
+                "failures": self.failures,
+                "timeout": self.probe.get_timeout(IMPLICIT_WAIT) if self.learn else IMPLICIT_WAIT,
+                "selectors": [],
+            }
+            latencies = {
+                id(selector): sorted(selector._latencies) for selector in self.selectors
+            }
+
+        percentile = lambda values, p: values[round(p * (len(values) - 1))] if values else None
+        for selector in self.ordered():
+            values = latencies[id(selector)]
+            stats["selectors"].append(
+                {
+                    "by": selector.by,
+                    "value": selector.value,
+                    "hits": selector.hits,
+                    "hit_rate": selector.hits / lookups if lookups else None,
+                    "p50": percentile(values, 0.5),
+                    "p95": percentile(values, 0.95),
+                }
+            )
+
+        return stats
+
+
+_locators: dict[str, Locator] = {}
+_locators_lock = threading.Lock()
+
+
+def register(name: str, *selectors: tuple[str, str], learn: bool = False) -> Locator:
+    """
+    Registers the selectors of a logical element, replacing the ones registered before under
+    the same name. Registering again lets selectors be fixed without waiting for a release.
+
+    Args:
+        name (str): Name of the locator, e.g. "user.unfollow".
+        selectors ((str, str)): (by, value) pairs in order of preference.
+        learn (bool): Whether lookups give up after the learned timeout, for elements that are there once the page has rendered. Defaults to False.
+
+    Returns:
+        Locator: The registered locator.
+
+    Usage:
+    ```python
+    register(
+        "user.unfollow",
+        (By.XPATH, "//div[@role='dialog']//div[normalize-space()='Unfollow']"),
+    )
+    ```
+    """
+    locator = Locator(name, *selectors, learn=learn)
+    with _locators_lock:
+        _locators[name] = locator
+
+    return locator
+
+
+def get_locator(name: str) -> Locator:
+    """
+    Returns the locator registered under the given name.
+
+    Raises:
+        KeyError: Raises when no locator has that name.
+    """
+    with _locators_lock:
+        return _locators[name]
+
+
+def locate(
+    driver: webdriver.Chrome, name: str, timeout: float = IMPLICIT_WAIT
+) -> WebElement:
+    """
+    Finds the element of a registered locator. See `Locator.find`.
+
+    Raises:
+        ElementNotFound: Raises when none of the selectors matched in time.
+    """
+    return get_locator(name).find(driver, timeout=timeout)
+
+
+def locate_all(
+    driver: webdriver.Chrome, name: str, timeout: float = IMPLICIT_WAIT
+) -> list[WebElement]:
+    """
+    Finds the elements of a registered locator, empty if none show up. See `Locator.find_all`.
+    """
+    return get_locator(name).find_all(driver, timeout=timeout)
+
+
+def get_locator_stats() -> dict[str, dict]:
+    """
+    Returns:
+        dict[str, dict]: Stats of every locator by name (see `Locator.get_stats`), ready to be dumped as JSON.
+    """
+    with _locators_lock:
+        locators = list(_locators.values())
+
+    return {locator.name: locator.get_stats() for locator in locators}
+
+
+# The elements the package interacts with. Selectors tied to Instagram's generated class names
+# come first, as they are the most precise, followed by ones based on text and ARIA attributes
+# that survive changes to the class names. Only elements that are there once the page
+# has rendered learn how long to wait for.
+
+# Login page
+register(
+    "login.username",
+    (By.CSS_SELECTOR, "#loginForm > div > div:nth-child(1) > div > label > input"),
+    (By.CSS_SELECTOR, "input[name='username']"),
+    learn=True,
+)
+register(
+    "login.password",
+    (By.CSS_SELECTOR, "#loginForm > div > div:nth-child(2) > div > label > input"),
+    (By.CSS_SELECTOR, "input[name='password']"),
+    learn=True,
+)
+register("login.error", (By.CSS_SELECTOR, "#slfErrorAlert"))
+
+# Dialogs
+register("dialog.close", (By.CSS_SELECTOR, 'svg[aria-label="Close"]'))
+register(
+    "dialog.not_now",
+    (By.XPATH, '//button[text()="Not Now"]'),
+    (By.XPATH, "//div[@role='dialog']//button[normalize-space()='Not now']"),
+)
+
+# "Create new post" dialog
+register(
+    "create.open",
+    (By.CSS_SELECTOR, "svg[aria-label='New post']"),
+    (By.CSS_SELECTOR, "svg[aria-label='Create']"),
+    learn=True,
+)
+register("create.file_input", (By.CSS_SELECTOR, "input[type='file']"))
+register("create.step", (By.CSS_SELECTOR, "div[role='dialog'] h1"))
+register(
+    "create.next",
+    (
+        By.CSS_SELECTOR,
+        "body > div.x1n2onr6.xzkaem6 > div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj > div > div > div > div > div > div > div > div._ap97 > div > div > div > div._ac7b._ac7d > div",
+    ),
+    (By.XPATH, "//div[@role='dialog']//div[@role='button'][normalize-space()='Next']"),
+)
+register(
+    "create.caption",
+    (By.CSS_SELECTOR, "div[aria-label='Write a caption...']"),
+    (By.CSS_SELECTOR, "div[aria-label='Write a caption…']"),
+)
+register(
+    "create.share",
+    (
+        By.CSS_SELECTOR,
+        "body > div.x1n2onr6.xzkaem6 > div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj > div > div > div > div > div > div > div > div._ap97 > div > div > div > div._ac7b._ac7d > div",
+    ),
+    (By.XPATH, "//div[@role='dialog']//div[@role='button'][normalize-space()='Share']"),
+)
+
+# User profile
+register(
+    "user.follow",
+    (By.XPATH, '//button[@class=" _acan _acap _acas _aj1- _ap30"]'),
+    (By.XPATH, "//header//button[normalize-space()='Follow']"),
+    learn=True,
+)
+# Its classes tell whether the user is followed, so it has no fallback without them
+register("user.follow_state", (By.CSS_SELECTOR, "button._acan._acap._aj1-._ap30"), learn=True)
+register(
+    "user.menu",
+    (By.XPATH, '//div[text()="Following"]'),
+    (By.XPATH, "//header//button[normalize-space()='Following']"),
+    learn=True,
+)
+register(
+    "user.unfollow",
+    (
+        By.CSS_SELECTOR,
+        "body > div.x1n2onr6.xzkaem6 > div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj > div > div > div > div > div.x7r02ix.xf1ldfh.x131esax.xdajt7p.xxfnqb6.xb88tzc.xw2csxc.x1odjw0f.x5fp0pe > div > div > div > div:nth-child(8)",
+    ),
+    (By.XPATH, "//div[@role='dialog']//div[normalize-space()='Unfollow']"),
+)
+register(
+    "user.followers",
+    (By.CSS_SELECTOR, "header a[href$='/followers/']"),
+    (By.XPATH, "//header//a[contains(normalize-space(), 'followers')]"),
+    learn=True,
+)
+register(
+    "user.following",
+    (By.CSS_SELECTOR, "header a[href$='/following/']"),
+    (By.XPATH, "//header//a[contains(normalize-space(), 'following')]"),
+    learn=True,
+)
+register("user.close_friend", (By.CSS_SELECTOR, 'svg[aria-label="Close friend"]'))
+register(
+    "user.mute",
+    (
+        By.CSS_SELECTOR,
+        "body > div.x1n2onr6.xzkaem6 > div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj > div > div > div > div > div.x7r02ix.xf1ldfh.x131esax.xdajt7p.xxfnqb6.xb88tzc.xw2csxc.x1odjw0f.x5fp0pe > div > div > div > div:nth-child(6)",
+    ),
+    (By.XPATH, "//div[@role='dialog']//div[normalize-space()='Mute']"),
+)
+register("user.mute_options", (By.XPATH, '//input[@dir="ltr"]'))
+register(
+    "user.mute_save",
+    (
+        By.CSS_SELECTOR,
+        "body > div.x1n2onr6.xzkaem6 > div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj > div > div > div > div > div.x7r02ix.xf1ldfh.x131esax.xdajt7p.xxfnqb6.xb88tzc.xw2csxc.x1odjw0f.x5fp0pe > div > div > div > div.x9f619.xjbqb8w.x78zum5.x168nmei.x13lgxp2.x5pf9jr.xo71vjh.x1uhb9sk.x1plvlek.xryxfnj.x1c4vz4f.x2lah0s.xdt5ytf.xqjyukv.x1qjc9v5.x1oa3qoh.x1nhvcw1 > div.x9f619.xjbqb8w.x78zum5.x168nmei.x13lgxp2.x5pf9jr.xo71vjh.x1y1aw1k.x1sxyh0.xwib8y2.xurb0ha.x1uhb9sk.x1plvlek.xryxfnj.x1c4vz4f.x2lah0s.xdt5ytf.xqjyukv.x1qjc9v5.x1oa3qoh.x1nhvcw1 > div",
+    ),
+    (By.XPATH, "//div[@role='dialog']//div[@role='button'][normalize-space()='Save']"),
+)
+register(
+    "user.message",
+    (By.XPATH, '//div[text()="Message"]'),
+    (By.XPATH, "//div[@role='button'][normalize-space()='Message']"),
+    learn=True,
+)
+register(
+    "user.message_input",
+    (By.XPATH, '//div[@aria-describedby="Message"]'),
+    (By.CSS_SELECTOR, "div[role='textbox'][aria-label='Message']"),
+)
+
+# Post
+register(
+    "post.like",
+    (By.CSS_SELECTOR, "div.x78zum5 > span.xp7jhwk > div"),
+    (
+        By.XPATH,
+        "//section//*[name()='svg'][@aria-label='Like' or @aria-label='Unlike']/ancestor::div[@role='button'][1]",
+    ),
+    learn=True,
+)
+register(
+    "post.likes",
+    (
+        By.XPATH,
+        '//section[@class="x12nagc"]//span[@class="html-span xdj266r x11i5rnm xat24cr x1mh8g0r xexx8yu x4uap5 x18d9i69 xkhd6sd x1hl2dhg x16tdsg8 x1vvkbs"]',
+    ),
+    (By.CSS_SELECTOR, "section a[href*='/liked_by/'] span"),
+    learn=True,
+)
+register(
+    "post.next_image",
+    (By.XPATH, '//button[@aria-label="Next"][@class=" _afxw _al46 _al47"]'),
+    (By.CSS_SELECTOR, "article button[aria-label='Next']"),
+)
+register(
+    "post.comment_input",
+    (By.CSS_SELECTOR, "form textarea"),
+    (By.CSS_SELECTOR, "textarea[aria-label^='Add a comment']"),
+    learn=True,
+)
+register(
+    "post.author",
+    (
+        By.XPATH,
+        '//div[@class="xyinxu5 x1pi30zi x1g2khh7 x1swvt13"]//span[@class="_ap3a _aaco _aacw _aacx _aad7 _aade"]',
+    ),
+    learn=True,
+)
+register(
+    "post.date_posted",
+    (By.CSS_SELECTOR, "time.x1p4m5qa"),
+    (By.CSS_SELECTOR, "article time[datetime]"),
+    learn=True,
+)
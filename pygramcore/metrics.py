@@ -0,0 +1,283 @@
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from selenium import webdriver
+from selenium.webdriver.remote.command import Command
+from typing import Callable, Iterator
+import inspect, json, threading, time
+
+# Commands that wait up to the implicit wait for an element to show up
+_FIND_COMMANDS = {
+    Command.FIND_ELEMENT,
+    Command.FIND_ELEMENTS,
+    Command.FIND_CHILD_ELEMENT,
+    Command.FIND_CHILD_ELEMENTS,
+}
+_NAVIGATION_COMMANDS = {Command.GET, Command.REFRESH, Command.GO_BACK, Command.GO_FORWARD}
+
+_local = threading.local()
+
+
+class _Frame:
+    # What a single call (the outermost one on its thread) has done so far
+    def __init__(self, method: str, recorded_time: float = 0.0):
+        self.method = method
+        self.recorded_time = recorded_time  # wall time of the call recorded before, for generators
+        self.wall_time = 0.0
+        self.commands = Counter()
+        self.nested = Counter()  # public methods called within the call
+        self.implicit_wait = 0.0
+        self.navigations = 0
+        self.error: str = None
+
+    @contextmanager
+    def active(self) -> Iterator[None]:
+        previous = getattr(_local, "frame", None)
+        _local.frame = self
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.wall_time += time.perf_counter() - started
+            _local.frame = previous
+
+
+class MethodStats:
+    """
+    What the calls to a method have done, added up.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = Counter()  # by exception type
+        self.wall_time = 0.0
+        self.max_time = 0.0
+        self.commands = Counter()  # by WebDriver command
+        self.nested = Counter()
+        self.implicit_wait = 0.0
+        self.navigations = 0
+
+    def add(self, frame: _Frame, call: bool = True) -> None:
+        if call:
+            self.calls += 1
+        if frame.error is not None:
+            self.errors[frame.error] += 1
+        self.wall_time += frame.wall_time
+        self.max_time = max(self.max_time, frame.recorded_time + frame.wall_time)
+        self.commands.update(frame.commands)
+        self.nested.update(frame.nested)
+        self.implicit_wait += frame.implicit_wait
+        self.navigations += frame.navigations
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": dict(self.errors),
+            "wall_time": self.wall_time,
+            "mean_time": self.wall_time / self.calls if self.calls else None,
+            "max_time": self.max_time,
+            "commands": sum(self.commands.values()),
+            "commands_by_type": dict(self.commands),
+            "nested_calls": dict(self.nested),
+            "implicit_wait": self.implicit_wait,
+            "navigations": self.navigations,
+        }
+
+
+class Metrics:
+    """
+    Records what every call to a public method of `Account`, `User` and `Post` does: its wall
+    time, the WebDriver commands it sends (by type), the seconds they spend in implicit waits,
+    the navigations and the exceptions raised. Methods called within another method (e.g.
+    `is_following` within `unfollow`, through `check_following`) are attributed to the outer call.
+
+    Usage:
+    ```python
+    metrics = Metrics()
+    set_metrics(metrics)
+
+    User("username").unfollow()
+
+    print(metrics.get_stats()["User.unfollow"]["commands_by_type"])
+    open("metrics.txt", "w").write(metrics.to_openmetrics())
+    ```
+    """
+
+    def __init__(self):
+        self._methods: dict[str, MethodStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, frame: _Frame, call: bool = True) -> None:
+        with self._lock:
+            self._methods.setdefault(frame.method, MethodStats()).add(frame, call)
+
+    def get_stats(self) -> dict[str, dict]:
+        """
+        Returns:
+            dict[str, dict]: For every method (e.g. "User.follow"): calls, errors by exception type, total, mean and max wall time, commands (total and by type), public methods called within it, seconds spent in implicit waits and navigations.
+        """
+        with self._lock:
+            return {method: stats.to_dict() for method, stats in self._methods.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._methods.clear()
+
+    def to_json(self, indent: int = None) -> str:
+        """
+        Returns:
+            str: The stats (see `get_stats`) as JSON.
+        """
+        return json.dumps(self.get_stats(), indent=indent, sort_keys=True)
+
+    def to_openmetrics(self, prefix: str = "pygramcore") -> str:
+        """
+        Returns:
+            str: The stats in the OpenMetrics text format, for Prometheus and the sort.
+        """
+        stats = self.get_stats()
+        families = [
+            ("method_calls", "counter", "Calls to the method.", []),
+            ("method_errors", "counter", "Calls that raised, by exception.", []),
+            ("method_seconds", "counter", "Wall time of the calls.", []),
+            ("webdriver_commands", "counter", "WebDriver commands sent, by command.", []),
+            ("implicit_wait_seconds", "counter", "Time spent in element lookups.", []),
+            ("navigations", "counter", "Pages loaded.", []),
+        ]
+        samples = {family[0]: family[3] for family in families}
+
+        for method, method_stats in sorted(stats.items()):
+            labels = {"method": method}
+            samples["method_calls"].append((labels, method_stats["calls"]))
+            samples["method_seconds"].append((labels, method_stats["wall_time"]))
+            samples["implicit_wait_seconds"].append((labels, method_stats["implicit_wait"]))
+            samples["navigations"].append((labels, method_stats["navigations"]))
+            for error, count in sorted(method_stats["errors"].items()):
+                samples["method_errors"].append(({**labels, "exception": error}, count))
+            for command, count in sorted(method_stats["commands_by_type"].items()):
+                samples["webdriver_commands"].append(({**labels, "command": command}, count))
+
+        lines = []
+        for name, kind, description, family_samples in families:
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            for labels, value in family_samples:
+                label_text = ",".join(
+                    f'{key}="{_escape_label(label)}"' for key, label in labels.items()
+                )
+                lines.append(f"{prefix}_{name}_total{{{label_text}}} {value}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_metrics: Metrics | None = None
+
+
+def set_metrics(metrics: Metrics | None) -> None:
+    """
+    Sets where method calls are recorded. Nothing is recorded until metrics are set.
+    """
+    global _metrics
+    _metrics = metrics
+
+
+def get_metrics() -> Metrics | None:
+    """
+    Returns the metrics set with `set_metrics`, None if calls aren't recorded.
+    """
+    return _metrics
+
+
+def record_calls(func: Callable, method: str) -> Callable:
+    """
+    Decorator that records the calls to a public method in the metrics, when they are set.
+    Calls made within another recorded call on the same thread count towards the outer call.
+    Generators are recorded as a call when they are returned, and what producing their items
+    does is added as they are iterated, until they are exhausted or closed.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        outer = getattr(_local, "frame", None)
+        if outer is not None:
+            outer.nested[method] += 1
+            return func(*args, **kwargs)
+
+        metrics = _metrics
+        if metrics is None:
+            return func(*args, **kwargs)
+
+        frame = _Frame(method)
+        try:
+            with frame.active():
+                value = func(*args, **kwargs)
+        except BaseException as error:
+            frame.error = type(error).__name__
+            metrics.record(frame)
+            raise
+
+        metrics.record(frame)
+        if inspect.isgenerator(value):
+            return _record_generator(metrics, _Frame(method, frame.wall_time), value)
+
+        return value
+
+    return wrapper
+
+
+def _record_generator(metrics: Metrics, frame: _Frame, generator: Iterator) -> Iterator:
+    # Only the time spent producing items counts, not the time the caller spends on them
+    try:
+        while True:
+            with frame.active():
+                try:
+                    item = next(generator)
+                except StopIteration as stop:
+                    return stop.value
+            yield item
+    except GeneratorExit:
+        with frame.active():
+            generator.close()
+        raise
+    except BaseException as error:
+        frame.error = type(error).__name__
+        raise
+    finally:
+        metrics.record(frame, call=False)
+
+
+def instrument_driver(driver: webdriver.Chrome) -> None:
+    """
+    Attributes the commands a driver sends to the method call running on the thread, if any.
+    """
+    execute = driver.execute
+    implicit_wait = 0.0
+
+    def instrumented(driver_command: str, params: dict = None):
+        nonlocal implicit_wait
+        if driver_command == Command.SET_TIMEOUTS and params and "implicit" in params:
+            implicit_wait = params["implicit"] / 1000
+
+        frame = getattr(_local, "frame", None)
+        if frame is None:
+            return execute(driver_command, params)
+
+        frame.commands[driver_command] += 1
+        if driver_command in _NAVIGATION_COMMANDS:
+            frame.navigations += 1
+
+        if driver_command not in _FIND_COMMANDS or not implicit_wait:
+            return execute(driver_command, params)
+
+        started = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            frame.implicit_wait += time.perf_counter() - started
+
+    driver.execute = instrumented
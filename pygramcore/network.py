@@ -0,0 +1,243 @@
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable
+import json, threading, time, weakref
+
+from .constants import *
+
+# Requests whose JSON responses hold the data shown on profiles and posts
+CAPTURED_URLS = ("/api/v1/", "/graphql/query", "/api/graphql")
+
+
+class NetworkCapture:
+    """
+    Collects the JSON responses Instagram's pages fetch, reading them from the browser's
+    performance log. Responses are kept until the browser loads another document.
+
+    Args:
+        driver (webdriver.Chrome): Driver started with `DriverConfig(capture_network=True)`.
+        max_responses (int): Responses kept per page. Defaults to 100.
+    """
+
+    def __init__(self, driver: webdriver.Chrome, max_responses: int = 100):
+        self.driver = driver
+        self.max_responses = max_responses
+        self.responses: list[tuple[str, Any]] = []  # (url, payload) of the current page
+        self._pending: dict[str, str] = {}  # request ID -> url, until the body has loaded
+        self._document_at = time.time()  # when the current document started loading
+        self._lock = threading.Lock()
+
+    def poll(self) -> list[tuple[str, Any]]:
+        """
+        Reads the new entries of the performance log.
+
+        Returns:
+            list[tuple[str, Any]]: URL and parsed payload of every response of the current page.
+        """
+        with self._lock:
+            entries = self.driver.get_log("performance")
+            for event in parse_log_entries(entries):
+                self._handle(event)
+
+            return list(self.responses)
+
+    def _handle(self, event: dict) -> None:
+        method, params = event["method"], event["params"]
+
+        if method == "Network.requestWillBeSent" and params.get("type") == "Document":
+            # A new document, responses of the previous one no longer apply
+            self.responses.clear()
+            self._pending.clear()
+            self._document_at = event["timestamp"] or time.time()
+
+        elif method == "Network.responseReceived":
+            response = params["response"]
+            if is_captured(response["url"], response.get("mimeType", "")):
+                self._pending[params["requestId"]] = response["url"]
+
+        elif method == "Network.loadingFinished":
+            url = self._pending.pop(params["requestId"], None)
+            if url is None:
+                return
+
+            try:
+                body = self.driver.execute_cdp_cmd(
+                    "Network.getResponseBody", {"requestId": params["requestId"]}
+                )
+                payload = parse_body(body["body"])
+            except (WebDriverException, ValueError):
+                return  # evicted from the browser's buffer, or not JSON after all
+
+            self.responses.append((url, payload))
+            del self.responses[: -self.max_responses]
+
+        elif method == "Network.loadingFailed":
+            self._pending.pop(params["requestId"], None)
+
+    def clear(self) -> None:
+        """
+        Forgets the responses of the current page, e.g. after an action changed what they say.
+        """
+        with self._lock:
+            self.responses.clear()
+
+    def find(self, lookup: Callable[[Any], Any], timeout: float = NETWORK_WAIT) -> Any:
+        """
+        Looks for something in the responses of the current page. Until `timeout` seconds
+        after the page started loading, it waits for more responses if it isn't found.
+
+        Args:
+            lookup (Callable): Returns what is looked for in a payload, None if it isn't there.
+            timeout (float): Seconds after the page started loading to wait for. Defaults to `NETWORK_WAIT`.
+
+        Returns:
+            Any: What was found, or None.
+        """
+        seen = 0
+        while True:
+            responses = self.poll()
+            for _, payload in responses[seen:]:
+                found = lookup(payload)
+                if found is not None:
+                    return found
+
+            seen = len(responses)
+            if time.time() >= self._document_at + timeout:
+                return None
+
+            time.sleep(0.1)
+
+
+_captures = weakref.WeakKeyDictionary()
+
+
+def attach_capture(driver: webdriver.Chrome) -> NetworkCapture:
+    """
+    Starts capturing the responses of a driver with performance logging enabled.
+    """
+    capture = NetworkCapture(driver)
+    _captures[driver] = capture
+    return capture
+
+
+def get_capture(driver: webdriver.Chrome) -> NetworkCapture | None:
+    """
+    Returns the capture of a driver, None if the driver doesn't capture responses.
+    """
+    return _captures.get(driver)
+
+
+def is_captured(url: str, mime_type: str) -> bool:
+    return "json" in mime_type and any(path in url for path in CAPTURED_URLS)
+
+
+def parse_log_entries(entries: Iterable[dict]) -> list[dict]:
+    """
+    Returns:
+        list[dict]: The DevTools events ({"method", "params", "timestamp"}) of performance log entries, with the timestamp in seconds.
+    """
+    events = []
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        if message.get("method", "").startswith("Network."):
+            timestamp = entry.get("timestamp")
+            events.append(
+                {
+                    "method": message["method"],
+                    "params": message.get("params", {}),
+                    "timestamp": timestamp / 1000 if timestamp else None,
+                }
+            )
+
+    return events
+
+
+def parse_body(body: str) -> Any:
+    """
+    Parses a JSON response. Some endpoints prefix their JSON with "for (;;);".
+    """
+    body = body.strip()
+    if body.startswith("for (;;);"):
+        body = body[len("for (;;);") :]
+
+    return json.loads(body)
+
+
+def _walk(payload: Any) -> Iterable[dict]:
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def find_user(payload: Any, username: str) -> dict | None:
+    """
+    Finds a user's profile in a payload (e.g. from `web_profile_info`).
+
+    Returns:
+        dict | None: Total posts, followers and following, is_private, is_following, full_name and bio.
+    """
+    for node in _walk(payload):
+        if node.get("username") != username:
+            continue
+
+        if "edge_followed_by" in node:
+            return {
+                "total_posts": node["edge_owner_to_timeline_media"]["count"],
+                "followers": node["edge_followed_by"]["count"],
+                "following": node["edge_follow"]["count"],
+                "is_private": node.get("is_private", False),
+                "is_following": node.get("followed_by_viewer"),
+                "full_name": node.get("full_name") or None,
+                "bio": node.get("biography") or None,
+            }
+
+        if "follower_count" in node:
+            return {
+                "total_posts": node.get("media_count", 0),
+                "followers": node["follower_count"],
+                "following": node.get("following_count", 0),
+                "is_private": node.get("is_private", False),
+                "is_following": (node.get("friendship_status") or {}).get("following"),
+                "full_name": node.get("full_name") or None,
+                "bio": node.get("biography") or None,
+            }
+
+    return None
+
+
+def find_post(payload: Any, shortcode: str) -> dict | None:
+    """
+    Finds a post's metadata in a payload (e.g. from `media/shortcode/web_info`).
+
+    Returns:
+        dict | None: Likes, author, date posted and is_liked.
+    """
+    for node in _walk(payload):
+        if node.get("code") == shortcode and "like_count" in node:
+            return {
+                "likes": node["like_count"],
+                "author": (node.get("user") or node.get("owner") or {}).get("username"),
+                "date_posted": _utc(node["taken_at"]),
+                "is_liked": node.get("has_liked"),
+            }
+
+        if node.get("shortcode") == shortcode and "edge_media_preview_like" in node:
+            return {
+                "likes": node["edge_media_preview_like"]["count"],
+                "author": (node.get("owner") or {}).get("username"),
+                "date_posted": _utc(node["taken_at_timestamp"]),
+                "is_liked": node.get("viewer_has_liked"),
+            }
+
+    return None
+
+
+def _utc(timestamp: int) -> datetime:
+    # Naive UTC, like the dates read from the page
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
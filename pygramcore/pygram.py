@@ -1,51 +1,184 @@
 from selenium import webdriver
-from selenium_stealth import stealth
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-import pickle, os, time, random
+from contextlib import contextmanager
+from functools import partial, wraps
+import pickle, os, threading, time, weakref
 
+from .cache import cached, invalidate
 from .constants import *
+from .metrics import record_calls
+from .network import get_capture
+from .driver import *
+from .locators import get_locator, locate
+from .sessions import *
 from .exceptions.auth import *
 from .exceptions.format import *
 from .exceptions.navigation import *
 from .utils.navigation import *
+from .utils.waits import *
+
+
+class hybridmethod:
+    """
+    Method of the `Account` class that can be called both on an account and on the class
+    itself, in which case it runs on the default account (e.g. `Account.login`).
+    """
+
+    def __init__(self, func):
+        self.__func__ = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            instance = owner.default()
+
+        return self.__func__.__get__(instance, owner)
+
+
+def get_account(obj) -> "Account":
+    """
+    Returns the account an object browses as: the account itself, the account a `User` or
+    `Post` was bound to, or the default account.
+    """
+    if isinstance(obj, Account):
+        return obj
+
+    return getattr(obj, "account", None) or Account.default()
 
 
 def check_authorization(func):
     """
-    Decorator that checks if the current account is logged in.
+    Decorator that checks if the account of the object is logged in.
 
     Raises:
-        NotAuthenticated: Raises when the current account is not logged in.
+        NotAuthenticated: Raises when the account is not logged in.
     """
 
-    def wrapper(*args, **kwargs):
-        logged_in = Account.is_logged_in()
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        logged_in = get_account(self).is_logged_in()
         if not logged_in:
             raise NotAuthenticated()
 
-        value = func(*args, **kwargs)
+        value = func(self, *args, **kwargs)
         return value
 
     return wrapper
 
 
-def init_driver() -> webdriver.Chrome:
-    options = webdriver.ChromeOptions()
+_predicate_scope = threading.local()
 
-    driver = webdriver.Chrome(options=options)
-    stealth(
-        driver,
-        languages=["en-US", "en"],
-        vendor="Google Inc.",
-        platform="Win32",
-        webgl_vendor="Intel Inc.",
-        renderer="Intel Iris OpenGL Engine",
-        fix_hairline=True,
-    )
-    driver.implicitly_wait(IMPLICIT_WAIT)
 
-    return driver
+@contextmanager
+def remember_predicates():
+    """
+    Predicates (e.g. `User.is_following`) are always remembered until the page is loaded
+    again. Within the scope, they are also remembered across page loads: they are only
+    checked once per object in the current thread, until an action that changes them runs.
+
+    Usage:
+    ```python
+    with remember_predicates():
+        user.unfollow()  # checks is_private and is_following
+        user.mute("posts")  # checks is_following again after the unfollow
+    ```
+    """
+    previous = getattr(_predicate_scope, "memo", None)
+    if previous is None:
+        _predicate_scope.memo = {}
+
+    try:
+        yield
+    finally:
+        if previous is None:
+            _predicate_scope.memo = None
+
+
+def _predicate_key(obj, name: str) -> tuple:
+    return (get_account(obj), obj.url, name)
+
+
+def predicate(func):
+    """
+    Decorator for checks that don't change the page, whose result is remembered until the
+    page is loaded again or an action that changes it runs, and within a
+    `remember_predicates` scope.
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if args or kwargs:
+            return func(self, *args, **kwargs)
+
+        key = _predicate_key(self, func.__name__)
+        memo = getattr(_predicate_scope, "memo", None)
+        if memo is not None and key in memo:
+            return memo[key]
+
+        # Checks made on the page already loaded, e.g. by the decorators of an action
+        page_memo = get_page_memo(self._driver)
+        if page_memo is not None and key in page_memo:
+            value = page_memo[key]
+        else:
+            value = func(self)
+            if page_memo is not None:
+                page_memo[key] = value
+
+        if memo is not None:
+            memo[key] = value
+
+        return value
+
+    return wrapper
+
+
+def changes(*predicates: str):
+    """
+    Decorator for actions that change the result of the given predicates or getters, so they
+    are checked again after the action, and dropped from the cache.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                value = func(self, *args, **kwargs)
+            finally:
+                memos = [
+                    getattr(_predicate_scope, "memo", None),
+                    get_page_memo(self._driver),
+                ]
+                for memo in filter(None, memos):
+                    for name in predicates:
+                        memo.pop(_predicate_key(self, name), None)
+
+                invalidate(self, *predicates)
+
+            # What the page fetched when it loaded is out of date now
+            capture = get_capture(self._driver)
+            if capture is not None:
+                capture.clear()
+
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+class _NavigationScope(threading.local):
+    # Pages of the Navigator calls running on the current thread, and the page last navigated to
+    def __init__(self):
+        self.pages: list[tuple] = []
+        self.current: tuple = None
+
+
+_navigation_scope = _NavigationScope()
+
+
+def _page_key(obj) -> tuple | None:
+    return (get_account(obj), obj.url) if hasattr(obj, "url") else None
 
 
 class Navigator(type):
@@ -54,10 +187,25 @@ class Navigator(type):
         Wraps all relevant functions with necessary wrapper functions.
         """
         fn_black_list = [
+            "default",
+            "close",
+            "get_user",
+            "get_post",
             "get_instance",
+            "get_pool",
+            "configure_pool",
+            "release_instance",
+            "_apply_cookies",
+            "_session_name",
             "_initialize_website",
             "is_logged_in",
+            "verify_session",
             "save_cookies",
+            # Cookies are set before navigating, so the first page load is already authenticated
+            "set_cookies",
+            "load_cookies",
+            "load_session",
+            "save_session",
         ]
 
         _initialize_website = dct.get(
@@ -65,143 +213,366 @@ class Navigator(type):
         )
 
         for key, value in dct.items():
-            if not key.startswith("__") and key not in fn_black_list:
+            if key.startswith("__"):
+                continue
+
+            # Calls to public methods are recorded in the metrics, when they are set
+            record = partial(cls.record_method, f"{name}.{key}", key.startswith("_"))
+
+            # Methods that don't navigate are still recorded
+            if key in fn_black_list:
+                if isinstance(value, (classmethod, hybridmethod)):
+                    dct[key] = type(value)(record(value.__func__))
+                elif callable(value) and not isinstance(value, staticmethod):
+                    dct[key] = record(value)
+            else:
+                # Cached getters look the cache up before navigating
+                if hasattr(value, "uncached"):
+                    wrapped_method = cached(
+                        cls.wrap_method(value.uncached, _initialize_website),
+                        value.cache_field,
+                    )
+                    dct[key] = record(wrapped_method)
                 # Support for class methods that aren't the get_instance function.
                 # This is done to prevent a recursion error, because the get_instance
                 # function is the function used in _initialize_website (causing the error)
-                if isinstance(value, classmethod):
-                    wrapped_method = classmethod(
-                        cls.wrap_method(value.__func__, _initialize_website)
+                elif isinstance(value, (classmethod, hybridmethod)):
+                    wrapped_method = type(value)(
+                        record(cls.wrap_method(value.__func__, _initialize_website))
                     )
                     dct[key] = wrapped_method
                 else:
                     if callable(value):
                         wrapped_method = cls.wrap_method(value, _initialize_website)
-                        dct[key] = wrapped_method
+                        dct[key] = record(wrapped_method)
+
+        # Objects can be shared between threads, so the driver is looked up on every
+        # access instead of being stored: each thread gets the driver of the object's
+        # account pinned to it.
+        dct.setdefault("_driver", property(lambda self: get_account(self).get_instance()))
         return super().__new__(cls, name, bases, dct)
 
+    @property
+    def _driver(cls) -> webdriver.Chrome:
+        """
+        The current thread's driver of the default account.
+        """
+        return Account.default().get_instance()
+
     @staticmethod
     def wrap_method(method, before_all_method):
+        @wraps(method)
         def wrapped(self, *args, **kwargs):
-            before_all_method(self)
-            return method(self, *args, **kwargs)
+            # Calls made within a call on the same page (e.g. the checks of `check_following`)
+            # find the page already loaded, so they neither navigate nor check it again
+            page = _page_key(self)
+            pages = _navigation_scope.pages
+            if page is None or page not in pages or _navigation_scope.current != page:
+                before_all_method(self)
+                _navigation_scope.current = page
+
+            pages.append(page)
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                pages.pop()
+                if not pages:
+                    _navigation_scope.current = None
 
         return wrapped
 
+    @staticmethod
+    def record_method(name: str, private: bool, method):
+        return method if private else record_calls(method, name)
+
     @staticmethod
     def _default_initialize_website(self):
         """
-        Provides the current instance of the driver to the object and navigates to the URL of it's object if there is any.
+        Navigates the current thread's driver to the URL of the object if there is any.
         """
-        if not hasattr(self, "_driver"):
-            self._driver = Account.get_instance()
-
         if hasattr(self, "url"):
-            navigate(self._driver, self.url)
-
-            # Check if the URL has been found.
-            self._driver.implicitly_wait(1)
-            found_not_found_text = bool(
-                self._driver.find_elements(
-                    By.XPATH, '//span[text()="Sorry, this page isn\'t available."]'
-                )
-            )
-            self._driver.implicitly_wait(IMPLICIT_WAIT)
+            driver = self._driver
+            page = navigate(driver, self.url)
 
-            # Check if the text has not been found. If so, it should raise the
-            # PageNotFound exception.
-            if found_not_found_text:
-                raise PageNotFound(self._driver.current_url)
+            # Only check whether the page exists once per page load. Nested or repeated
+            # calls on an already checked page skip the check.
+            if not is_page_validated(driver, page):
+                Navigator._check_page_found(driver, getattr(self, "_ready_selector", None))
+                set_page_validated(driver, page)
 
-    @classmethod
-    def _check_page_found(self):
+    @staticmethod
+    def _check_page_found(driver: webdriver.Chrome, ready_selector: str = None):
         """
         Check if the current page has been found.
 
+        Args:
+            driver (webdriver.Chrome): Driver showing the page.
+            ready_selector (str, optional): CSS selector of content only found pages have. Waiting for either the content or the "not found" text lets the check end as soon as the page renders.
+
         Raises:
             PageNotFound: Raises when page wasn't found.
         """
-        driver = Account.get_instance()
-
-        driver.implicitly_wait(2)
-
-        print("checking shit")
-        found_not_found_text = bool(
-            driver.find_elements(
-                By.XPATH, '//span[text()="Sorry, this page isn\'t available."]'
-            )
+        conditions = [
+            present(By.XPATH, '//span[text()="Sorry, this page isn\'t available."]')
+        ]
+        if ready_selector:
+            conditions.append(present(By.CSS_SELECTOR, ready_selector))
+
+        # Unless the driver waits for the whole page to load, the content may take a while
+        # to show up, so the page is waited on until it does.
+        timeout = 1
+        if ready_selector and driver.caps.get("pageLoadStrategy", "normal") != "normal":
+            timeout = IMPLICIT_WAIT
+
+        # Without content to wait for, the check only ends early on missing pages
+        result = wait_for_any(
+            driver, *conditions, timeout=timeout, probe="page.found", learn=bool(ready_selector)
         )
 
-        driver.implicitly_wait(IMPLICIT_WAIT)
-
-        # Check if the text has not been found. If so, it should raise the
+        # Check if the text has been found. If so, it should raise the
         # PageNotFound exception.
-        if not found_not_found_text:
+        if result.index == 0:
             raise PageNotFound(driver.current_url)
 
 
 class Account(metaclass=Navigator):
-    _driver: webdriver.Chrome
-    _logged_in: bool = False
+    """
+    An Instagram account, with its own browsers and session. Many accounts can run at once in
+    the same process. Calling a method on the class itself (e.g. `Account.login`) uses the
+    default account.
+
+    Args:
+        name (str, optional): Name of the account, used to save its session. Defaults to None.
+        config (DriverConfig, optional): How the account's browsers are started. Give each account its own `user_data_dir` when using persistent profiles. Defaults to a regular Chrome window.
+
+    Usage:
+    ```python
+    alice = Account("alice")
+    bob = Account("bob")
+    alice.load_session(store)
+    bob.load_session(store)
+
+    # Each user is browsed with the account that created it
+    alice.get_user("instagram").follow()
+    bob.get_user("instagram").follow()
+    ```
+    """
+
+    _default: "Account" = None
+    _default_lock = threading.Lock()
 
     url: str = INSTAGRAM_URL
+    _ready_selector = "main"
+
+    def __init__(self, name: str = None, config: DriverConfig = None):
+        self.name = name
+        self._config = config
+        self._pool: DriverPool = None
+        self._logged_in = False
+        self._verified_at: float = None  # time.monotonic() of the last session check
+
+        # Cookies of the current session, and the cookies each driver was last synced with
+        self._cookies: list[dict] = None
+        self._synced = weakref.WeakKeyDictionary()
+
+    def __repr__(self) -> str:
+        return f"Account({self.name!r})"
 
     @classmethod
-    def get_instance(cls):
+    def default(cls) -> "Account":
         """
-        Returns the current instance of the webdriver.
+        Returns the default account, used by `User` and `Post` objects not bound to an account.
         """
-        if not hasattr(cls, "_driver"):
-            driver = init_driver()
-            cls._driver = driver
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
 
-        return cls._driver
+            return cls._default
 
-    @classmethod
-    def login(cls, email: str | list[dict], password: str) -> list[dict]:
+    def get_user(self, name: str):
+        """
+        Returns a user browsed with this account.
+
+        Args:
+            name (str): Username of the user.
+
+        Returns:
+            User: User bound to the account.
+        """
+        from .elements.user import User
+
+        return User(name, self)
+
+    def get_post(self, id: str):
+        """
+        Returns a post browsed with this account.
+
+        Args:
+            id (str): Shortcode of the post.
+
+        Returns:
+            Post: Post bound to the account.
+        """
+        from .elements.post import Post
+
+        return Post(id, self)
+
+    def close(self):
+        """
+        Quits all of the account's browsers. They are started again when needed.
+        """
+        if self._pool is not None:
+            self._pool.quit()
+            self._pool = None
+
+    @hybridmethod
+    def get_instance(self) -> webdriver.Chrome:
+        """
+        Returns the webdriver pinned to the current thread, checking one out of the pool if needed.
+        """
+        driver = self.get_pool().get()
+
+        # Drivers that were idle while the session changed still hold the old cookies
+        if self._cookies is not None and self._synced.get(driver) is not self._cookies:
+            self._synced[driver] = self._cookies
+            self._apply_cookies(driver, self._cookies)
+
+        return driver
+
+    @hybridmethod
+    def get_pool(self) -> DriverPool:
+        """
+        Returns the pool of webdrivers used by the account, creating it if needed.
+        """
+        if self._pool is None:
+            self._pool = DriverPool(
+                factory=partial(init_driver, self._config), prespawn=PRESPAWN
+            )
+
+        return self._pool
+
+    @hybridmethod
+    def configure_pool(
+        self,
+        size: int = POOL_SIZE,
+        timeout: float = POOL_TIMEOUT,
+        config: DriverConfig = None,
+        prespawn: int = 0,
+    ):
+        """
+        Sets how many browsers can run at once and how they are started. Any open browsers are closed.
+
+        Args:
+            size (int): Maximum amount of drivers. Defaults to `POOL_SIZE`.
+            timeout (float): Seconds to wait for a free driver before raising `PoolExhausted`. Defaults to `POOL_TIMEOUT`.
+            config (DriverConfig, optional): How browsers are started (headless, blocked resources, page load strategy, persistent profiles). Defaults to a regular Chrome window.
+            prespawn (int): Browsers to start in the background right away. Defaults to 0.
+
+        Usage:
+        ```python
+        Account.configure_pool(size=4)
+
+        # Each thread runs on its own browser
+        with ThreadPoolExecutor(4) as executor:
+            totals = list(executor.map(lambda name: User(name).get_followers(), names))
+        ```
+        """
+        if self._pool is not None:
+            self._pool.quit()
+
+        self._config = config
+        self._pool = DriverPool(size, partial(init_driver, config), timeout, prespawn)
+
+    @hybridmethod
+    def release_instance(self):
+        """
+        Returns the current thread's webdriver to the pool so other threads can use it.
+        Drivers are released automatically when their thread ends.
+        """
+        if self._pool is not None:
+            self._pool.release()
+
+    @hybridmethod
+    def login(
+        self,
+        email: str | list[dict],
+        password: str,
+        typing: TypingStrategy = None,
+        timeout: float = 60,
+    ) -> list[dict]:
         """
         Uses the Instagram UI to log in. It will require user interaction to get past CAPTCHAs and the sort.
 
+        Args:
+            email (str): Email of the account.
+            password (str): Password of the account.
+            typing (TypingStrategy, optional): How to type the credentials. Defaults to the strategy set with `set_typing_strategy`.
+            timeout (float, optional): Seconds to wait for the login to complete, including any user interaction. Defaults to 60.
+
         Returns:
             list[dict]: list of cookies.
+
+        Raises:
+            LoginFailed: Raises when Instagram rejects the credentials.
+            ActionTimeout: Raises when the login didn't complete in time.
         """
         # If an account is already authenticated, it should remove all cookies
         # and refresh the browser to access the instagram login page.
-        if cls.is_logged_in():
-            cls._driver.delete_all_cookies()
-            cls._driver.refresh()
+        if self.is_logged_in():
+            self._driver.delete_all_cookies()
+            self._driver.refresh()
 
         # Write email
-        email_input = cls._driver.find_element(
-            By.CSS_SELECTOR, "#loginForm > div > div:nth-child(1) > div > label > input"
-        )
-        write(email_input, email)
+        email_input = locate(self._driver, "login.username")
+        write(email_input, email, strategy=typing)
 
         # Write password
-        password_input = cls._driver.find_element(
-            By.CSS_SELECTOR, "#loginForm > div > div:nth-child(2) > div > label > input"
-        )
-        write(password_input, password)
+        password_input = locate(self._driver, "login.password")
+        write(password_input, password, strategy=typing)
         password_input.send_keys(Keys.ENTER)
 
-        # Wait till fully logged in
-        time.sleep(5)
+        # Wait till fully logged in: either the home feed or the "save your login info" page shows
+        result = wait_for_completion(
+            self._driver,
+            present(By.CSS_SELECTOR, "svg[aria-label='Home']") | url_contains("/accounts/onetap"),
+            get_locator("login.error").present(),
+            action="account.login",
+            timeout=timeout,
+        )
+        if result.index == 1:
+            error = locate(self._driver, "login.error")
+            raise LoginFailed(error.text)
 
         # Update value
-        cls._logged_in = True
+        self._logged_in = True
+        self._verified_at = time.monotonic()
 
         # Save and return cookies after logging in
-        current_cookies = cls._driver.get_cookies()
-        cls.set_cookies(current_cookies)
+        driver = self._driver
+        current_cookies = driver.get_cookies()
+        self.set_cookies(current_cookies)
+        self._synced[driver] = self._cookies  # the browser that logged in already has them
         return current_cookies
 
-    @classmethod
+    @hybridmethod
     @check_authorization
-    def post(cls, media_path: str, caption: str = None):
+    def post(
+        self,
+        media_path: str,
+        caption: str = None,
+        typing: TypingStrategy = None,
+        timeout: float = 120,
+    ):
         """
         Posts a specific image to the account.
         Args:
             media_path (str): absolute path to the image
+            caption (str, optional): caption of the post
+            typing (TypingStrategy, optional): How to type the caption. Defaults to the strategy set with `set_typing_strategy`.
+            timeout (float, optional): Seconds to wait for the upload to complete. Defaults to 120.
+
+        Raises:
+            ActionTimeout: Raises when a step of the upload didn't complete in time.
         """
         # Make the path absolute
         media_path = os.path.abspath(media_path)
@@ -212,67 +583,82 @@ class Account(metaclass=Navigator):
             raise InvalidFormat()
 
         # Open create dialog
-        create_button = cls._driver.find_element(
-            By.CSS_SELECTOR,
-            "svg[aria-label='New post']",
-        )
+        create_button = locate(self._driver, "create.open")
         create_button.click()
 
         # Add file to the input
-        file_input = cls._driver.find_element(By.CSS_SELECTOR, "input[type='file']")
+        file_input = locate(self._driver, "create.file_input")
         file_input.send_keys(media_path)
 
         # Click 'Next' next button twice
         for _ in range(2):
             # It requires to be found each iteration due to the "StaleElementReferenceException"
-            next_btn = cls._driver.find_element(
-                By.CSS_SELECTOR,
-                "body > div.x1n2onr6.xzkaem6 > div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj > div > div > div > div > div > div > div > div._ap97 > div > div > div > div._ac7b._ac7d > div",
-            )
+            next_btn = locate(self._driver, "create.next")
+            step = locate(self._driver, "create.step").text
             next_btn.click()
-            time.sleep(random.random())
+
+            # Wait for the dialog to move on to the next step
+            wait_for_completion(
+                self._driver,
+                ~text_present("div[role='dialog'] h1", step),
+                action="account.post.next",
+                timeout=IMPLICIT_WAIT,
+            )
 
         # Write caption if specified
         if caption:
-            caption_input = cls._driver.find_element(
-                By.CSS_SELECTOR, "div[aria-label='Write a caption...']"
-            )
-            write(caption_input, caption)
+            caption_input = locate(self._driver, "create.caption")
+            write(caption_input, caption, strategy=typing)
 
         # Click 'Share' button
-        share_btn = cls._driver.find_element(
-            By.CSS_SELECTOR,
-            "body > div.x1n2onr6.xzkaem6 > div.x9f619.x1n2onr6.x1ja2u2z > div > div.x1uvtmcs.x4k7w5x.x1h91t0o.x1beo9mf.xaigb6o.x12ejxvf.x3igimt.xarpa2k.xedcshv.x1lytzrv.x1t2pt76.x7ja8zs.x1n2onr6.x1qrby5j.x1jfb8zj > div > div > div > div > div > div > div > div._ap97 > div > div > div > div._ac7b._ac7d > div",
-        )
+        share_btn = locate(self._driver, "create.share")
         share_btn.click()
 
-    @classmethod
-    def get_cookies(cls) -> list[dict]:
+        # Wait for the upload to finish
+        wait_for_completion(
+            self._driver,
+            present(By.XPATH, '//*[text()="Your post has been shared."]'),
+            absent(By.CSS_SELECTOR, "div[role='dialog']"),
+            action="account.post",
+            timeout=timeout,
+        )
+
+    @hybridmethod
+    def get_cookies(self) -> list[dict]:
         """
         Returns the current cookies contained in the webdriver.
 
         Returns:
             list[dict]: list of cookies.
         """
-        cookies = cls._driver.get_cookies()
+        cookies = self._driver.get_cookies()
         return cookies
 
-    @classmethod
-    def set_cookies(cls, cookies: list[dict]):
+    @hybridmethod
+    def set_cookies(self, cookies: list[dict]):
         """
-        Removes all cookies and adds a list of new ones.
+        Removes all cookies and adds a list of new ones. Drivers receive them the next time they are checked out, so no browser is started for it.
 
         Args:
             cookies (list[dict]): List of cookies from `.get_cookies()`.
         """
-        cls._driver.delete_all_cookies()
-        navigate(cls._driver, INSTAGRAM_URL)
+        self._cookies = list(cookies)
+
+    @staticmethod
+    def _apply_cookies(driver: webdriver.Chrome, cookies: list[dict]):
+        if hasattr(driver, "execute_cdp_cmd"):
+            set_cookies_bulk(driver, cookies)
+            return
+
+        # Drivers without DevTools can only add cookies to the page they are on
+        driver.delete_all_cookies()
+        navigate(driver, INSTAGRAM_URL)
 
         for cookie in cookies:
-            cls._driver.add_cookie(cookie)
+            driver.add_cookie(cookie)
 
-    @classmethod
-    def load_cookies(cls, path: str):
+    @hybridmethod
+    def load_cookies(self, path: str):
         """
         Loads cookies from a file.
 
@@ -282,11 +668,51 @@ class Account(metaclass=Navigator):
         with open(path, "rb") as file:
             cookies = pickle.load(file)
 
-        cls.set_cookies(cookies)
-        cls._logged_in = bool(cookies)
+        self.set_cookies(cookies)
+        self._logged_in = bool(cookies)
+        self._verified_at = None
 
-    @classmethod
-    def save_cookies(cls, path: str):
+    @hybridmethod
+    def load_session(self, store: SessionStore, name: str = None) -> bool:
+        """
+        Restores an account's session from a session store.
+
+        Args:
+            store (SessionStore): Store holding the session.
+            name (str, optional): Name the session was saved with. Defaults to the account's name.
+
+        Returns:
+            bool: Whether a session was found.
+        """
+        cookies = store.load(self._session_name(name))
+        if cookies is None:
+            return False
+
+        self.set_cookies(cookies)
+        self._logged_in = bool(cookies)
+        self._verified_at = None
+        return True
+
+    @hybridmethod
+    def save_session(self, store: SessionStore, name: str = None):
+        """
+        Saves the current session to a session store.
+
+        Args:
+            store (SessionStore): Store to save the session to.
+            name (str, optional): Name to save the session with, usually the account's username. Defaults to the account's name.
+        """
+        store.save(self._session_name(name), self.get_cookies())
+
+    def _session_name(self, name: str = None) -> str:
+        name = name or self.name
+        if name is None:
+            raise ValueError("The account has no name, so the session's name must be given.")
+
+        return name
+
+    @hybridmethod
+    def save_cookies(self, path: str):
         """
         Saves the current cookies to a file.
 
@@ -294,26 +720,55 @@ class Account(metaclass=Navigator):
             path (str): path to the file.
         """
         with open(path, "wb") as file:
-            pickle.dump(cls.get_cookies(), file)
+            pickle.dump(self.get_cookies(), file)
 
-    @classmethod
-    def is_logged_in(cls) -> bool:
+    @hybridmethod
+    def is_logged_in(self) -> bool:
+        """
+        The session is checked again once its last check is older than `SESSION_TTL`.
+
+        Returns:
+            bool: Whether the account is logged in.
+        """
+        if not self._logged_in:
+            return False
+
+        if self._verified_at is None or time.monotonic() - self._verified_at > SESSION_TTL:
+            self.verify_session()
+
+        return self._logged_in
+
+    @hybridmethod
+    def verify_session(self) -> bool:
         """
+        Checks that the session is really logged in (see `sessions.verify_session`), without going through the login UI.
+
         Returns:
             bool: Whether the account is logged in.
         """
-        return cls._logged_in
+        self._logged_in = verify_session(self._driver)
+        self._verified_at = time.monotonic()
+        return self._logged_in
 
 
-def attempt_close_notification_dialog():
-    driver = Account.get_instance()
+def attempt_close_notification_dialog(account: Account = None):
+    driver = (account or Account.default()).get_instance()
 
     # Attempt to find the button
-    driver.implicitly_wait(2)
-    found = driver.find_elements(By.XPATH, '//button[text()="Not Now"]')
-    driver.implicitly_wait(IMPLICIT_WAIT)
+    found = wait_for(
+        driver,
+        get_locator("dialog.not_now").present(),
+        timeout=2,
+        probe="account.notification_dialog",
+        learn=False,
+    )
 
     # If found it shall click it
     if found:
-        btn = found[0]
+        btn = locate(driver, "dialog.not_now")
         btn.click()
+
+
+# Start browsers in the background on import when asked to (PYGRAMCORE_PRESPAWN)
+if PRESPAWN:
+    Account.get_pool()
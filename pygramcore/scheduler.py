@@ -0,0 +1,347 @@
+from dataclasses import dataclass, field
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from selenium.webdriver.common.by import By
+from typing import Any, Callable
+import itertools, threading, time
+
+from .constants import *
+from .pygram import Account, get_account
+from .exceptions.navigation import ActionBlocked
+from .utils.waits import find_present
+
+# Priority lanes, lower runs first
+INTERACTIVE = 0
+BULK = 10
+
+# Dialog Instagram shows instead of doing an action when the account is being throttled
+_BLOCKED_XPATH = (
+    '//*[contains(text(), "Try Again Later") or contains(text(), "Action Blocked")]'
+)
+
+
+class TokenBucket:
+    """
+    Allows `burst` actions at once, and refills at `rate` actions per second divided by
+    `slowdown`. Not thread safe, the scheduler guards it.
+
+    Args:
+        rate (float): Actions per second.
+        burst (int): Maximum amount of tokens.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.slowdown = 1.0
+        self.paused_until = 0.0  # time.monotonic() until which no tokens are given
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(
+            self.burst, self.tokens + (now - self._updated) * self.rate / self.slowdown
+        )
+        self._updated = now
+
+    def ready_in(self, now: float) -> float:
+        """
+        Returns:
+            float: Seconds until a token is available.
+        """
+        self._refill(now)
+        wait = (1 - self.tokens) * self.slowdown / self.rate
+        return max(0.0, wait, self.paused_until - now)
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+
+@dataclass
+class _Task:
+    seq: int
+    priority: int
+    key: tuple  # (account, action)
+    call: Callable[[], Any]
+    target: Any
+    future: Future
+    submitted: float = field(default_factory=time.monotonic)
+
+
+class _ActionStats:
+    def __init__(self, window: int = 200):
+        self.runs = 0
+        self.blocks = 0
+        self.waited = 0.0  # total seconds spent queued
+        self.max_wait = 0.0
+        self._waits = deque(maxlen=window)
+
+    def record(self, wait: float) -> None:
+        self.runs += 1
+        self.waited += wait
+        self.max_wait = max(self.max_wait, wait)
+        self._waits.append(wait)
+
+    def percentile(self, p: float) -> float | None:
+        waits = sorted(self._waits)
+        return waits[round(p * (len(waits) - 1))] if waits else None
+
+
+class Scheduler:
+    """
+    Queues actions and runs them within a budget per account and action, so accounts can act
+    as fast as they can without being throttled. Interactive work is served before bulk work,
+    and when Instagram blocks an action, that action is paused and then slowed down for the
+    account, speeding back up as it succeeds again.
+
+    Args:
+        limits (dict, optional): Budget of each action as (actions, per sec., burst). Actions without one run right away. Defaults to `RATE_LIMITS`.
+        workers (int): Actions run at once, each on its own thread and browser. With more workers than browsers in an account's pool, actions wait for a browser to be free. Defaults to 1.
+        cooldown (float): Seconds an action is paused after a block. Defaults to `BLOCK_COOLDOWN`.
+        backoff (float): Factor the action slows down by on every block. Defaults to 2.
+        max_slowdown (float): Largest slowdown. Defaults to 16.
+        recovery (float): Factor the slowdown is reduced by on every success. Defaults to 0.9.
+
+    Usage:
+    ```python
+    with Scheduler(workers=2) as scheduler:
+        futures = [scheduler.submit(User(name), "follow") for name in names]
+
+        # Jumps ahead of the queued follows
+        profile = scheduler.submit(User("username"), "get_profile", priority=INTERACTIVE).result()
+
+        for future in futures:
+            future.result()
+    ```
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, tuple] = None,
+        workers: int = 1,
+        cooldown: float = BLOCK_COOLDOWN,
+        backoff: float = 2,
+        max_slowdown: float = 16,
+        recovery: float = 0.9,
+    ):
+        self.limits = dict(RATE_LIMITS if limits is None else limits)
+        self.workers = workers
+        self.cooldown = cooldown
+        self.backoff = backoff
+        self.max_slowdown = max_slowdown
+        self.recovery = recovery
+
+        # Queued tasks by lane, then by (account, action), in order of arrival
+        self._lanes: dict[int, dict[tuple, deque[_Task]]] = {}
+        self._buckets: dict[tuple, TokenBucket] = {}
+        self._stats: dict[tuple, _ActionStats] = {}
+        self._seq = itertools.count()
+        self._active = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="pygramcore-scheduler")
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def submit(
+        self, target: Any, method: str, *args, priority: int = BULK, **kwargs
+    ) -> Future:
+        """
+        Queues a method call on a user, post or account.
+
+        Args:
+            target (User | Post | Account): Object to call the method on.
+            method (str): Name of the method (e.g. "follow").
+            priority (int): Lane of the action, lower runs first. Defaults to `BULK`.
+
+        Returns:
+            Future: Result of the call. It raises `ActionBlocked` if Instagram blocked the action.
+        """
+        if isinstance(target, type) and issubclass(target, Account):
+            target = target.default()
+
+        call = getattr(target, method)
+        task = _Task(
+            next(self._seq),
+            priority,
+            (get_account(target), method),
+            lambda: call(*args, **kwargs),
+            target,
+            Future(),
+        )
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The scheduler has been closed.")
+
+            lane = self._lanes.setdefault(priority, {})
+            lane.setdefault(task.key, deque()).append(task)
+            self._condition.notify_all()
+
+        return task.future
+
+    def _bucket(self, key: tuple) -> TokenBucket | None:
+        limit = self.limits.get(key[1])
+        if limit is None:
+            return None
+
+        if key not in self._buckets:
+            count, per, burst = limit
+            self._buckets[key] = TokenBucket(count / per, burst)
+
+        return self._buckets[key]
+
+    def _next(self, now: float) -> tuple[_Task | None, float | None]:
+        # Returns the next task that can run, or how long until one can
+        soonest = None
+        for priority in sorted(self._lanes):
+            lane = self._lanes[priority]
+            ready = None
+            for key in list(lane):
+                tasks = lane[key]
+                while tasks and tasks[0].future.cancelled():
+                    tasks.popleft()
+                if not tasks:
+                    del lane[key]
+                    continue
+
+                bucket = self._bucket(key)
+                wait = bucket.ready_in(now) if bucket else 0.0
+                if wait > 0:
+                    soonest = wait if soonest is None else min(soonest, wait)
+                elif ready is None or tasks[0].seq < ready.seq:
+                    ready = tasks[0]
+
+            if ready is not None:
+                lane[ready.key].popleft()
+                if not lane[ready.key]:
+                    del lane[ready.key]
+
+                bucket = self._bucket(ready.key)
+                if bucket:
+                    bucket.take(now)
+                return ready, None
+
+            if not lane:
+                del self._lanes[priority]
+
+        return None, soonest
+
+    def _dispatch(self) -> None:
+        with self._condition:
+            while True:
+                if self._closed and not self._lanes:
+                    return
+
+                if self._active >= self.workers or not self._lanes:
+                    self._condition.wait()
+                    continue
+
+                task, wait = self._next(time.monotonic())
+                if task is None:
+                    # Without a wait, only cancelled tasks were left
+                    if wait is not None:
+                        self._condition.wait(wait)
+                    continue
+
+                if not task.future.set_running_or_notify_cancel():
+                    continue
+
+                stats = self._stats.setdefault(task.key, _ActionStats())
+                stats.record(time.monotonic() - task.submitted)
+                self._active += 1
+                self._executor.submit(self._run, task)
+
+    def _run(self, task: _Task) -> None:
+        limited = task.key[1] in self.limits
+        try:
+            value = task.call()
+            if limited and find_present(task.target._driver, By.XPATH, _BLOCKED_XPATH):
+                raise ActionBlocked(task.key[1])
+        except ActionBlocked as error:
+            self._adapt(task.key, blocked=True)
+            task.future.set_exception(error)
+        except BaseException as error:
+            task.future.set_exception(error)
+        else:
+            if limited:
+                self._adapt(task.key, blocked=False)
+            task.future.set_result(value)
+        finally:
+            # Worker threads outlive the task, and would otherwise keep the browser to themselves
+            task.key[0].release_instance()
+
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+    def _adapt(self, key: tuple, blocked: bool) -> None:
+        with self._condition:
+            bucket = self._bucket(key)
+            if bucket is None:
+                return
+
+            if blocked:
+                self._stats[key].blocks += 1
+                bucket.slowdown = min(self.max_slowdown, bucket.slowdown * self.backoff)
+                bucket.paused_until = time.monotonic() + self.cooldown
+                bucket.tokens = 0.0
+            else:
+                bucket.slowdown = max(1.0, bucket.slowdown * self.recovery)
+
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            dict: Queued tasks by lane, running tasks, and for every account and action: runs, blocks, seconds waited in the queue (total, max, p50, p95), slowdown and seconds left paused.
+        """
+        now = time.monotonic()
+        with self._condition:
+            stats = {
+                "queued": {
+                    priority: sum(len(tasks) for tasks in lane.values())
+                    for priority, lane in self._lanes.items()
+                },
+                "running": self._active,
+                "actions": {},
+            }
+            for key, action_stats in self._stats.items():
+                bucket = self._buckets.get(key)
+                account, action = key
+                stats["actions"][f"{account.name or 'default'}/{action}"] = {
+                    "runs": action_stats.runs,
+                    "blocks": action_stats.blocks,
+                    "waited": action_stats.waited,
+                    "max_wait": action_stats.max_wait,
+                    "p50": action_stats.percentile(0.5),
+                    "p95": action_stats.percentile(0.95),
+                    "slowdown": bucket.slowdown if bucket else 1.0,
+                    "paused_for": max(0.0, bucket.paused_until - now) if bucket else 0.0,
+                }
+
+        return stats
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stops accepting actions. Queued actions still run unless `wait` is False, in which case they are cancelled.
+        """
+        with self._condition:
+            self._closed = True
+            if not wait:
+                for lane in self._lanes.values():
+                    for tasks in lane.values():
+                        for task in tasks:
+                            task.future.cancel()
+                self._lanes.clear()
+            self._condition.notify_all()
+
+        if wait:
+            self._dispatcher.join()
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "Scheduler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
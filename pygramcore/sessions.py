@@ -0,0 +1,218 @@
+from selenium import webdriver
+from contextlib import contextmanager
+from typing import Iterator
+import json, os, tempfile, threading, time
+
+from .constants import *
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Cookie fields WebDriver uses, and their DevTools equivalents
+_CDP_COOKIE_FIELDS = {
+    "name": "name",
+    "value": "value",
+    "domain": "domain",
+    "path": "path",
+    "secure": "secure",
+    "httpOnly": "httpOnly",
+    "sameSite": "sameSite",
+    "expiry": "expires",
+}
+
+# Asks Instagram who is logged in. Only answers with a 200 to authenticated sessions.
+_CURRENT_USER_SCRIPT = """
+const done = arguments[arguments.length - 1];
+fetch("/api/v1/accounts/current_user/?edit=true", {
+    credentials: "include",
+    headers: { "X-IG-App-ID": "936619743392459" },
+    redirect: "manual",
+})
+    .then((response) => done(response.status))
+    .catch(() => done(null));
+"""
+
+
+class SessionStore:
+    """
+    Keeps the cookies of many accounts in a single versioned JSON file. Changes are made under
+    a lock on a ".lock" file next to it, so threads and processes sharing the file don't undo
+    each other's changes.
+
+    Args:
+        path (str): Path to the file. It is created on the first save.
+
+    Usage:
+    ```python
+    store = SessionStore("sessions.json")
+
+    Account.login("youremail@email.com", "yourpassword123")
+    Account.save_session(store, "youraccount")
+
+    # Later, even from another process
+    Account.load_session(store, "youraccount")
+    ```
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        # The file lock is held by the process, so threads also take a lock of their own
+        with self._thread_lock, open(self.path + ".lock", "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def save(self, account: str, cookies: list[dict]) -> None:
+        """
+        Saves an account's cookies, replacing the previous ones.
+
+        Args:
+            account (str): Name of the account.
+            cookies (list[dict]): Cookies from `Account.get_cookies()`.
+        """
+        with self._lock():
+            data = self._read()
+            data["accounts"][account] = {"cookies": cookies, "saved_at": time.time()}
+            self._write(data)
+
+    def load(self, account: str) -> list[dict] | None:
+        """
+        Args:
+            account (str): Name of the account.
+
+        Returns:
+            list[dict] | None: The account's cookies, or None if it has no session saved.
+        """
+        with self._lock():
+            session = self._read()["accounts"].get(account)
+
+        return session["cookies"] if session else None
+
+    def delete(self, account: str) -> None:
+        """
+        Removes an account's session.
+
+        Args:
+            account (str): Name of the account.
+        """
+        with self._lock():
+            data = self._read()
+            if data["accounts"].pop(account, None) is not None:
+                self._write(data)
+
+    def accounts(self) -> list[str]:
+        """
+        Returns:
+            list[str]: Names of the accounts with a session saved.
+        """
+        with self._lock():
+            return list(self._read()["accounts"])
+
+    def _read(self) -> dict:
+        if not os.path.exists(self.path):
+            return {"version": self.VERSION, "accounts": {}}
+
+        with open(self.path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+
+        if data.get("version") != self.VERSION:
+            raise ValueError(
+                f'"{self.path}" has an unsupported session store version: {data.get("version")}.'
+            )
+
+        return data
+
+    def _write(self, data: dict) -> None:
+        # Write to a temporary file first so a crash can't leave a half written store
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.replace(temp_path, self.path)
+        except:
+            os.remove(temp_path)
+            raise
+
+
+def set_cookies_bulk(driver: webdriver.Chrome, cookies: list[dict]) -> None:
+    """
+    Replaces all of the browser's cookies with a single DevTools call. Unlike `add_cookie`,
+    it doesn't require the browser to be on Instagram first.
+
+    Args:
+        driver (webdriver.Chrome): Driver to set the cookies on.
+        cookies (list[dict]): Cookies from `Account.get_cookies()`.
+    """
+    cdp_cookies = []
+    for cookie in cookies:
+        cdp_cookie = {
+            cdp_field: cookie[field]
+            for field, cdp_field in _CDP_COOKIE_FIELDS.items()
+            if cookie.get(field) is not None
+        }
+        if "domain" not in cdp_cookie:
+            cdp_cookie["url"] = INSTAGRAM_URL
+
+        cdp_cookies.append(cdp_cookie)
+
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": cdp_cookies})
+
+
+def verify_session(driver: webdriver.Chrome) -> bool:
+    """
+    Checks whether the browser holds a logged in session, without going through the login UI.
+    The session cookie must be present and unexpired, and if the browser is on Instagram,
+    Instagram itself must accept the session.
+
+    Args:
+        driver (webdriver.Chrome): Driver to check.
+
+    Returns:
+        bool: Whether the session is logged in.
+    """
+    if hasattr(driver, "execute_cdp_cmd"):
+        cookies = driver.execute_cdp_cmd("Network.getCookies", {"urls": [INSTAGRAM_URL]})
+        cookies = cookies["cookies"]
+    else:
+        cookies = driver.get_cookies()
+
+    session_cookie = next(
+        (cookie for cookie in cookies if cookie["name"] == "sessionid"), None
+    )
+    if session_cookie is None or not session_cookie["value"]:
+        return False
+
+    # DevTools calls it "expires" (-1 for session cookies), WebDriver "expiry"
+    expires = session_cookie.get("expires", session_cookie.get("expiry", -1))
+    if 0 < expires < time.time():
+        return False
+
+    # Requests can only be made to Instagram from one of its pages
+    if not driver.current_url.startswith(INSTAGRAM_URL):
+        return True
+
+    # A check that couldn't be made (e.g. the request failed) doesn't prove anything either
+    status = driver.execute_async_script(_CURRENT_USER_SCRIPT)
+    return status == 200
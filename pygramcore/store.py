@@ -0,0 +1,213 @@
+from dataclasses import asdict, fields, is_dataclass
+from datetime import datetime
+from typing import Any
+import json, os, sqlite3, threading, time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    account TEXT NOT NULL,
+    url TEXT NOT NULL,
+    field TEXT NOT NULL,
+    arguments TEXT NOT NULL,
+    value TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (account, url, field, arguments)
+)
+"""
+_VERSION = 1
+
+
+class MetadataStore:
+    """
+    Keeps values read from Instagram (profiles, post metadata, likers, media URLs) in a
+    SQLite database, so they outlive the process and are shared by every process on the host.
+    Used as the persistent level of a `Cache`.
+
+    Values are saved per account name. Accounts without a name, other than the default
+    account, aren't persisted.
+
+    Args:
+        path (str): Path to the database. It is created if needed.
+        max_age (float, optional): Oldest value in seconds that is served, on top of the cache's TTL of each field. Defaults to no limit.
+        timeout (float): Seconds to wait for another process writing to the database. Defaults to 5.
+
+    Usage:
+    ```python
+    set_cache(Cache(store=MetadataStore("metadata.db", max_age=6 * 3600)))
+
+    # After a restart, served from the database if read less than the field's TTL ago
+    User("username").get_profile()
+    ```
+    """
+
+    def __init__(self, path: str, max_age: float = None, timeout: float = 5):
+        self.path = path
+        self.max_age = max_age
+        self.timeout = timeout
+        self._local = threading.local()
+
+        connection = self._connect()
+        with connection:
+            connection.execute(_SCHEMA)
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version == 0:
+                connection.execute(f"PRAGMA user_version = {_VERSION}")
+            elif version != _VERSION:
+                raise ValueError(
+                    f'"{path}" has an unsupported metadata store version: {version}.'
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        # SQLite connections can't be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            # Readers don't block the writer (nor the other way around), across processes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+
+        return connection
+
+    def get(self, key: tuple, max_age: float = None) -> tuple[Any, float] | None:
+        """
+        Args:
+            key (tuple): (account, url, field, arguments) key of the value.
+            max_age (float, optional): Oldest value in seconds to return. Defaults to `max_age` of the store.
+
+        Returns:
+            tuple[Any, float] | None: The value and its age in seconds, or None if there's no fresh enough value.
+        """
+        account, url, field, arguments = key
+        name = _account_name(account)
+        if name is None:
+            return None
+
+        row = self._connect().execute(
+            "SELECT value, saved_at FROM entries"
+            " WHERE account = ? AND url = ? AND field = ? AND arguments = ?",
+            (name, url, field, arguments),
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, saved_at = row
+        age = max(0.0, time.time() - saved_at)
+        bounds = [bound for bound in (max_age, self.max_age) if bound is not None]
+        if bounds and age > min(bounds):
+            return None
+
+        return _decode(json.loads(value), account), age
+
+    def set(self, key: tuple, value: Any) -> None:
+        """
+        Saves a value, replacing the previous one.
+        """
+        account, url, field, arguments = key
+        name = _account_name(account)
+        if name is None:
+            return
+
+        try:
+            value = json.dumps(_encode(value))
+        except TypeError:
+            return  # Values that can't be saved are only kept in memory
+
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (name, url, field, arguments, value, time.time()),
+            )
+
+    def delete(self, account, url: str, field: str) -> None:
+        """
+        Removes a field of a page, whatever the arguments it was read with.
+        """
+        name = _account_name(account)
+        if name is None:
+            return
+
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                "DELETE FROM entries WHERE account = ? AND url = ? AND field = ?",
+                (name, url, field),
+            )
+
+    def prune(self, max_age: float) -> int:
+        """
+        Removes values older than `max_age` seconds.
+
+        Returns:
+            int: Amount of values removed.
+        """
+        connection = self._connect()
+        with connection:
+            cursor = connection.execute(
+                "DELETE FROM entries WHERE saved_at < ?", (time.time() - max_age,)
+            )
+
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """
+        Closes the current thread's connection.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def _account_name(account) -> str | None:
+    if account.name is not None:
+        return account.name
+
+    return "" if account is type(account).default() else None
+
+
+def _encode(value: Any) -> Any:
+    from .elements import User, Post
+
+    if isinstance(value, User):
+        return {"__type__": "User", "name": value.name}
+    if isinstance(value, Post):
+        return {"__type__": "Post", "id": value.id}
+    if isinstance(value, datetime):
+        return {"__type__": "datetime", "value": value.isoformat()}
+    if is_dataclass(value):
+        return {"__type__": type(value).__name__, **_encode(asdict(value))}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+
+    return value
+
+
+def _decode(value: Any, account) -> Any:
+    from .elements import User, Post, ProfileSnapshot, Media
+
+    if isinstance(value, list):
+        return [_decode(item, account) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    value = {key: _decode(item, account) for key, item in value.items()}
+    kind = value.pop("__type__", None)
+    if kind == "User":
+        return User(value["name"], account)
+    if kind == "Post":
+        return Post(value["id"], account)
+    if kind == "datetime":
+        return datetime.fromisoformat(value["value"])
+
+    for cls in (ProfileSnapshot, Media):
+        if kind == cls.__name__:
+            return cls(**{field.name: value[field.name] for field in fields(cls)})
+
+    return value
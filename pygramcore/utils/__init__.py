@@ -1,2 +1,5 @@
 from .misc import *
-from .navigation import *
\ No newline at end of file
+from .navigation import *
+from .extract import *
+from .scroll import *
+from .waits import *
@@ -0,0 +1,85 @@
+from selenium import webdriver
+from selenium.webdriver.remote.webelement import WebElement
+
+# Reads the requested fields of every node matching a selector. "text" reads the rendered
+# text of the node, anything else is read as an attribute.
+_EXTRACT_SCRIPT = """
+const [selector, fields, root, scroll] = arguments;
+const elements = Array.from((root || document).querySelectorAll(selector));
+
+const values = elements.map((element) => {
+    const value = {};
+    for (const field of fields) {
+        value[field] = field === "text" ? element.innerText : element.getAttribute(field);
+    }
+    return value;
+});
+
+if (scroll && elements.length) {
+    elements[elements.length - 1].scrollIntoView(true);
+}
+return values;
+"""
+
+# Reads a field of the last node matching a selector
+_EXTRACT_LAST_SCRIPT = """
+const [selector, field] = arguments;
+const elements = document.querySelectorAll(selector);
+if (!elements.length) {
+    return null;
+}
+
+const element = elements[elements.length - 1];
+return field === "text" ? element.innerText : element.getAttribute(field);
+"""
+
+
+def extract_all(
+    driver: webdriver.Chrome,
+    selector: str,
+    *fields: str,
+    root: WebElement = None,
+    scroll: bool = False,
+) -> list[dict[str, str | None]]:
+    """
+    Reads attributes and/or text from every element matching a CSS selector in a single round trip,
+    instead of one `get_attribute` call per element.
+
+    Args:
+        driver (webdriver.Chrome): Driver to run the script on.
+        selector (str): CSS selector of the elements.
+        fields (str): Attributes to read. "text" reads the element's text. Defaults to "text".
+        root (WebElement, optional): Only search inside of this element. Defaults to the whole document.
+        scroll (bool, optional): Scroll the last element found into view, to load more elements in lists. Defaults to False.
+
+    Returns:
+        list[dict[str, str | None]]: A dict of field values per element, in document order.
+
+    Usage:
+    ```python
+    links = extract_all(driver, "a[href^='/p/']", "href")
+    hrefs = [link["href"] for link in links]
+    ```
+    """
+    if not fields:
+        fields = ("text",)
+
+    values = driver.execute_script(_EXTRACT_SCRIPT, selector, list(fields), root, scroll)
+    return values
+
+
+def extract_last(driver: webdriver.Chrome, selector: str, field: str = "text") -> str | None:
+    """
+    Reads an attribute or the text of the last element matching a CSS selector. Useful to
+    check whether a list has loaded new elements.
+
+    Args:
+        driver (webdriver.Chrome): Driver to run the script on.
+        selector (str): CSS selector of the elements.
+        field (str): Attribute to read. "text" reads the element's text. Defaults to "text".
+
+    Returns:
+        str | None: The value, or None if no element matches.
+    """
+    value = driver.execute_script(_EXTRACT_LAST_SCRIPT, selector, field)
+    return value
@@ -3,3 +3,10 @@ from datetime import datetime
 
 def parse_instagram_date(time: str):
     return datetime.strptime(time, "%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def parse_count(count: str) -> int:
+    """
+    Converts a count as displayed by Instagram (e.g. "156,204") to an integer.
+    """
+    return int(count.replace(",", ""))
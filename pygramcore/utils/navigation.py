@@ -1,27 +1,211 @@
+from abc import ABC, abstractmethod
 from selenium import webdriver
-import time, random
+from selenium.webdriver.remote.webelement import WebElement
+import time, random, weakref
 
+# Tags the current document with a random ID (unless it already has one) and returns it
+# along with the URL. A reload or a new page load creates a new document without the tag.
+_PAGE_IDENTITY_SCRIPT = """
+if (!window.__pygramcore_page) {
+    window.__pygramcore_page = Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
+return [window.location.href, window.__pygramcore_page];
+"""
 
-def navigate(driver: webdriver.Chrome, url: str):
+# Focuses the input and inserts the text as if it was pasted, returns whether it worked
+_INSERT_TEXT_SCRIPT = """
+const [input, text] = arguments;
+input.focus();
+return document.execCommand("insertText", false, text);
+"""
+
+# Page identity of the last page each driver checked as found
+_validated_pages = weakref.WeakKeyDictionary()
+
+# Values remembered for the page each driver last checked as found, as (page, values)
+_page_memos = weakref.WeakKeyDictionary()
+
+
+def get_page_identity(driver: webdriver.Chrome) -> tuple[str, str]:
+    """
+    Identifies the page currently loaded in a single round trip.
+
+    Returns:
+        tuple[str, str]: URL and ID of the current document.
+    """
+    url, page_id = driver.execute_script(_PAGE_IDENTITY_SCRIPT)
+    return url, page_id
+
+
+def same_url(a: str, b: str) -> bool:
+    """
+    Compares two URLs ignoring the trailing slash Instagram adds to paths.
+    """
+    return a.rstrip("/") == b.rstrip("/")
+
+
+def navigate(driver: webdriver.Chrome, url: str) -> tuple[str, str]:
     """
     Navigates to a URL only if the URL is different to the current.
+
+    Returns:
+        tuple[str, str]: Identity of the page loaded (see `get_page_identity`).
     """
     # No need to navigate if already on the same URL
-    if driver.current_url == url:
-        return
+    page = get_page_identity(driver)
+    if same_url(page[0], url):
+        return page
 
     driver.get(url)
+    return get_page_identity(driver)
+
+
+def is_page_validated(driver: webdriver.Chrome, page: tuple[str, str]) -> bool:
+    """
+    Checks whether the page has already been checked since it was loaded.
+    """
+    return _validated_pages.get(driver) == page
+
 
+def set_page_validated(driver: webdriver.Chrome, page: tuple[str, str]) -> None:
+    """
+    Marks the page as checked until the driver loads another document or URL.
+    """
+    _validated_pages[driver] = page
+
+
+def get_page_memo(driver: webdriver.Chrome) -> dict | None:
+    """
+    Returns the values remembered for the page the driver last checked as found. They are
+    forgotten as soon as another page (or another load of the same page) is checked.
 
-def write(input, text, speed=5):
+    Returns:
+        dict | None: Remembered values by key, None if no page has been checked yet.
     """
-    Types some text letter by letter at random intervals in an input field. This is done so the interaction feels more "human-like".
+    page = _validated_pages.get(driver)
+    if page is None:
+        return None
+
+    memo_page, memo = _page_memos.get(driver, (None, None))
+    if memo_page != page:
+        memo = {}
+        _page_memos[driver] = (page, memo)
+
+    return memo
+
+
+class TypingStrategy(ABC):
+    """
+    Base class of the ways text can be typed into an input field.
+    """
+
+    @abstractmethod
+    def type(self, input: WebElement, text: str) -> None:
+        """
+        Types the text into the input.
+
+        Args:
+            input (WebElement): The input to write in.
+            text (str): Text to be written.
+        """
+
+
+class PerCharacter(TypingStrategy):
+    """
+    Types letter by letter at random intervals, so the interaction feels more "human-like".
+    It is the slowest strategy: one command and one pause per letter.
+
+    Args:
+        speed (int): Divides the random float (from 0 to 1). The higher the number the faster it writes. Defaults to 5.
+    """
+
+    def __init__(self, speed: float = 5):
+        self.speed = speed
+
+    def type(self, input: WebElement, text: str) -> None:
+        for letter in text:
+            input.send_keys(letter)
+            time.sleep(random.random() / self.speed)
+
+
+class Burst(TypingStrategy):
+    """
+    Types the text in chunks, pausing between them.
+
+    Args:
+        chunk_size (int): Letters per chunk. Defaults to 12.
+        delay (float): Average pause between chunks in seconds. Defaults to 0.15.
+        jitter (float): Randomness of the pause, as a fraction of the delay. Defaults to 0.5.
+    """
+
+    def __init__(self, chunk_size: int = 12, delay: float = 0.15, jitter: float = 0.5):
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be at least 1.")
+
+        self.chunk_size = chunk_size
+        self.delay = delay
+        self.jitter = jitter
+
+    def type(self, input: WebElement, text: str) -> None:
+        for start in range(0, len(text), self.chunk_size):
+            if start:
+                time.sleep(self.delay * (1 + self.jitter * (2 * random.random() - 1)))
+
+            input.send_keys(text[start : start + self.chunk_size])
+
+
+class BulkInsert(TypingStrategy):
+    """
+    Inserts the whole text at once with a single command. Unlike sending keys, this also
+    supports characters such as emojis.
+    """
+
+    def type(self, input: WebElement, text: str) -> None:
+        inserted = input.parent.execute_script(_INSERT_TEXT_SCRIPT, input, text)
+
+        # Some inputs don't support inserting text, those get the keys instead
+        if not inserted:
+            input.send_keys(text)
+
+
+_typing_strategy: TypingStrategy = PerCharacter()
+
+
+def set_typing_strategy(strategy: TypingStrategy) -> None:
+    """
+    Sets the strategy used to type text when none is specified.
+
+    Args:
+        strategy (TypingStrategy): Typing strategy. Defaults to `PerCharacter()`.
+
+    Usage:
+    ```python
+    set_typing_strategy(BulkInsert())
+    ```
+    """
+    global _typing_strategy
+    _typing_strategy = strategy
+
+
+def get_typing_strategy() -> TypingStrategy:
+    """
+    Returns:
+        TypingStrategy: The strategy used to type text when none is specified.
+    """
+    return _typing_strategy
+
+
+def write(input, text, speed=None, strategy: TypingStrategy = None):
+    """
+    Types some text in an input field.
 
     Args:
         input (WebElement): The input to write in.
         text (str): Text to be written.
-        speed (int): Divides the random float (from 0 to 1). The higher the number the faster it writes. Defaults to 5.
+        speed (int, optional): Types letter by letter at this speed (see `PerCharacter`).
+        strategy (TypingStrategy, optional): How to type the text. Defaults to the strategy set with `set_typing_strategy`.
     """
-    for letter in text:
-        input.send_keys(letter)
-        time.sleep(random.random() / speed)
+    if strategy is None:
+        strategy = _typing_strategy if speed is None else PerCharacter(speed)
+
+    strategy.type(input, text)
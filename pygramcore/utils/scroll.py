@@ -0,0 +1,425 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, ClassVar, Iterator
+from selenium import webdriver
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import (
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+import json, os, tempfile, time
+
+from .extract import *
+from ..constants import IMPLICIT_WAIT
+from ..exceptions.navigation import ListClosed
+
+# Reads a field of the elements after the one whose value is `after` (searching from the end,
+# so only new elements are read), and scrolls the last element into view to load more. When
+# `after` isn't in the list anymore, every element is read.
+_READ_AFTER_SCRIPT = """
+const [selector, field, after] = arguments;
+const elements = Array.from(document.querySelectorAll(selector));
+const read = (element) => (field === "text" ? element.innerText : element.getAttribute(field));
+
+let start = 0;
+if (after !== null) {
+    for (let index = elements.length - 1; index >= 0; index--) {
+        if (read(elements[index]) === after) {
+            start = index + 1;
+            break;
+        }
+    }
+}
+
+if (elements.length) {
+    elements[elements.length - 1].scrollIntoView(true);
+}
+return elements.slice(start).map(read);
+"""
+
+
+@dataclass
+class ScrollProgress:
+    """
+    Progress of a scrolled list. Passing the same progress to a new iteration resumes it:
+    values yielded before are skipped.
+
+    Args:
+        seen (set[str]): Values yielded so far.
+        done (bool): Whether the end of the list was reached.
+    """
+
+    seen: set[str] = field(default_factory=set)
+    done: bool = False
+
+    @property
+    def count(self) -> int:
+        return len(self.seen)
+
+
+def iter_scroll_values(
+    driver: webdriver.Chrome,
+    selector: str,
+    field: str = "text",
+    progress: ScrollProgress = None,
+    timeout: float = IMPLICIT_WAIT,
+    retries: int = 3,
+    reopen: Callable[[], None] = None,
+) -> Iterator[str]:
+    """
+    Yields a field of the elements of a lazily loaded (and possibly virtualized) list, scrolling
+    to the last element to load more. Each value is only yielded once. The list must already be
+    showing, nothing is read until iteration starts.
+
+    A progress only skips values, the list is still scrolled from its top: resuming costs as
+    many scrolls as it took to get to where the previous iteration stopped.
+
+    When the list goes away mid-iteration (e.g. the driver was used elsewhere between two
+    values, closing the dialog showing it), it is opened again with `reopen` and scrolled past
+    the values yielded before. Without `reopen`, it raises instead of ending early.
+
+    Args:
+        driver (webdriver.Chrome): Driver showing the list.
+        selector (str): CSS selector of the list's elements.
+        field (str): Attribute to read. "text" reads the element's text. Defaults to "text".
+        progress (ScrollProgress, optional): Progress to resume from and update. Defaults to a new one.
+        timeout (float): Seconds to wait for new elements before considering the end of the list reached. Defaults to `IMPLICIT_WAIT`.
+        retries (int): Times to retry reading the list when it re-renders mid-read. Defaults to 3.
+        reopen (Callable, optional): Shows the list again after it went away.
+
+    Yields:
+        str: Value of each element.
+
+    Raises:
+        ListClosed: Raises when the list went away and couldn't be shown again.
+    """
+    if progress is None:
+        progress = ScrollProgress()
+
+    failures = 0
+    shown = False  # whether the list has had elements since it was (re)opened
+    reopened = False
+    while True:
+        try:
+            values = extract_all(driver, selector, field, scroll=True)
+        except (StaleElementReferenceException, JavascriptException):
+            failures += 1
+            if failures > retries:
+                raise
+
+            time.sleep(0.2 * failures)
+            continue
+
+        failures = 0
+        if values:
+            shown, reopened = True, False
+        elif shown:
+            # The list had elements and has none anymore, it was closed
+            if reopen is None or reopened:
+                raise ListClosed(selector)
+
+            reopen()
+            shown, reopened = False, True
+            continue
+
+        for value in values:
+            value = value[field]
+            if value and value not in progress.seen:
+                progress.seen.add(value)
+                yield value
+
+        # Wait for the list to load new elements, if none do, the end has been reached
+        last_value = values[-1][field] if values else None
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+                lambda driver: extract_last(driver, selector, field) != last_value
+            )
+        except TimeoutException:
+            if reopened:
+                raise ListClosed(selector)  # it was opened again, but shows nothing
+
+            progress.done = True
+            return
+
+
+@dataclass
+class ListCheckpoint:
+    """
+    Progress of a list too long to keep every value in memory (e.g. the followers of a large
+    account), which can be saved to a JSON file to resume the iteration after a crash or a
+    restart. Lists load in order, so only the most recent values are kept to skip duplicates:
+    memory stays the same however long the list is.
+
+    Paginated lists (see `iter_pages_checkpointed`) resume from the cursor of the page being
+    read. Scrolled lists (see `iter_scroll_checkpointed`) have no cursor, so resuming them
+    scrolls past the values yielded before.
+
+    Args:
+        path (str, optional): File the checkpoint is saved to. None keeps it in memory only.
+        key (str, optional): What the list is (e.g. "username/followers"), so a checkpoint can't resume another list.
+        count (int): Values yielded so far.
+        recent (list[str]): Last values yielded, oldest first.
+        done (bool): Whether the end of the list was reached. Finished checkpoints yield nothing more until `reset`.
+        cursor (str, optional): Cursor of the page being read, "" for the first page. None when the list is scrolled.
+        window (int): Amount of recent values kept. Defaults to 1000.
+        save_every (int): Values yielded between saves. Defaults to 100.
+
+    Usage:
+    ```python
+    checkpoint = ListCheckpoint.load("followers.json", key="username/followers")
+    for user in User("username").iter_followers(checkpoint):
+        pipeline.send(user.name)
+    ```
+    """
+
+    VERSION: ClassVar[int] = 1
+
+    path: str = None
+    key: str = None
+    count: int = 0
+    recent: list[str] = field(default_factory=list)
+    done: bool = False
+    cursor: str = None
+    window: int = 1000
+    save_every: int = 100
+
+    def __post_init__(self):
+        self.recent = deque(self.recent, maxlen=self.window)
+        self._recent_set = set(self.recent)
+
+    @classmethod
+    def load(cls, path: str, key: str = None, **kwargs) -> "ListCheckpoint":
+        """
+        Loads a checkpoint from a file, or starts a new one if the file doesn't exist.
+
+        Args:
+            path (str): File of the checkpoint.
+            key (str, optional): What the list is. Loading the checkpoint of another list raises.
+            kwargs: `window` and `save_every`.
+
+        Raises:
+            ValueError: Raises when the file is the checkpoint of another list or of an unsupported version.
+        """
+        if not os.path.exists(path):
+            return cls(path, key, **kwargs)
+
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+
+        if data.get("version") != cls.VERSION:
+            raise ValueError(
+                f'"{path}" has an unsupported checkpoint version: {data.get("version")}.'
+            )
+        if key is not None and data["key"] != key:
+            raise ValueError(f'"{path}" is the checkpoint of "{data["key"]}", not "{key}".')
+
+        return cls(
+            path,
+            data["key"],
+            data["count"],
+            data["recent"],
+            data["done"],
+            data.get("cursor"),
+            **kwargs,
+        )
+
+    def reset(self) -> None:
+        """
+        Starts the list over, e.g. to crawl it again once it's done.
+        """
+        self.count = 0
+        self.recent.clear()
+        self._recent_set.clear()
+        self.done = False
+        self.cursor = None
+        self.save()
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._recent_set
+
+    def add(self, value: str) -> None:
+        """
+        Records a value as yielded, saving the checkpoint every `save_every` values.
+        """
+        if len(self.recent) == self.recent.maxlen:
+            self._recent_set.discard(self.recent[0])
+
+        self.recent.append(value)
+        self._recent_set.add(value)
+        self.count += 1
+
+        if self.count % self.save_every == 0:
+            self.save()
+
+    def save(self) -> None:
+        """
+        Saves the checkpoint to its file, if it has one.
+        """
+        if self.path is None:
+            return
+
+        data = {
+            "version": self.VERSION,
+            "key": self.key,
+            "count": self.count,
+            "recent": list(self.recent),
+            "done": self.done,
+            "cursor": self.cursor,
+        }
+
+        # Write to a temporary file first so a crash can't leave a half written checkpoint
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.replace(temp_path, self.path)
+        except:
+            os.remove(temp_path)
+            raise
+
+
+def iter_scroll_checkpointed(
+    driver: webdriver.Chrome,
+    selector: str,
+    field: str = "text",
+    checkpoint: ListCheckpoint = None,
+    timeout: float = IMPLICIT_WAIT,
+    retries: int = 3,
+    reopen: Callable[[], None] = None,
+) -> Iterator[str]:
+    """
+    Same as `iter_scroll_values`, for long lists: each round trip only sends back the elements
+    loaded since the last one, and duplicates are skipped with a `ListCheckpoint`. The page
+    still holds every element loaded, so each round trip takes longer as the list grows.
+
+    When resuming from a checkpoint, the list is scrolled again from the top, past the values
+    yielded before (without yielding them), up to the most recent one still in the list. That
+    costs as much scrolling as the first time, so lists that can be paginated should use
+    `iter_pages_checkpointed` instead.
+
+    Args:
+        driver (webdriver.Chrome): Driver showing the list.
+        selector (str): CSS selector of the list's elements.
+        field (str): Attribute to read. "text" reads the element's text. Defaults to "text".
+        checkpoint (ListCheckpoint, optional): Checkpoint to resume from and update. It is saved when the iteration ends or stops. Defaults to a new one.
+        timeout (float): Seconds to wait for new elements before considering the end of the list reached. Defaults to `IMPLICIT_WAIT`.
+        retries (int): Times to retry reading the list when it re-renders mid-read. Defaults to 3.
+        reopen (Callable, optional): Shows the list again after it went away (see `iter_scroll_values`).
+
+    Yields:
+        str: Value of each element.
+
+    Raises:
+        ValueError: Raises when resuming and none of the recent values are in the list anymore, as it can't tell where to carry on from.
+        ListClosed: Raises when the list went away and couldn't be shown again. The checkpoint isn't marked as done.
+    """
+    if checkpoint is None:
+        checkpoint = ListCheckpoint()
+    if checkpoint.done:
+        return
+
+    resuming = checkpoint.count > 0
+    last_value = None
+    reopened = False
+    failures = 0
+    try:
+        while True:
+            try:
+                values = driver.execute_script(_READ_AFTER_SCRIPT, selector, field, last_value)
+            except (StaleElementReferenceException, JavascriptException):
+                failures += 1
+                if failures > retries:
+                    raise
+
+                time.sleep(0.2 * failures)
+                continue
+
+            failures = 0
+            if values:
+                last_value = values[-1]
+                reopened = False
+            elif last_value is not None and extract_last(driver, selector, field) is None:
+                # The list had elements and has none anymore, it was closed
+                if reopen is None or reopened:
+                    raise ListClosed(selector)
+
+                # It shows from the top again, past values yielded before
+                reopen()
+                last_value, resuming, reopened = None, True, True
+                continue
+
+            if resuming:
+                # Values before the newest one yielded before were yielded too
+                anchors = [index for index, value in enumerate(values) if value in checkpoint]
+                if anchors:
+                    values = values[anchors[-1] + 1 :]
+                    resuming = False
+                else:
+                    values = []
+
+            for value in values:
+                if value and value not in checkpoint:
+                    checkpoint.add(value)
+                    yield value
+
+            # Wait for the list to load new elements, if none do, the end has been reached
+            try:
+                WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+                    lambda driver: extract_last(driver, selector, field) != last_value
+                )
+            except TimeoutException:
+                if reopened and last_value is None:
+                    raise ListClosed(selector)  # it was opened again, but shows nothing
+                if resuming:
+                    raise ValueError(
+                        f'None of the values of the checkpoint "{checkpoint.key}" are in the '
+                        "list anymore."
+                    )
+
+                checkpoint.done = True
+                return
+    finally:
+        checkpoint.save()
+
+
+def iter_pages_checkpointed(
+    fetch_page: Callable[[str], tuple[list[str], str | None]],
+    checkpoint: ListCheckpoint = None,
+) -> Iterator[str]:
+    """
+    Yields the values of a paginated list, page by page, keeping the cursor of the page being
+    read in the checkpoint. Resuming fetches that page again and carries on from there: values
+    yielded before are skipped, and nothing before the page is read again.
+
+    Args:
+        fetch_page (Callable): Fetches the page at a cursor ("" for the first page), returning its values and the cursor of the next page (None after the last page).
+        checkpoint (ListCheckpoint, optional): Checkpoint to resume from and update. It is saved when the iteration ends or stops. Defaults to a new one.
+
+    Yields:
+        str: Each value of the list.
+    """
+    if checkpoint is None:
+        checkpoint = ListCheckpoint()
+    if checkpoint.done:
+        return
+    if checkpoint.cursor is None:
+        checkpoint.cursor = ""
+
+    try:
+        while True:
+            values, next_cursor = fetch_page(checkpoint.cursor)
+            for value in values:
+                if value and value not in checkpoint:
+                    checkpoint.add(value)
+                    yield value
+
+            # Every value of the page has been yielded, so resuming starts at the next one
+            if next_cursor is None:
+                checkpoint.done = True
+                return
+
+            checkpoint.cursor = next_cursor
+    finally:
+        checkpoint.save()
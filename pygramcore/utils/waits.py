@@ -0,0 +1,420 @@
+from dataclasses import dataclass
+from collections import deque
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import JavascriptException
+import threading, time, weakref
+
+from ..constants import IMPLICIT_WAIT
+from ..exceptions.navigation import ActionTimeout
+
+# Polls the conditions inside the browser, so a wait costs a single round trip no matter
+# how long it takes. Returns the index of the first condition that holds, or -1.
+_WAIT_SCRIPT = """
+const [conditions, timeout, done] = arguments;
+const started = Date.now();
+
+function holds([kind, value, negate]) {
+    let found;
+    if (kind === "all") {
+        found = value.every(holds);
+    } else if (kind === "any") {
+        found = value.some(holds);
+    } else if (kind === "text") {
+        const [selector, text] = value;
+        found = Array.from(document.querySelectorAll(selector)).some(
+            (element) => element.innerText.includes(text)
+        );
+    } else if (kind === "xpath") {
+        found = document.evaluate(
+            value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue !== null;
+    } else if (kind === "count") {
+        const [selector, count] = value;
+        found = document.querySelectorAll(selector).length > count;
+    } else if (kind === "url") {
+        found = window.location.href.includes(value);
+    } else {
+        found = document.querySelector(value) !== null;
+    }
+    return negate ? !found : found;
+}
+
+(function poll() {
+    const index = conditions.findIndex(holds);
+    if (index !== -1 || Date.now() - started >= timeout) {
+        done(index);
+    } else {
+        setTimeout(poll, 25);
+    }
+})();
+"""
+
+# Returns the elements matching a locator right away, without the implicit wait
+_FIND_SCRIPT = """
+const [kind, value] = arguments;
+if (kind === "xpath") {
+    const result = document.evaluate(
+        value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    return Array.from({ length: result.snapshotLength }, (_, i) => result.snapshotItem(i));
+}
+return Array.from(document.querySelectorAll(value));
+"""
+
+
+@dataclass(frozen=True)
+class Condition:
+    """
+    Something to wait for on the current page. Conditions can be combined with `&` (both
+    hold), `|` (either holds) and `~` (doesn't hold).
+
+    Args:
+        kind (str): "css", "xpath", "url", "text", "count", "all" or "any".
+        value (str | tuple): CSS selector, XPath, text the URL should contain, (selector, text) or (selector, count) pair, or conditions to combine.
+        negate (bool): Wait for the opposite (e.g. an element to disappear). Defaults to False.
+    """
+
+    kind: str
+    value: str | tuple
+    negate: bool = False
+
+    def __invert__(self) -> "Condition":
+        return Condition(self.kind, self.value, not self.negate)
+
+    def __and__(self, other: "Condition") -> "Condition":
+        return Condition("all", (self, other))
+
+    def __or__(self, other: "Condition") -> "Condition":
+        return Condition("any", (self, other))
+
+    def serialize(self) -> list:
+        value = self.value
+        if self.kind in ("all", "any"):
+            value = [condition.serialize() for condition in value]
+
+        return [self.kind, value, self.negate]
+
+
+def _kind(by: str) -> str:
+    if by == By.XPATH:
+        return "xpath"
+    if by == By.TAG_NAME or by == By.CSS_SELECTOR:
+        return "css"
+
+    raise ValueError(f'Waiting on "{by}" locators isn\'t supported.')
+
+
+def present(by: str, value: str) -> Condition:
+    """
+    Condition that holds when an element matching the locator is on the page.
+    """
+    return Condition(_kind(by), value)
+
+
+def absent(by: str, value: str) -> Condition:
+    """
+    Condition that holds when no element matching the locator is on the page.
+    """
+    return Condition(_kind(by), value, negate=True)
+
+
+def url_contains(text: str) -> Condition:
+    """
+    Condition that holds when the current URL contains the text.
+    """
+    return Condition("url", text)
+
+
+def text_present(selector: str, text: str) -> Condition:
+    """
+    Condition that holds when an element matching the CSS selector contains the text.
+    """
+    return Condition("text", (selector, text))
+
+
+def count_above(selector: str, count: int) -> Condition:
+    """
+    Condition that holds when more than `count` elements match the CSS selector.
+    """
+    return Condition("count", (selector, count))
+
+
+def count_present(driver: webdriver.Chrome, selector: str) -> int:
+    """
+    Returns the amount of elements currently matching the CSS selector.
+    """
+    return driver.execute_script(
+        "return document.querySelectorAll(arguments[0]).length;", selector
+    )
+
+
+# Script timeout last set on each driver, drivers start with Selenium's default
+_script_timeouts = weakref.WeakKeyDictionary()
+_DEFAULT_SCRIPT_TIMEOUT = 30
+
+
+def allow_script_time(driver: webdriver.Chrome, timeout: float) -> None:
+    """
+    Raises the driver's script timeout when an async script may run for `timeout` seconds, so
+    the driver doesn't abort it first. It's only changed when needed, and never lowered.
+    """
+    needed = timeout + 5  # for the round trip
+    if needed > _script_timeouts.get(driver, _DEFAULT_SCRIPT_TIMEOUT):
+        driver.set_script_timeout(needed)
+        _script_timeouts[driver] = needed
+
+
+def execute_wait_script(driver: webdriver.Chrome, script: str, timeout: float, *args):
+    """
+    Runs an async script that polls for up to `timeout` seconds and is passed the timeout in
+    milliseconds after `args`. When the page navigates while it runs (e.g. after submitting
+    a form), the browser drops the script, so it is run again on the new page for the time
+    left.
+    """
+    allow_script_time(driver, timeout)
+
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            return driver.execute_async_script(script, *args, timeout * 1000)
+        except JavascriptException as error:
+            timeout = deadline - time.perf_counter()
+            if "unloaded" not in str(error.msg) or timeout <= 0:
+                raise
+
+
+class Probe:
+    """
+    Learns how long a condition takes to hold when it does, so waits that end up failing can
+    give up as soon as the condition has become unlikely instead of after a fixed timeout.
+
+    Only waits that matched teach the timeout, so checks whose condition usually doesn't hold
+    (e.g. whether an account is private) should wait with `learn=False`.
+
+    Args:
+        name (str): Name of the probe.
+        percentile (float): Percentile of the observed latencies to base the timeout on. Defaults to 0.95.
+        margin (float): Factor applied to the percentile. Defaults to 2.
+        minimum (float): Lowest timeout in seconds. Defaults to 0.25.
+        min_samples (int): Successful waits required before the timeout is learned. Defaults to 5.
+        window (int): Amount of recent latencies kept. Defaults to 200.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        percentile: float = 0.95,
+        margin: float = 2,
+        minimum: float = 0.25,
+        min_samples: int = 5,
+        window: int = 200,
+    ):
+        self.name = name
+        self.percentile = percentile
+        self.margin = margin
+        self.minimum = minimum
+        self.min_samples = min_samples
+
+        self.calls = 0
+        self.hits = 0
+        self.waited = 0.0  # total seconds waited
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def get_timeout(self, default: float) -> float:
+        """
+        Returns the learned timeout, never above the default.
+
+        Args:
+            default (float): Timeout to use until enough latencies have been observed.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return default
+
+            latencies = sorted(self._latencies)
+
+        index = round(self.percentile * (len(latencies) - 1))
+        learned = latencies[index] * self.margin
+        return min(default, max(self.minimum, learned))
+
+    def record(self, elapsed: float, matched: bool) -> None:
+        """
+        Records the outcome of a wait.
+
+        Args:
+            elapsed (float): Seconds waited.
+            matched (bool): Whether the condition held.
+        """
+        with self._lock:
+            self.calls += 1
+            self.waited += elapsed
+            if matched:
+                self.hits += 1
+                self._latencies.append(elapsed)
+
+    def get_stats(self, default: float = IMPLICIT_WAIT) -> dict:
+        """
+        Returns:
+            dict: Calls, hits, total seconds waited, latency percentiles and the current timeout.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                "calls": self.calls,
+                "hits": self.hits,
+                "waited": self.waited,
+            }
+
+        percentile = lambda p: latencies[round(p * (len(latencies) - 1))] if latencies else None
+        stats["p50"] = percentile(0.5)
+        stats["p95"] = percentile(0.95)
+        stats["timeout"] = self.get_timeout(default)
+        return stats
+
+
+_probes: dict[str, Probe] = {}
+_probes_lock = threading.Lock()
+
+
+def get_probe(name: str) -> Probe:
+    """
+    Returns the probe with the given name, creating it if needed.
+    """
+    with _probes_lock:
+        if name not in _probes:
+            _probes[name] = Probe(name)
+
+        return _probes[name]
+
+
+def get_probe_stats() -> dict[str, dict]:
+    """
+    Returns:
+        dict[str, dict]: Stats of every probe by name (see `Probe.get_stats`).
+    """
+    with _probes_lock:
+        probes = list(_probes.values())
+
+    return {probe.name: probe.get_stats() for probe in probes}
+
+
+@dataclass(frozen=True)
+class WaitResult:
+    """
+    Outcome of a wait.
+
+    Args:
+        index (int | None): Index of the condition that held, None if none did in time.
+        elapsed (float): Seconds waited.
+    """
+
+    index: int | None
+    elapsed: float
+
+    def __bool__(self) -> bool:
+        return self.index is not None
+
+
+def wait_for_any(
+    driver: webdriver.Chrome,
+    *conditions: Condition,
+    timeout: float = IMPLICIT_WAIT,
+    probe: str = None,
+    learn: bool = True,
+) -> WaitResult:
+    """
+    Waits until any of the conditions holds, in a single round trip and without touching the
+    driver's implicit wait.
+
+    Args:
+        driver (webdriver.Chrome): Driver to wait on.
+        conditions (Condition): Conditions to wait for. The first one (in order) that holds wins.
+        timeout (float): Maximum seconds to wait. Defaults to `IMPLICIT_WAIT`.
+        probe (str, optional): Name of the probe that records this wait.
+        learn (bool): Whether the probe's learned timeout replaces the timeout. Defaults to True.
+
+    Returns:
+        WaitResult: Which condition held (if any) and how long it took.
+
+    Usage:
+    ```python
+    result = wait_for_any(
+        driver,
+        present(By.CSS_SELECTOR, "svg[aria-label='Like']"),
+        present(By.CSS_SELECTOR, "svg[aria-label='Unlike']"),
+        probe="post.is_liked",
+    )
+    is_liked = result.index == 1
+    ```
+    """
+    if probe is not None:
+        probe = get_probe(probe)
+        if learn:
+            timeout = probe.get_timeout(timeout)
+
+    started = time.perf_counter()
+    index = execute_wait_script(
+        driver, _WAIT_SCRIPT, timeout, [condition.serialize() for condition in conditions]
+    )
+    elapsed = time.perf_counter() - started
+
+    matched = index is not None and index >= 0
+    if probe is not None:
+        probe.record(elapsed, matched)
+
+    return WaitResult(index if matched else None, elapsed)
+
+
+def wait_for(
+    driver: webdriver.Chrome,
+    condition: Condition,
+    timeout: float = IMPLICIT_WAIT,
+    probe: str = None,
+    learn: bool = True,
+) -> WaitResult:
+    """
+    Waits until the condition holds. See `wait_for_any`.
+    """
+    return wait_for_any(driver, condition, timeout=timeout, probe=probe, learn=learn)
+
+
+def wait_for_completion(
+    driver: webdriver.Chrome,
+    *conditions: Condition,
+    action: str,
+    timeout: float,
+) -> WaitResult:
+    """
+    Waits for the signal that an action has completed, returning as soon as it does. The time
+    it took is recorded in the stats of the probe named after the action.
+
+    Args:
+        driver (webdriver.Chrome): Driver performing the action.
+        conditions (Condition): Signals of completion. The first one (in order) that holds wins.
+        action (str): Name of the action (e.g. "user.send_dm").
+        timeout (float): Maximum seconds to wait.
+
+    Returns:
+        WaitResult: Which signal held and how long it took.
+
+    Raises:
+        ActionTimeout: Raises when no signal held in time.
+    """
+    result = wait_for_any(
+        driver, *conditions, timeout=timeout, probe=action, learn=False
+    )
+    if not result:
+        raise ActionTimeout(action, timeout)
+
+    return result
+
+
+def find_present(driver: webdriver.Chrome, by: str, value: str) -> list[WebElement]:
+    """
+    Returns the elements currently matching the locator, without waiting for any to appear.
+    """
+    elements = driver.execute_script(_FIND_SCRIPT, _kind(by), value)
+    return elements
@@ -28,7 +28,7 @@ setup(
         "Programming Language :: Python :: Implementation :: CPython",
     ],
     keywords=["instagram", "instagram bot", "selenium", "automation", "bot"],
-    packages=find_packages(exclude=["docs", "tests"]),
-    install_requires=["selenium", "selenium-stealth"],
+    packages=find_packages(exclude=["docs", "tests", "benchmarks"]),
+    install_requires=["selenium>=4.6", "selenium-stealth>=1.0.6"],
     setup_requires=["setuptools>=38.6.0"],
 )
@@ -0,0 +1,69 @@
+from pygramcore import Account, Post, User
+from pygramcore.driver import DriverPool
+import pytest, threading
+
+
+class CookieDriver:
+    """
+    Stands in for a browser, keeping the cookies set through DevTools.
+    """
+
+    def __init__(self):
+        self.cookies = None
+
+    def execute_cdp_cmd(self, command: str, params: dict):
+        if command == "Network.setCookies":
+            self.cookies = [cookie["value"] for cookie in params["cookies"]]
+
+    def quit(self) -> None:
+        pass
+
+
+def make_account(name: str = None) -> Account:
+    account = Account(name)
+    account._pool = DriverPool(factory=CookieDriver)
+    return account
+
+
+@pytest.fixture
+def default_account():
+    previous = Account._default
+    Account._default = make_account()
+    yield Account._default
+    Account._default = previous
+
+
+class TestAccounts:
+    def test_own_browsers(self, default_account):
+        alice, bob = make_account("alice"), make_account("bob")
+
+        # Users and posts browse with the account they are bound to
+        assert alice.get_user("username")._driver is alice.get_instance()
+        assert Post("abc", bob)._driver is bob.get_instance()
+        assert alice.get_instance() is not bob.get_instance()
+
+        # Unbound ones, and calls on the class itself, use the default account
+        assert User("username")._driver is default_account.get_instance()
+        assert Account.get_instance() is default_account.get_instance()
+
+    def test_own_sessions(self):
+        alice, bob = make_account("alice"), make_account("bob")
+        alice.set_cookies([{"name": "sessionid", "value": "a"}])
+        bob.set_cookies([{"name": "sessionid", "value": "b"}])
+
+        assert alice.get_instance().cookies == ["a"]
+        assert bob.get_instance().cookies == ["b"]
+
+    def test_same_session_across_threads(self):
+        account = make_account("alice")
+        account._pool = DriverPool(size=2, factory=CookieDriver)
+        account.set_cookies([{"name": "sessionid", "value": "a"}])
+
+        # Every browser of the account gets its session when it is checked out
+        drivers = [account.get_instance()]
+        thread = threading.Thread(target=lambda: drivers.append(account.get_instance()))
+        thread.start()
+        thread.join()
+
+        assert drivers[0] is not drivers[1]
+        assert drivers[0].cookies == drivers[1].cookies == ["a"]
@@ -0,0 +1,87 @@
+from pygramcore import Account
+from pygramcore.aio import AsyncAccount, AsyncUser
+from pygramcore.driver import DriverPool
+from contextlib import aclosing
+import asyncio, pytest, threading
+
+
+def make_account(size: int = 2) -> Account:
+    # The functions run here don't use the browser
+    account = Account("alice")
+    account._pool = DriverPool(size=size, factory=object)
+    return account
+
+
+class TestAsyncAccount:
+    def test_one_thread_per_browser(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def work():
+            barrier.wait()  # only returns once both calls run at the same time
+            return threading.current_thread().name
+
+        async def main():
+            async with AsyncAccount(make_account(size=2)) as account:
+                return await asyncio.gather(account.run(work), account.run(work))
+
+        names = asyncio.run(main())
+        assert len(set(names)) == 2
+
+    def test_max_pending(self):
+        release = threading.Event()
+
+        async def main():
+            async with AsyncAccount(make_account(), workers=1, max_pending=2) as account:
+                tasks = [asyncio.create_task(account.run(release.wait)) for _ in range(3)]
+                await asyncio.sleep(0.1)
+
+                # The third call waits for a slot instead of being queued
+                assert account._workers[0].pending == 2
+
+                release.set()
+                return await asyncio.gather(*tasks)
+
+        assert asyncio.run(main()) == [True, True, True]
+
+    def test_iterate(self):
+        closed = threading.Event()
+
+        def iter_users(account: Account):
+            try:
+                for index in range(10):
+                    yield account.get_user(f"user{index}")
+            finally:
+                closed.set()
+
+        async def main():
+            async with AsyncAccount(make_account(size=2)) as account:
+                users = []
+                iteration = account.iterate(iter_users, account.account)
+                async with aclosing(iteration):
+                    async for user in iteration:
+                        users.append(user)
+
+                        # Other work runs on the browser that isn't iterating
+                        worker = next(worker for worker in account._workers if worker.iterating)
+                        name = lambda: threading.current_thread().name
+                        other = await account.run(name)
+                        assert other != await account.run(name, _worker=worker)
+
+                        if len(users) == 3:
+                            break
+
+                return users
+
+        users = asyncio.run(main())
+        assert [user.name for user in users] == ["user0", "user1", "user2"]
+        assert isinstance(users[0], AsyncUser)
+        assert closed.is_set()  # the iterator was closed on its browser
+
+    def test_closed(self):
+        async def main():
+            account = AsyncAccount(make_account())
+            await account.close()
+            await account.run(print)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(main())
@@ -0,0 +1,88 @@
+from pygramcore import Account
+from pygramcore.batch import Batch
+from pygramcore.driver import DriverPool
+from pygramcore.exceptions.navigation import PageNotFound
+import time
+
+
+class FakePage:
+    """
+    A user or post whose actions take the account's browser for a while and record what ran.
+    """
+
+    def __init__(self, account: Account, url: str, ran: list, found: bool = True):
+        self.account = account
+        self.url = url
+        self.ran = ran
+        self.found = found
+
+    def follow(self) -> str:
+        return self._act("follow")
+
+    def like(self) -> str:
+        return self._act("like")
+
+    def _act(self, action: str) -> str:
+        self.account.get_instance()
+        if not self.found:
+            raise PageNotFound(self.url)
+
+        time.sleep(0.02)
+        self.ran.append((self.url, action))
+        return action
+
+
+def make_account(size: int = 1) -> Account:
+    account = Account("alice")
+    account._pool = DriverPool(size=size, factory=object, timeout=5)
+    return account
+
+
+class TestBatch:
+    def test_groups_by_page(self):
+        account, ran = make_account(), []
+        first = FakePage(account, "https://www.instagram.com/first/", ran)
+        second = FakePage(account, "https://www.instagram.com/second", ran)
+
+        batch = Batch()
+        batch.add(first, "follow")
+        batch.add(second, "follow")
+        batch.add(first, "like")
+
+        # Actions on the same page run together, in the order they were added
+        assert [[action.method for action in group] for group in batch.plan()] == [
+            ["follow", "like"],
+            ["follow"],
+        ]
+
+        results = batch.run()
+        assert [result.value for result in results] == ["follow", "follow", "like"]
+        assert [url for url, _ in ran] == [first.url, first.url, second.url]
+
+    def test_page_not_found(self):
+        account, ran = make_account(), []
+        missing = FakePage(account, "https://www.instagram.com/missing/", ran, found=False)
+        other = FakePage(account, "https://www.instagram.com/other/", ran)
+
+        batch = Batch()
+        batch.add(missing, "follow")
+        batch.add(missing, "like")
+        batch.add(other, "like")
+        results = batch.run()
+
+        # The rest of the missing page's actions are skipped, the other pages still run
+        errors = [type(result.error) for result in results]
+        assert errors == [PageNotFound, PageNotFound, type(None)]
+        assert ran == [(other.url, "like")]
+
+    def test_more_workers_than_browsers(self):
+        account, ran = make_account(size=1), []
+
+        batch = Batch()
+        for index in range(6):
+            batch.add(FakePage(account, f"https://www.instagram.com/user{index}/", ran), "follow")
+
+        # Workers take turns on the only browser instead of waiting for each other forever
+        results = batch.run(workers=3)
+        assert all(result.ok for result in results), [result.error for result in results]
+        assert len(ran) == 6
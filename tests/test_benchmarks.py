@@ -0,0 +1,35 @@
+from benchmarks.run import compare, summarize
+from collections import Counter
+
+
+def call_stats(commands: int) -> dict:
+    # What the metrics record for a call, as far as the summary is concerned
+    return {
+        "commands_by_type": {"executeScript": commands},
+        "implicit_wait": 0.0,
+        "navigations": 1,
+    }
+
+
+class TestBenchmarks:
+    def test_summarize(self):
+        result = summarize([0.3, 0.1, 0.2], [call_stats(2), call_stats(4)], Counter())
+
+        assert result["latency"]["median"] == 0.2
+        assert result["commands"]["mean"] == 3
+        assert result["commands"]["by_type"] == {"executeScript": 3}
+
+    def test_unmeasured(self):
+        # Calls the metrics didn't record still get their latency compared
+        baseline = {"results": {"Account.verify_session": summarize([0.1], [], Counter())}}
+        current = {"results": {"Account.verify_session": summarize([0.2], [], Counter())}}
+
+        assert baseline["results"]["Account.verify_session"]["commands"] is None
+        assert compare(baseline, current, tolerance=0.25) == ["Account.verify_session"]
+        assert compare(baseline, baseline, tolerance=0.25) == []
+
+    def test_more_commands(self):
+        baseline = {"results": {"User.follow": summarize([0.1], [call_stats(3)], Counter())}}
+        current = {"results": {"User.follow": summarize([0.1], [call_stats(5)], Counter())}}
+
+        assert compare(baseline, current, tolerance=0.25) == ["User.follow"]
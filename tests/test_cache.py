@@ -0,0 +1,85 @@
+from pygramcore.cache import Cache, cached, get_cache, invalidate, set_cache
+import pytest, time
+
+
+class Page:
+    """
+    A page whose getters count how often they are read from the (fake) page.
+    """
+
+    url = "https://www.instagram.com/username/"
+    account = "alice"
+
+    def __init__(self):
+        self.reads = 0
+
+    @cached
+    def get_followers(self, limit: int = 25) -> list:
+        self.reads += 1
+        return [f"user{index}" for index in range(limit)]
+
+    @cached
+    def is_private(self) -> bool:
+        self.reads += 1
+        return False
+
+
+@pytest.fixture
+def cache():
+    previous = get_cache()
+    cache = Cache(max_size=3, ttls={"is_private": 0.05, "get_followers": None})
+    set_cache(cache)
+    yield cache
+    set_cache(previous)
+
+
+class TestCache:
+    def test_ttl(self, cache):
+        page = Page()
+        page.is_private()
+        page.is_private()
+        assert page.reads == 1
+
+        time.sleep(0.1)
+        page.is_private()
+        assert page.reads == 2
+
+        stats = cache.get_stats()["fields"]["is_private"]
+        assert (stats["hits"], stats["misses"], stats["expired"]) == (1, 2, 1)
+
+    def test_lru(self):
+        cache = Cache(max_size=2)
+        cache.set(("alice", "a", "field", ""), 1)
+        cache.set(("alice", "b", "field", ""), 2)
+
+        # Reading "a" makes "b" the least recently used
+        assert cache.get(("alice", "a", "field", "")) == 1
+        cache.set(("alice", "c", "field", ""), 3)
+
+        assert cache.get(("alice", "b", "field", "")) is None
+        assert cache.get(("alice", "a", "field", "")) == 1
+        assert len(cache) == 2 and cache.evictions == 1
+
+    def test_arguments(self, cache):
+        page = Page()
+        assert len(page.get_followers(limit=5)) == 5
+        assert len(page.get_followers(limit=10)) == 10
+        page.get_followers(limit=5)
+        assert page.reads == 2
+
+        # Invalidating a field drops it whatever the arguments
+        invalidate(page, "get_followers")
+        page.get_followers(limit=5)
+        page.get_followers(limit=10)
+        assert page.reads == 4
+
+    def test_off(self):
+        previous = get_cache()
+        set_cache(None)
+        try:
+            page = Page()
+            page.is_private()
+            page.is_private()
+            assert page.reads == 2
+        finally:
+            set_cache(previous)
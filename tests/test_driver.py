@@ -0,0 +1,148 @@
+from pygramcore.constants import IMPLICIT_WAIT
+from pygramcore.driver import DriverConfig, DriverPool, _claim_profile_dir, _release_profile_dir
+from pygramcore.exceptions.driver import PoolExhausted
+from pygramcore.pygram import Navigator
+from pygramcore.utils import waits
+import os, pytest, socket, subprocess, sys, threading
+
+
+class FakeDriver:
+    """
+    Stands in for a browser, only what the pool calls on its drivers.
+    """
+
+    def __init__(self):
+        self.implicit_wait = None
+        self.closed = False
+
+    def implicitly_wait(self, seconds: float) -> None:
+        if self.closed:
+            raise RuntimeError("The browser was closed.")
+
+        self.implicit_wait = seconds
+
+    def quit(self) -> None:
+        self.closed = True
+
+
+def lock_profile(profile_dir: str, pid: int) -> None:
+    os.makedirs(profile_dir, exist_ok=True)
+    os.symlink(f"{socket.gethostname()}-{pid}", os.path.join(profile_dir, "SingletonLock"))
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Chrome locks profiles with a symlink on Unix only")
+class TestProfileDirs:
+    def test_stale_lock(self, tmp_path):
+        # A browser that was killed leaves its lock behind
+        process = subprocess.Popen([sys.executable, "-c", ""])
+        process.wait()
+        lock_profile(str(tmp_path / "driver-0"), process.pid)
+
+        profile_dir = _claim_profile_dir(str(tmp_path))
+        _release_profile_dir(profile_dir)
+        assert profile_dir.endswith("driver-0")
+
+    def test_running_browser(self, tmp_path):
+        lock_profile(str(tmp_path / "driver-0"), os.getpid())
+
+        profile_dir = _claim_profile_dir(str(tmp_path))
+        _release_profile_dir(profile_dir)
+        assert profile_dir.endswith("driver-1")
+
+
+class TestDriverPool:
+    def test_thread_affinity(self):
+        pool = DriverPool(size=2, factory=FakeDriver)
+
+        # A thread gets the same driver until it releases it
+        with pool.session() as driver:
+            with pool.session() as nested:
+                assert nested is driver
+
+            other = []
+            thread = threading.Thread(target=lambda: other.append(pool.get()))
+            thread.start()
+            thread.join()
+            assert other[0] is not driver
+
+        # The other thread ended, so both drivers are idle again
+        assert len(pool) == 2
+        assert len(pool._idle) == 2
+
+    def test_timeout(self):
+        pool = DriverPool(size=1, factory=FakeDriver, timeout=0.1)
+        driver = pool.checkout()
+
+        with pytest.raises(PoolExhausted):
+            pool.checkout()
+
+        # Checking in resets what the borrower changed
+        driver.implicitly_wait(30)
+        pool.checkin(driver)
+        assert pool.checkout() is driver
+        assert driver.implicit_wait != 30
+
+    def test_waits_for_checkin(self):
+        pool = DriverPool(size=1, factory=FakeDriver)
+        driver = pool.checkout()
+
+        timer = threading.Timer(0.1, pool.checkin, [driver])
+        timer.start()
+        assert pool.checkout(timeout=5) is driver
+        timer.join()
+
+    def test_broken_driver(self):
+        pool = DriverPool(size=1, factory=FakeDriver)
+        driver = pool.checkout()
+        driver.quit()
+
+        # A crashed browser is replaced instead of handed out again
+        pool.checkin(driver)
+        assert len(pool) == 0
+        assert pool.checkout() is not driver
+
+    def test_prespawn_error(self):
+        def factory():
+            raise RuntimeError("chromedriver not found")
+
+        pool = DriverPool(size=1, factory=factory, prespawn=1)
+
+        # The error isn't lost in the background thread
+        with pytest.raises(RuntimeError):
+            pool.checkout(timeout=5)
+
+
+class LoadingDriver:
+    """
+    Loads pages with a page load strategy, recording how long the page-found check waits.
+    """
+
+    def __init__(self, strategy: str):
+        self.caps = {"pageLoadStrategy": strategy}
+        self.timeouts = []
+
+    def set_script_timeout(self, seconds: float) -> None:
+        pass
+
+    def execute_async_script(self, script: str, conditions: list, timeout: float):
+        self.timeouts.append(timeout / 1000)
+        return 1  # the content has rendered
+
+
+class TestDriverConfig:
+    def test_unknown_resource(self):
+        assert DriverConfig(block={"images", "trackers"}).block == {"images", "trackers"}
+
+        with pytest.raises(ValueError):
+            DriverConfig(block={"images", "scripts"})
+
+    def test_page_load_strategy(self, monkeypatch):
+        monkeypatch.setattr(waits, "_probes", {})  # timeouts learned by other tests
+
+        # Navigating returns before the content renders, so it is waited on for longer
+        normal, eager = LoadingDriver("normal"), LoadingDriver("eager")
+        for driver in (normal, eager):
+            Navigator._check_page_found(driver, "header section")
+
+        assert normal.timeouts == [1]
+        assert eager.timeouts == [IMPLICIT_WAIT]
@@ -0,0 +1,102 @@
+from pygramcore import Account, User
+from pygramcore.driver import DriverPool
+import time
+
+PROFILE_URL = "https://www.instagram.com/username"
+
+
+class GridDriver:
+    """
+    Shows the profile's grid of `total` posts without a browser. Like Instagram's, the grid only
+    keeps the last `window` loaded posts, and scrolling to the last one loads `step` more.
+    """
+
+    def __init__(self, total: int = 12, step: int = 3, window: int = 6):
+        self.current_url = "about:blank"
+        self.links = [f"/p/post{index}/" for index in range(total)]
+        self.step, self.window = step, window
+        self.loaded = step
+        self.reads = 0
+        self.caps = {}
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+        self.loaded = self.step
+
+    def visible(self) -> list[str]:
+        if self.current_url.rstrip("/") != PROFILE_URL:
+            return []
+
+        return self.links[max(0, self.loaded - self.window) : self.loaded]
+
+    def execute_script(self, script: str, *args):
+        if not args:
+            return [self.current_url, self.current_url]  # the page's identity
+
+        if isinstance(args[1], list):  # every link, read with `extract_all`
+            self.reads += 1
+            links = [{"href": f"https://www.instagram.com{link}"} for link in self.visible()]
+            if args[3]:
+                self.loaded = min(self.loaded + self.step, len(self.links))
+            return links
+
+        visible = self.visible()  # the last link, read with `extract_last`
+        return f"https://www.instagram.com{visible[-1]}" if visible else None
+
+    def execute_async_script(self, script: str, *args):
+        if isinstance(args[0], list):
+            return -1  # waits on conditions: the page was found and isn't private
+
+        return {
+            "posts": str(len(self.links)),
+            "followers": "0",
+            "following": "0",
+            "is_private": False,
+            "is_following": None,
+            "title": None,
+            "bio": None,
+        }
+
+    def quit(self) -> None:
+        pass
+
+
+def make_account(**grid) -> tuple[Account, GridDriver]:
+    account = Account("test")
+    account._pool = DriverPool(factory=lambda: GridDriver(**grid))
+    account._logged_in, account._verified_at = True, time.monotonic()
+    return account, account.get_instance()
+
+
+class TestGrid:
+    def test_one_read_per_pass(self):
+        account, driver = make_account(total=12, step=3)
+        posts = User("username", account).get_posts(limit=12)
+
+        # The links of the whole grid are read in one script call per scroll, not per post
+        assert [post.id for post in posts] == [f"post{index}" for index in range(12)]
+        assert driver.reads == 4
+
+    def test_streaming(self):
+        account, driver = make_account(total=12, step=3)
+        posts = User("username", account).iter_posts()
+
+        # Posts are yielded as soon as the first rows are read
+        assert next(posts).id == "post0"
+        assert driver.reads == 1
+
+        # Using the driver elsewhere loads the profile again, seen posts aren't repeated
+        driver.get("https://www.instagram.com/other/")
+        assert driver.visible() == []
+        started = time.monotonic()
+        assert [post.id for post in posts] == [f"post{index}" for index in range(1, 12)]
+
+        # The profile's count tells the end, the iteration doesn't wait for more rows
+        assert time.monotonic() - started < 1
+
+    def test_end_without_count(self):
+        account, driver = make_account(total=5, step=3)
+
+        # Without reels the count can't tell the end, the grid stops loading instead
+        posts = list(User("username", account).iter_posts(reels=False, timeout=0.3))
+        assert [post.id for post in posts] == [f"post{index}" for index in range(5)]
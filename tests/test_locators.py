@@ -0,0 +1,75 @@
+from pygramcore.exceptions.navigation import ElementNotFound
+from pygramcore.locators import Locator
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+import pytest
+
+
+class MarkupDriver:
+    """
+    Runs the locate script against a fixed set of selectors that match, without a browser.
+    """
+
+    def __init__(self, *matching: str):
+        self.matching = set(matching)
+        self.timeouts = []
+
+    def execute_async_script(self, script: str, selectors: list, timeout: float):
+        self.timeouts.append(timeout / 1000)
+        for index, (kind, value) in enumerate(selectors):
+            if value in self.matching:
+                return [index, [value]]
+
+        return [-1, []]
+
+
+class TestLocators:
+    def test_fallback_wins(self):
+        locator = Locator(
+            "user.unfollow",
+            (By.CSS_SELECTOR, "div:nth-child(8)"),
+            (By.XPATH, "//div[normalize-space()='Unfollow']"),
+        )
+        driver = MarkupDriver("//div[normalize-space()='Unfollow']")
+
+        for _ in range(3):
+            assert locator.find(driver) == "//div[normalize-space()='Unfollow']"
+
+        # The fallback keeps matching, so it's tried first from then on
+        assert [selector.by for selector in locator.ordered()] == [By.XPATH, By.CSS_SELECTOR]
+
+        stats = locator.get_stats()
+        assert stats["lookups"] == 3
+        assert stats["selectors"][0]["hit_rate"] == 1
+        assert stats["selectors"][1]["hits"] == 0
+
+    def test_fails_fast(self):
+        locator = Locator("post.like", (By.CSS_SELECTOR, "span.xp7jhwk > div"), learn=True)
+
+        for _ in range(10):
+            locator.find(MarkupDriver("span.xp7jhwk > div"), timeout=10)
+
+        # Once the selector stops matching, the lookup gives up long before the timeout
+        driver = MarkupDriver()
+        with pytest.raises(ElementNotFound):
+            locator.find(driver, timeout=10)
+
+        assert driver.timeouts[-1] < 10
+        assert locator.get_stats()["failures"] == 1
+
+        # Existing handlers of Selenium's exception keep working
+        with pytest.raises(NoSuchElementException):
+            locator.find(driver, timeout=10)
+
+    def test_waits_full_timeout(self):
+        # Elements that show up after an action don't learn a timeout
+        locator = Locator("create.share", (By.XPATH, "//div[normalize-space()='Share']"))
+
+        for _ in range(10):
+            locator.find(MarkupDriver("//div[normalize-space()='Share']"), timeout=10)
+
+        driver = MarkupDriver()
+        with pytest.raises(ElementNotFound):
+            locator.find(driver, timeout=10)
+
+        assert driver.timeouts[-1] == 10
@@ -0,0 +1,67 @@
+from pygramcore import Account, Post
+from pygramcore.driver import DriverPool
+from pygramcore.elements.post import Media
+import time
+
+# Slides of a carousel as read from the data embedded in the page
+SLIDES = [
+    {"url": "https://cdn.example/1.jpg", "type": "image", "width": 1080, "height": 1350},
+    {"url": "https://cdn.example/2.mp4", "type": "video", "width": 720, "height": 1280},
+    {"url": "https://cdn.example/3.jpg", "type": "image", "width": None, "height": None},
+]
+
+
+class MediaDriver:
+    """
+    Loads pages without a browser and answers the media script with `slides`.
+    """
+
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.slides = SLIDES
+        self.reads = 0
+        self.caps = {}
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+
+    def execute_script(self, script: str, *args):
+        if not args:
+            return [self.current_url, "0"]  # the page's identity
+
+        self.reads += 1
+        return self.slides
+
+    def execute_async_script(self, script: str, *args):
+        return -1  # the page was found
+
+    def quit(self) -> None:
+        pass
+
+
+def make_account() -> tuple[Account, MediaDriver]:
+    account = Account("test")
+    account._pool = DriverPool(factory=MediaDriver)
+    account._logged_in, account._verified_at = True, time.monotonic()
+    return account, account.get_instance()
+
+
+class TestMedia:
+    def test_carousel(self):
+        account, driver = make_account()
+        media = Post("carousel", account).get_media()
+
+        # Every slide is read at once, without clicking through the carousel
+        assert driver.reads == 1
+        assert media == [
+            Media("https://cdn.example/1.jpg", "image", 1080, 1350),
+            Media("https://cdn.example/2.mp4", "video", 720, 1280),
+            Media("https://cdn.example/3.jpg", "image"),
+        ]
+
+    def test_images(self):
+        account, driver = make_account()
+
+        # One URL per slide, videos included
+        urls = Post("images", account).get_images()
+        assert urls == [slide["url"] for slide in SLIDES]
@@ -0,0 +1,121 @@
+from pygramcore import Account
+from pygramcore.driver import DriverPool
+from pygramcore.metrics import Metrics, instrument_driver, record_calls, set_metrics
+from selenium.webdriver.remote.command import Command
+import pytest
+
+
+class CommandDriver:
+    """
+    Answers every WebDriver command with nothing.
+    """
+
+    def execute(self, driver_command: str, params: dict = None) -> dict:
+        return {"value": None}
+
+
+class SessionDriver:
+    """
+    Holds a session cookie, away from Instagram's pages.
+    """
+
+    current_url = "about:blank"
+
+    def get_cookies(self) -> list[dict]:
+        return [{"name": "sessionid", "value": "abc"}]
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    set_metrics(metrics)
+    yield metrics
+    set_metrics(None)
+
+
+class TestMetrics:
+    def test_nested_calls(self, metrics):
+        driver = CommandDriver()
+        instrument_driver(driver)
+        driver.execute(Command.SET_TIMEOUTS, {"implicit": 10_000})
+
+        def is_following():
+            driver.execute(Command.FIND_ELEMENT, {"using": "css selector", "value": "button"})
+            return True
+
+        def unfollow():
+            driver.execute(Command.GET, {"url": "https://www.instagram.com/username/"})
+            if not is_following():
+                raise ValueError()
+            driver.execute(Command.W3C_EXECUTE_SCRIPT, {"script": "", "args": []})
+
+        is_following = record_calls(is_following, "User.is_following")
+        unfollow = record_calls(unfollow, "User.unfollow")
+        unfollow()
+
+        # Everything done within unfollow counts towards unfollow
+        stats = metrics.get_stats()
+        assert list(stats) == ["User.unfollow"]
+        assert stats["User.unfollow"]["calls"] == 1
+        assert stats["User.unfollow"]["commands"] == 3
+        assert stats["User.unfollow"]["commands_by_type"][Command.FIND_ELEMENT] == 1
+        assert stats["User.unfollow"]["nested_calls"] == {"User.is_following": 1}
+        assert stats["User.unfollow"]["navigations"] == 1
+        assert stats["User.unfollow"]["implicit_wait"] > 0
+
+    def test_errors_and_generators(self, metrics):
+        driver = CommandDriver()
+        instrument_driver(driver)
+
+        def get_author():
+            raise LookupError()
+
+        def iter_posts():
+            for shortcode in ["a", "b", "c"]:
+                driver.execute(Command.W3C_EXECUTE_SCRIPT, {"script": "", "args": []})
+                yield shortcode
+
+        get_author = record_calls(get_author, "Post.get_author")
+        iter_posts = record_calls(iter_posts, "User.iter_posts")
+
+        with pytest.raises(LookupError):
+            get_author()
+
+        # The call counts even when the generator isn't iterated
+        iter_posts()
+        assert metrics.get_stats()["User.iter_posts"]["calls"] == 1
+
+        posts = iter_posts()
+        assert next(posts) == "a"
+        assert next(posts) == "b"
+        posts.close()
+
+        stats = metrics.get_stats()
+        assert stats["Post.get_author"]["errors"] == {"LookupError": 1}
+        assert stats["User.iter_posts"]["calls"] == 2
+        assert stats["User.iter_posts"]["commands"] == 2
+
+        exported = metrics.to_openmetrics()
+        assert 'pygramcore_method_errors_total{method="Post.get_author",exception="LookupError"} 1' in exported
+        assert exported.endswith("# EOF\n")
+
+    def test_off(self):
+        driver = CommandDriver()
+        instrument_driver(driver)
+
+        calls = record_calls(lambda: driver.execute(Command.GET, {"url": ""}), "User.follow")
+        assert calls() == {"value": None}
+
+    def test_methods_without_navigation(self, metrics):
+        account = Account("alice")
+        account._pool = DriverPool(factory=SessionDriver)
+        account._logged_in = True
+
+        # Methods that don't load a page are recorded too
+        assert account.is_logged_in()
+        assert account.verify_session()
+
+        stats = metrics.get_stats()
+        assert stats["Account.is_logged_in"]["nested_calls"]["Account.verify_session"] == 1
+        assert stats["Account.verify_session"]["calls"] == 1
+        assert stats["Account.verify_session"]["navigations"] == 0
@@ -0,0 +1,93 @@
+from pygramcore.pygram import Account, Navigator
+from pygramcore.driver import DriverPool
+from pygramcore.exceptions.navigation import PageNotFound
+from pygramcore.utils.navigation import navigate
+import itertools, pytest
+
+
+class PageDriver:
+    """
+    Loads pages without a browser, each load being a new document. Pages under "/missing"
+    show Instagram's "not found" text.
+    """
+
+    documents = itertools.count()
+
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.document = next(self.documents)
+        self.loads = 0
+        self.checks = 0
+        self.caps = {}
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+        self.document = next(self.documents)
+        self.loads += 1
+
+    def refresh(self) -> None:
+        self.get(self.current_url)
+
+    def execute_script(self, script: str, *args):
+        return [self.current_url, str(self.document)]
+
+    def execute_async_script(self, script: str, *args):
+        self.checks += 1
+        return 0 if "/missing" in self.current_url else -1
+
+    def quit(self) -> None:
+        pass
+
+
+class Page(metaclass=Navigator):
+    def __init__(self, url: str, account: Account):
+        self.url = url
+        self.account = account
+
+    def read(self) -> str:
+        return self.url
+
+    def act(self) -> str:
+        return self.read()
+
+
+def make_account() -> tuple[Account, PageDriver]:
+    account = Account("test")
+    account._pool = DriverPool(factory=PageDriver)
+    return account, account.get_instance()
+
+
+class TestNavigation:
+    def test_trailing_slash(self):
+        driver = PageDriver()
+        first = navigate(driver, "https://www.instagram.com/username")
+
+        # Instagram adds the slash, the page isn't loaded again for it
+        driver.current_url = "https://www.instagram.com/username/"
+        assert navigate(driver, "https://www.instagram.com/username")[1] == first[1]
+        assert driver.loads == 1
+
+    def test_checked_once_per_load(self):
+        account, driver = make_account()
+        page = Page("https://www.instagram.com/username/", account)
+
+        page.read()
+        page.act()
+        page.read()
+        assert (driver.loads, driver.checks) == (1, 1)
+
+        # A new load of the same page is checked again
+        driver.refresh()
+        page.read()
+        assert (driver.loads, driver.checks) == (2, 2)
+
+    def test_missing_page(self):
+        account, driver = make_account()
+        missing = Page("https://www.instagram.com/missing/", account)
+
+        # Missing pages aren't remembered as checked, every call raises
+        for _ in range(2):
+            with pytest.raises(PageNotFound):
+                missing.read()
+
+        assert driver.checks == 2
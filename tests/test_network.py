@@ -0,0 +1,142 @@
+from pygramcore import Account, User
+from pygramcore.cache import Cache, set_cache
+from pygramcore.driver import DriverPool
+from pygramcore.locators import _LOCATE_SCRIPT
+from pygramcore.network import NetworkCapture, attach_capture, find_post, find_user, parse_body
+from datetime import datetime
+import itertools, json, os, time
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "network")
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as file:
+        return file.read()
+
+
+class RecordedDriver:
+    """
+    Replays a recorded performance log and the bodies of its responses.
+    """
+
+    def __init__(self, recording: str):
+        recording = json.loads(load_fixture(recording))
+        self.log = recording["log"]
+        self.bodies = recording["bodies"]
+        self.commands = []
+
+    def get_log(self, kind: str) -> list[dict]:
+        log, self.log = self.log, []
+        return log
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        self.commands.append((command, params))
+        return {"body": load_fixture(self.bodies[params["requestId"]])}
+
+
+class FollowButton:
+    def __init__(self, driver: "ProfileDriver"):
+        self.driver = driver
+
+    def click(self) -> None:
+        self.driver.following = True
+
+    def get_attribute(self, name: str) -> str:
+        return "_acan _acap _acat" if self.driver.following else "_acan _acap _acas"
+
+
+class ProfileDriver:
+    """
+    Loads a profile whose API response says it isn't followed, with a working follow button.
+    """
+
+    documents = itertools.count()
+
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.document = next(self.documents)
+        self.following = False
+        self.log = []
+        self.caps = {}
+
+        profile = json.loads(load_fixture("web_profile_info.json"))
+        profile["data"]["user"]["followed_by_viewer"] = False
+        self.body = json.dumps(profile)
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+        self.document = next(self.documents)
+        self.log = json.loads(load_fixture("profile_page.json"))["log"]
+
+    def execute_script(self, script: str, *args):
+        return [self.current_url, str(self.document)]
+
+    def execute_async_script(self, script: str, *args):
+        if script == _LOCATE_SCRIPT:
+            return [0, [FollowButton(self)]]
+        return 1  # the profile rendered
+
+    def get_log(self, kind: str) -> list[dict]:
+        log, self.log = self.log, []
+        return log
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        return {"body": self.body}
+
+    def quit(self) -> None:
+        pass
+
+
+class TestNetwork:
+    def test_find_user(self):
+        payload = parse_body(load_fixture("web_profile_info.json"))
+
+        profile = find_user(payload, "example")
+        assert profile["followers"] == 1520334
+        assert profile["following"] == 512
+        assert profile["total_posts"] == 4821
+        assert profile["is_following"] is True
+        assert profile["is_private"] is False
+        assert profile["full_name"] == "Example Profile"
+
+        assert find_user(payload, "someone_else") is None
+
+    def test_find_post(self):
+        payload = parse_body("for (;;);" + load_fixture("media_web_info.json"))
+
+        post = find_post(payload, "C5ZiDVruR2f")
+        assert post["likes"] == 48213
+        assert post["author"] == "example"
+        assert post["date_posted"] == datetime(2024, 3, 31)
+        assert post["is_liked"] is False
+
+        assert find_post(payload, "other") is None
+
+    def test_capture(self):
+        driver = RecordedDriver("profile_page.json")
+        capture = NetworkCapture(driver)
+
+        profile = capture.find(lambda payload: find_user(payload, "example"), timeout=0)
+        assert profile["followers"] == 1520334
+
+        # Only the JSON response of the API is fetched, not the document or trackers
+        assert driver.commands == [("Network.getResponseBody", {"requestId": "2"})]
+
+        capture.clear()
+        assert capture.find(lambda payload: find_user(payload, "example"), timeout=0) is None
+
+    def test_action_refreshes_network_data(self):
+        account = Account("network")
+        account._pool = DriverPool(factory=ProfileDriver)
+        account._logged_in, account._verified_at = True, time.monotonic()
+        attach_capture(account.get_instance())
+
+        set_cache(Cache())
+        try:
+            user = User("example", account)
+            user.follow()
+
+            # What the page fetched before following is out of date, so the button is read
+            assert user.is_following()
+        finally:
+            set_cache(None)
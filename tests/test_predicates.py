@@ -0,0 +1,111 @@
+from pygramcore.pygram import Account, Navigator, changes, predicate
+from pygramcore.driver import DriverPool
+import itertools
+
+
+class PageDriver:
+    """
+    Loads pages without a browser, each load being a new document.
+    """
+
+    documents = itertools.count()
+
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.document = next(self.documents)
+        self.loads = 0
+        self.scripts = 0
+        self.caps = {}
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+        self.document = next(self.documents)
+        self.loads += 1
+
+    def refresh(self) -> None:
+        self.get(self.current_url)
+
+    def execute_script(self, script: str, *args):
+        self.scripts += 1
+        return [self.current_url, str(self.document)]
+
+    def execute_async_script(self, script: str, *args):
+        return -1  # no "not found" text
+
+    def quit(self) -> None:
+        pass
+
+
+class Profile(metaclass=Navigator):
+    def __init__(self, name: str, account: Account):
+        self.url = f"https://www.instagram.com/{name}/"
+        self.account = account
+        self.checks = 0
+
+    @predicate
+    def is_following(self) -> bool:
+        self.checks += 1
+        return True
+
+    def unfollow(self) -> None:
+        # Like `check_following` and `user_dialog_action`, which check it twice
+        assert self.is_following()
+        assert self.is_following()
+        self._open_dialog()
+
+    @changes("is_following")
+    def follow(self) -> None:
+        pass
+
+    def _open_dialog(self) -> None:
+        pass
+
+
+def make_account() -> tuple[Account, PageDriver]:
+    account = Account("test")
+    account._pool = DriverPool(factory=PageDriver)
+    return account, account.get_instance()
+
+
+class TestPredicates:
+    def test_remembered_per_page_load(self):
+        account, driver = make_account()
+        profile = Profile("username", account)
+
+        profile.unfollow()
+        assert profile.checks == 1
+
+        # Nested calls on the same page don't navigate or check the page again, only the
+        # outer call reads the page's identity (before and after loading it)
+        assert driver.loads == 1
+        assert driver.scripts == 2
+
+        # Same page, same document
+        profile.is_following()
+        assert profile.checks == 1
+
+        driver.refresh()
+        profile.is_following()
+        assert profile.checks == 2
+
+    def test_forgotten_after_action(self):
+        account, driver = make_account()
+        profile = Profile("username", account)
+
+        profile.is_following()
+        profile.follow()
+        profile.is_following()
+        assert profile.checks == 2
+
+    def test_other_pages(self):
+        account, driver = make_account()
+        profile = Profile("username", account)
+        other = Profile("other", account)
+
+        profile.is_following()
+        other.is_following()
+        profile.is_following()
+
+        assert profile.checks == 2
+        assert other.checks == 1
+        assert driver.loads == 3
@@ -0,0 +1,76 @@
+from pygramcore import Account, User
+from pygramcore.driver import DriverPool
+from selenium.common.exceptions import NoSuchElementException
+import pytest, time
+
+HEADER = {
+    "posts": "1,024",
+    "followers": "2,345,678",
+    "following": "312",
+    "is_private": False,
+    "is_following": True,
+    "title": "Some Name (@username) • Instagram photos and videos",
+    "bio": "Photos of things",
+}
+
+
+class ProfileDriver:
+    """
+    Loads pages without a browser and answers the profile script with `header`.
+    """
+
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.header = HEADER
+        self.reads = 0
+        self.caps = {}
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+
+    def execute_script(self, script: str, *args):
+        return [self.current_url, "0"]
+
+    def execute_async_script(self, script: str, *args):
+        if isinstance(args[0], list):
+            return -1  # waits on conditions, only the "not found" check runs here
+
+        self.reads += 1
+        return self.header
+
+    def quit(self) -> None:
+        pass
+
+
+def make_account() -> tuple[Account, ProfileDriver]:
+    account = Account("test")
+    account._pool = DriverPool(factory=ProfileDriver)
+    account._logged_in, account._verified_at = True, time.monotonic()
+    return account, account.get_instance()
+
+
+class TestProfile:
+    def test_snapshot(self):
+        account, driver = make_account()
+        profile = User("username", account).get_profile()
+
+        # Every fact comes from a single read of the header
+        assert driver.reads == 1
+        assert (profile.total_posts, profile.followers, profile.following) == (1024, 2345678, 312)
+        assert profile.full_name == "Some Name" and profile.bio == "Photos of things"
+        assert profile.is_following and not profile.is_private
+
+    def test_counts(self):
+        account, driver = make_account()
+        user = User("counts", account)
+
+        assert user.get_total_posts() == 1024
+        assert user.get_followers() == 2345678
+        assert driver.reads == 2
+
+    def test_missing_header(self):
+        account, driver = make_account()
+        driver.header = None
+
+        with pytest.raises(NoSuchElementException):
+            User("username", account).get_profile()
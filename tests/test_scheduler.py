@@ -0,0 +1,147 @@
+from pygramcore import Account
+from pygramcore.driver import DriverPool
+from pygramcore.exceptions.navigation import ActionBlocked
+from pygramcore.scheduler import BULK, INTERACTIVE, Scheduler, TokenBucket
+import pytest, threading, time
+
+
+class DialogDriver:
+    """
+    Shows Instagram's "Try Again Later" dialog while `blocked` is set.
+    """
+
+    def __init__(self):
+        self.blocked = False
+
+    def execute_script(self, script: str, *args) -> list:
+        return ["dialog"] if self.blocked else []
+
+
+class FakeUser:
+    """
+    A user whose actions only record the order they ran in.
+    """
+
+    def __init__(self, account: Account, ran: list):
+        self.account = account
+        self.ran = ran
+        self._driver = DialogDriver()
+
+    def follow(self, name: str) -> str:
+        self.ran.append((time.monotonic(), name))
+        return name
+
+    def get_profile(self, name: str) -> str:
+        return self.follow(name)
+
+
+class TestTokenBucket:
+    def test_burst_and_refill(self):
+        bucket = TokenBucket(rate=2, burst=2)
+        now = bucket._updated
+
+        # The burst is available right away, then a token every half second
+        bucket.take(now)
+        bucket.take(now)
+        assert bucket.ready_in(now) == pytest.approx(0.5)
+        assert bucket.ready_in(now + 0.25) == pytest.approx(0.25)
+        assert bucket.ready_in(now + 10) == 0
+
+        # Refilling never goes over the burst
+        bucket.take(now + 10)
+        bucket.take(now + 10)
+        assert bucket.ready_in(now + 10) == pytest.approx(0.5)
+
+    def test_slowdown_and_pause(self):
+        bucket = TokenBucket(rate=1)
+        now = bucket._updated
+        bucket.take(now)
+
+        bucket.slowdown = 4
+        assert bucket.ready_in(now) == pytest.approx(4)
+
+        bucket.paused_until = now + 60
+        assert bucket.ready_in(now + 10) == pytest.approx(50)
+
+
+class TestScheduler:
+    def test_priority(self):
+        ran = []
+        user = FakeUser(Account("alice"), ran)
+        started, release = threading.Event(), threading.Event()
+
+        def busy():
+            started.set()
+            release.wait(5)
+
+        with Scheduler(limits={}) as scheduler:
+            # Keep the only worker busy while the rest is queued
+            scheduler.submit(busy, "__call__")
+            started.wait(5)
+
+            futures = [scheduler.submit(user, "follow", f"bulk{index}") for index in range(3)]
+            futures.append(
+                scheduler.submit(user, "get_profile", "interactive", priority=INTERACTIVE)
+            )
+            assert scheduler.get_stats()["queued"] == {BULK: 3, INTERACTIVE: 1}
+            release.set()
+
+            assert [future.result(5) for future in futures][-1] == "interactive"
+
+        assert [name for _, name in ran] == ["interactive", "bulk0", "bulk1", "bulk2"]
+
+    def test_rate_limit(self):
+        ran = []
+        user = FakeUser(Account("alice"), ran)
+
+        # 10 follows per second, one at a time
+        with Scheduler(limits={"follow": (10, 1, 1)}) as scheduler:
+            for future in [scheduler.submit(user, "follow", str(index)) for index in range(4)]:
+                future.result(5)
+
+        times = [at for at, _ in ran]
+        gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+        assert min(gaps) >= 0.09
+
+    def test_block(self):
+        account = Account("alice")
+        user = FakeUser(account, [])
+        user._driver.blocked = True
+
+        with Scheduler(limits={"follow": (10, 1, 1)}, cooldown=0.3) as scheduler:
+            with pytest.raises(ActionBlocked):
+                scheduler.submit(user, "follow", "a").result(5)
+
+            stats = scheduler.get_stats()["actions"]["alice/follow"]
+            assert stats["blocks"] == 1
+            assert stats["slowdown"] == 2
+            assert stats["paused_for"] > 0
+
+            # The action waits out the pause, then speeds back up as it succeeds
+            user._driver.blocked = False
+            started = time.monotonic()
+            scheduler.submit(user, "follow", "b").result(5)
+            assert time.monotonic() - started >= 0.2
+
+            stats = scheduler.get_stats()["actions"]["alice/follow"]
+            assert stats["slowdown"] == pytest.approx(1.8)
+
+    def test_more_workers_than_browsers(self):
+        account = Account("alice")
+        account._pool = DriverPool(size=1, factory=object, timeout=5)
+        ran = []
+
+        class BrowsingUser(FakeUser):
+            def follow(self, name: str) -> str:
+                self.account.get_instance()
+                time.sleep(0.02)
+                return super().follow(name)
+
+        # Workers take turns on the only browser instead of waiting for each other forever
+        with Scheduler(limits={}, workers=2) as scheduler:
+            user = BrowsingUser(account, ran)
+            futures = [scheduler.submit(user, "follow", f"user{index}") for index in range(4)]
+            for future in futures:
+                future.result(10)
+
+        assert len(ran) == 4
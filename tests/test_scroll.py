@@ -0,0 +1,175 @@
+from pygramcore.exceptions.navigation import ListClosed
+from pygramcore.utils.extract import _EXTRACT_SCRIPT
+from pygramcore.utils.scroll import (
+    _READ_AFTER_SCRIPT,
+    ListCheckpoint,
+    ScrollProgress,
+    iter_pages_checkpointed,
+    iter_scroll_checkpointed,
+    iter_scroll_values,
+)
+from itertools import islice
+import pytest
+
+
+class ListDriver:
+    """
+    Shows a lazily loaded list without a browser: scrolling to its end loads a page more.
+    The list can be closed, as a dialog is when the driver is used elsewhere, and opened again.
+    """
+
+    def __init__(self, values: list[str], page: int = 12):
+        self.values = values
+        self.page = page
+        self.read = 0  # values sent back to Python
+        self.open()
+
+    def open(self) -> None:
+        self.shown = True
+        self.loaded = min(self.page, len(self.values))
+
+    def close(self) -> None:
+        self.shown = False
+
+    def execute_script(self, script: str, selector: str, field, *args):
+        loaded = self.values[: self.loaded] if self.shown else []
+        if script == _EXTRACT_SCRIPT:
+            self._scroll()
+            return [{field[0]: value} for value in loaded]
+        if script != _READ_AFTER_SCRIPT:
+            return loaded[-1] if loaded else None
+
+        after = args[0]
+        start = loaded.index(after) + 1 if after in loaded else 0
+        self._scroll()
+        self.read += len(loaded) - start
+        return loaded[start:]
+
+    def _scroll(self) -> None:
+        if self.shown:
+            self.loaded = min(self.loaded + self.page, len(self.values))
+
+
+class TestListCheckpoint:
+    def test_resume(self, tmp_path):
+        values = [f"user{index}" for index in range(100)]
+        path = str(tmp_path / "followers.json")
+
+        checkpoint = ListCheckpoint.load(path, key="username/followers", window=20)
+        driver = ListDriver(values)
+        iteration = iter_scroll_checkpointed(driver, "span", checkpoint=checkpoint, timeout=0.1)
+        first = list(islice(iteration, 30))
+        iteration.close()
+
+        # Only the values loaded since the last read are sent back
+        assert driver.read <= 36
+        assert len(checkpoint.recent) == 20
+
+        # After a restart, the list is scrolled past the users yielded before
+        checkpoint = ListCheckpoint.load(path, key="username/followers", window=20)
+        assert checkpoint.count == 30
+        driver = ListDriver(values)
+        rest = list(iter_scroll_checkpointed(driver, "span", checkpoint=checkpoint, timeout=0.1))
+
+        assert first + rest == values
+        assert ListCheckpoint.load(path).done
+
+        # A finished list yields nothing more until it's started over
+        checkpoint = ListCheckpoint.load(path)
+        driver = ListDriver(values)
+        assert list(iter_scroll_checkpointed(driver, "span", checkpoint=checkpoint)) == []
+        checkpoint.reset()
+        assert ListCheckpoint.load(path).count == 0
+
+    def test_resume_pages(self, tmp_path):
+        values = [f"user{index}" for index in range(100)]
+        path = str(tmp_path / "followers.json")
+        fetched = []
+
+        def fetch_page(cursor: str):
+            fetched.append(cursor)
+            start = int(cursor or 0)
+            end = start + 10
+            return values[start:end], str(end) if end < len(values) else None
+
+        checkpoint = ListCheckpoint.load(path, key="username/followers")
+        iteration = iter_pages_checkpointed(fetch_page, checkpoint)
+        first = list(islice(iteration, 35))
+        iteration.close()
+
+        # After a restart, only the page it stopped in is fetched again
+        fetched.clear()
+        checkpoint = ListCheckpoint.load(path, key="username/followers")
+        rest = list(iter_pages_checkpointed(fetch_page, checkpoint))
+
+        assert first + rest == values
+        assert fetched[0] == "30"
+        assert checkpoint.done
+
+    def test_lost_position(self):
+        # None of the values yielded before are in the list anymore
+        checkpoint = ListCheckpoint(count=2, recent=["gone0", "gone1"])
+        driver = ListDriver([f"user{index}" for index in range(20)])
+
+        with pytest.raises(ValueError):
+            list(iter_scroll_checkpointed(driver, "span", checkpoint=checkpoint, timeout=0.1))
+
+    def test_other_list(self, tmp_path):
+        path = str(tmp_path / "followers.json")
+        ListCheckpoint(path, key="username/followers").save()
+
+        with pytest.raises(ValueError):
+            ListCheckpoint.load(path, key="username/following")
+
+    def test_list_closed(self, tmp_path):
+        values = [f"user{index}" for index in range(40)]
+        path = str(tmp_path / "followers.json")
+
+        # The dialog is closed while the caller handles a value, it's opened again
+        driver = ListDriver(values)
+        yielded = []
+        checkpoint = ListCheckpoint(path)
+        for value in iter_scroll_checkpointed(
+            driver, "span", checkpoint=checkpoint, timeout=0.1, reopen=driver.open
+        ):
+            yielded.append(value)
+            if value == "user20":
+                driver.close()
+
+        assert yielded == values and checkpoint.done
+
+        # Without a way to open it again, the list doesn't end early
+        driver = ListDriver(values)
+        checkpoint = ListCheckpoint(path)
+        with pytest.raises(ListClosed):
+            iteration = iter_scroll_checkpointed(
+                driver, "span", checkpoint=checkpoint, timeout=0.1
+            )
+            for value in iteration:
+                if value == "user20":
+                    driver.close()
+
+        assert not ListCheckpoint.load(path).done
+
+
+class TestScrollValues:
+    def test_list_closed(self):
+        values = [f"user{index}" for index in range(40)]
+
+        driver = ListDriver(values)
+        yielded = []
+        for value in iter_scroll_values(driver, "span", timeout=0.1, reopen=driver.open):
+            yielded.append(value)
+            if value == "user20":
+                driver.close()
+
+        assert yielded == values
+
+        driver = ListDriver(values)
+        progress = ScrollProgress()
+        with pytest.raises(ListClosed):
+            for value in iter_scroll_values(driver, "span", progress=progress, timeout=0.1):
+                if value == "user20":
+                    driver.close()
+
+        assert not progress.done
@@ -0,0 +1,106 @@
+from pygramcore import Account
+from pygramcore.constants import INSTAGRAM_URL
+from pygramcore.driver import DriverPool
+from pygramcore.sessions import SessionStore, set_cookies_bulk, verify_session
+from concurrent.futures import ThreadPoolExecutor
+import json, pytest, time
+
+
+class CookieDriver:
+    """
+    Holds a session cookie and answers Instagram's "current user" request with `status`.
+    """
+
+    current_url = "https://www.instagram.com/"
+
+    def __init__(self, status: int | None, expiry: float = None):
+        self.status = status
+        self.expiry = time.time() + 3600 if expiry is None else expiry
+
+    def get_cookies(self) -> list[dict]:
+        return [{"name": "sessionid", "value": "abc", "expiry": self.expiry}]
+
+    def execute_async_script(self, script: str, *args):
+        return self.status
+
+
+class DevToolsDriver:
+    """
+    Records the DevTools commands it receives.
+    """
+
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, command: str, params: dict):
+        self.commands.append((command, params))
+
+
+class TestSessionStore:
+    def test_save_and_load(self, tmp_path):
+        store = SessionStore(str(tmp_path / "sessions.json"))
+        assert store.load("alice") is None
+
+        store.save("alice", [{"name": "sessionid", "value": "a"}])
+        store.save("bob", [{"name": "sessionid", "value": "b"}])
+        store.delete("bob")
+
+        assert store.load("alice") == [{"name": "sessionid", "value": "a"}]
+        assert store.accounts() == ["alice"]
+
+    def test_shared_file(self, tmp_path):
+        # Stores of different processes only share the file, like these two
+        path = str(tmp_path / "sessions.json")
+        stores = [SessionStore(path), SessionStore(path)]
+
+        def save(index: int):
+            stores[index % 2].save(f"account{index}", [])
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(save, range(40)))
+
+        assert len(SessionStore(path).accounts()) == 40
+
+    def test_version(self, tmp_path):
+        path = tmp_path / "sessions.json"
+        path.write_text(json.dumps({"version": 99, "accounts": {}}))
+
+        with pytest.raises(ValueError):
+            SessionStore(str(path)).load("alice")
+
+    def test_verify_session(self):
+        assert verify_session(CookieDriver(200))
+        assert not verify_session(CookieDriver(302))
+        assert not verify_session(CookieDriver(None))  # the request failed
+        assert not verify_session(CookieDriver(200, expiry=time.time() - 60))
+
+    def test_set_cookies_bulk(self):
+        driver = DevToolsDriver()
+        cookies = [
+            {"name": "sessionid", "value": "a", "domain": ".instagram.com", "expiry": 1900000000},
+            {"name": "csrftoken", "value": "b", "sameSite": None},
+        ]
+        set_cookies_bulk(driver, cookies)
+
+        # The browser's cookies are replaced in two calls, in DevTools' format
+        (clear, _), (command, params) = driver.commands
+        assert clear == "Network.clearBrowserCookies"
+        assert params["cookies"] == [
+            {"name": "sessionid", "value": "a", "domain": ".instagram.com", "expires": 1900000000},
+            {"name": "csrftoken", "value": "b", "url": INSTAGRAM_URL},
+        ]
+
+    def test_load_session(self, tmp_path):
+        store = SessionStore(str(tmp_path / "sessions.json"))
+        store.save("alice", [{"name": "sessionid", "value": "a"}])
+
+        account = Account("alice")
+        account._pool = DriverPool(factory=DevToolsDriver)
+
+        # Restoring the session doesn't start a browser...
+        assert account.load_session(store)
+        assert len(account.get_pool()) == 0
+
+        # ...the cookies are set once one is needed
+        driver = account.get_instance()
+        assert driver.commands[-1][1]["cookies"][0]["value"] == "a"
@@ -0,0 +1,69 @@
+from pygramcore import Account, User
+from pygramcore.cache import Cache
+from pygramcore.store import MetadataStore
+from datetime import datetime
+import pytest, sqlite3, time
+
+URL = "https://www.instagram.com/username"
+
+
+class TestMetadataStore:
+    def test_values(self, tmp_path):
+        account = Account("alice")
+        store = MetadataStore(str(tmp_path / "metadata.db"))
+
+        posted = datetime(2024, 3, 1, 12, 30)
+        store.set((account, URL, "get_date_posted", ""), posted)
+        store.set((account, URL, "get_followers", "[[5], {}]"), [User("bob", account)])
+
+        # Values come back as they were saved, users bound to the account
+        assert store.get((account, URL, "get_date_posted", ""))[0] == posted
+        (follower,), age = store.get((account, URL, "get_followers", "[[5], {}]"))
+        assert follower.name == "bob" and follower.account is account
+        assert age < 5
+
+        # Other accounts have their own values, unnamed ones aren't saved
+        assert store.get((Account("carol"), URL, "get_date_posted", "")) is None
+        store.set((Account(), URL, "is_private", ""), True)
+        assert store.get((Account(), URL, "is_private", "")) is None
+
+    def test_version(self, tmp_path):
+        path = str(tmp_path / "metadata.db")
+        MetadataStore(path).close()
+
+        connection = sqlite3.connect(path)
+        connection.execute("PRAGMA user_version = 99")
+        connection.close()
+
+        with pytest.raises(ValueError):
+            MetadataStore(path)
+
+    def test_prune(self, tmp_path):
+        account = Account("alice")
+        store = MetadataStore(str(tmp_path / "metadata.db"), max_age=3600)
+        store.set((account, URL, "is_private", ""), False)
+        store.set((account, URL, "get_total_posts", ""), 12)
+
+        # One of the values was saved two hours ago
+        connection = store._connect()
+        with connection:
+            connection.execute(
+                "UPDATE entries SET saved_at = ? WHERE field = 'is_private'",
+                (time.time() - 7200,),
+            )
+
+        assert store.get((account, URL, "is_private", "")) is None  # older than max_age
+        assert store.prune(3600) == 1
+        assert store.get((account, URL, "get_total_posts", ""))[0] == 12
+
+    def test_cache_restart(self, tmp_path):
+        account = Account("alice")
+        path = str(tmp_path / "metadata.db")
+        key = (account, URL, "get_total_posts", "")
+
+        Cache(store=MetadataStore(path)).set(key, 12)
+
+        # A new process starts with an empty cache, served from the database
+        cache = Cache(store=MetadataStore(path))
+        assert cache.get(key) == 12
+        assert cache.get_stats()["fields"]["get_total_posts"]["stored"] == 1
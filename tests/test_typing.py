@@ -0,0 +1,80 @@
+from pygramcore.utils.navigation import (
+    Burst,
+    BulkInsert,
+    PerCharacter,
+    TypingStrategy,
+    get_typing_strategy,
+    set_typing_strategy,
+    write,
+)
+import pytest
+
+
+class FakeInput:
+    """
+    An input that records the keys sent to it. Inserting text only works when `insertable`.
+    """
+
+    def __init__(self, insertable: bool = True):
+        self.insertable = insertable
+        self.keys = []
+        self.scripts = 0
+        self.parent = self  # the driver of the element
+
+    @property
+    def value(self) -> str:
+        return "".join(self.keys)
+
+    def send_keys(self, keys: str) -> None:
+        self.keys.append(keys)
+
+    def execute_script(self, script: str, input: "FakeInput", text: str) -> bool:
+        self.scripts += 1
+        if self.insertable:
+            input.keys.append(text)
+        return self.insertable
+
+
+class TestTyping:
+    def test_per_character(self):
+        input = FakeInput()
+        PerCharacter(speed=1000).type(input, "hello")
+        assert input.keys == ["h", "e", "l", "l", "o"]
+
+    def test_burst(self):
+        input = FakeInput()
+        Burst(chunk_size=4, delay=0).type(input, "hello world")
+        assert input.keys == ["hell", "o wo", "rld"]
+
+        with pytest.raises(ValueError):
+            Burst(chunk_size=0)
+
+    def test_bulk_insert(self):
+        # The whole text in a single command, emojis included
+        input = FakeInput()
+        BulkInsert().type(input, "hi 👋")
+        assert (input.value, input.scripts) == ("hi 👋", 1)
+
+        # Inputs that can't insert text get the keys instead
+        input = FakeInput(insertable=False)
+        BulkInsert().type(input, "hello")
+        assert input.keys == ["hello"]
+
+    def test_default_strategy(self):
+        previous = get_typing_strategy()
+        set_typing_strategy(BulkInsert())
+        try:
+            input = FakeInput()
+            write(input, "hello")
+            assert input.scripts == 1
+
+            # A speed still types letter by letter, like before strategies existed
+            input = FakeInput()
+            write(input, "hey", speed=1000)
+            assert input.keys == ["h", "e", "y"]
+        finally:
+            set_typing_strategy(previous)
+
+    def test_abstract(self):
+        with pytest.raises(TypeError):
+            TypingStrategy()
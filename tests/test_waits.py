@@ -0,0 +1,116 @@
+from pygramcore import Account, Post, User
+from pygramcore.driver import DriverPool
+from pygramcore.exceptions.navigation import ActionTimeout
+from pygramcore.utils.waits import present, url_contains, wait_for, wait_for_completion
+from selenium.common.exceptions import JavascriptException
+from selenium.webdriver.common.by import By
+import pytest, time
+
+
+class NavigatingDriver:
+    """
+    Drops the first async script it runs, as when the page navigates, then answers `index`.
+    """
+
+    def __init__(self, index: int = 0):
+        self.index = index
+        self.script_timeout = 30
+        self.runs = []
+
+    def set_script_timeout(self, seconds: float) -> None:
+        self.script_timeout = seconds
+
+    def execute_async_script(self, script: str, conditions: list, timeout: float):
+        self.runs.append(timeout / 1000)
+        if len(self.runs) == 1:
+            raise JavascriptException("document unloaded while waiting for result")
+
+        return self.index
+
+
+class StateDriver:
+    """
+    Loads pages without a browser and answers the waits on them with the condition at `index`.
+    """
+
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.index = 0
+        self.waits = []
+        self.caps = {}
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+
+    def execute_script(self, script: str, *args):
+        return [self.current_url, "0"]
+
+    def execute_async_script(self, script: str, conditions: list, timeout: float):
+        if "isn't available" in conditions[0][1]:
+            return -1  # the page was found
+
+        self.waits.append(conditions)
+        return self.index
+
+    def quit(self) -> None:
+        pass
+
+
+def make_account() -> tuple[Account, StateDriver]:
+    account = Account("test")
+    account._pool = DriverPool(factory=StateDriver)
+    account._logged_in, account._verified_at = True, time.monotonic()
+    return account, account.get_instance()
+
+
+class TestWaits:
+    def test_long_wait_across_navigation(self):
+        driver = NavigatingDriver()
+        result = wait_for_completion(
+            driver,
+            present(By.CSS_SELECTOR, "svg[aria-label='Home']") | url_contains("/accounts/onetap"),
+            action="account.login",
+            timeout=60,
+        )
+
+        assert result.index == 0
+        assert driver.script_timeout > 60  # the driver doesn't abort the wait at 30 seconds
+        assert len(driver.runs) == 2 and driver.runs[1] <= 60  # only waits for the time left
+
+    def test_timeout(self):
+        driver = NavigatingDriver(-1)
+        with pytest.raises(ActionTimeout):
+            wait_for_completion(
+                driver, present(By.CSS_SELECTOR, "#done"), action="user.send_dm", timeout=1
+            )
+
+    def test_negative_check(self):
+        driver = NavigatingDriver()
+        driver.runs.append(None)  # no navigation
+
+        # The account is private on the first few profiles checked, quickly...
+        for _ in range(10):
+            wait_for(driver, present(By.XPATH, "//h2"), timeout=2, probe="test.is_private")
+
+        # ...but a public profile is still given the full timeout to show that it isn't
+        driver.index = -1
+        found = wait_for(
+            driver, present(By.XPATH, "//h2"), timeout=2, probe="test.is_private", learn=False
+        )
+        assert not found and driver.runs[-1] == 2
+
+    def test_either_state(self):
+        account, driver = make_account()
+
+        # Whatever renders first tells the state, a public profile doesn't wait for the timeout
+        for index, private in [(0, True), (1, False), (2, False)]:
+            driver.index = index
+            assert User(f"user{index}", account).is_private() == private
+            assert len(driver.waits[-1]) == 3
+
+        # The notice shown instead of the comment form ends the wait as well
+        for index, can_comment in [(0, True), (1, False)]:
+            driver.index = index
+            post = Post(f"https://www.instagram.com/p/post{index}/", account)
+            assert post.can_comment() == can_comment
+            assert len(driver.waits[-1]) == 2